@@ -169,6 +169,7 @@ else:
 
 # core
 from qutip.qobj import *
+from qutip.qobjarray import *
 from qutip.states import *
 from qutip.operators import *
 from qutip.expect import *
@@ -177,6 +178,7 @@ from qutip.superoperator import *
 from qutip.superop_reps import *
 from qutip.subsystem_apply import *
 from qutip.graph import *
+from qutip.blockdiag import *
 
 # graphics
 from qutip.bloch import *
@@ -31,7 +31,7 @@
 #    OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 ###############################################################################
 
-__all__ = ['brmesolve', 'bloch_redfield_solve']
+__all__ = ['brmesolve', 'bloch_redfield_solve', 'BlochRedfieldBuilder']
 
 import numpy as np
 import os
@@ -40,13 +40,15 @@ import types
 import warnings
 from functools import partial
 import scipy.integrate
+import scipy.linalg as la
 import scipy.sparse as sp
 from qutip.qobj import Qobj, isket
 from qutip.states import ket2dm
 from qutip.operators import qdiags
 from qutip.superoperator import spre, spost, vec2mat, mat2vec, vec2mat_index
 from qutip.expect import expect
-from qutip.solver import Options, Result, config, _solver_safety_check
+from qutip.solver import (Options, Result, config, _solver_safety_check,
+                          _check_precision)
 from qutip.cy.spmatfuncs import cy_ode_rhs
 from qutip.cy.spconvert import dense2D_to_fastcsr_fmode
 from qutip.superoperator import liouvillian
@@ -60,6 +62,9 @@ from qutip.rhs_generate import _td_format_check
 from qutip.cy.openmp.utilities import check_use_openmp
 import qutip.settings as qset
 from qutip.cy.br_tensor import bloch_redfield_tensor
+from qutip.cy.brtools import (liou_from_diag_ham, cop_super_term,
+                              BR_Spline_RHS)
+from qutip.utilities import _spectrum_on_array
 
 # -----------------------------------------------------------------------------
 # Solve the Bloch-Redfield master equation
@@ -101,7 +106,9 @@ def brmesolve(H, psi0, tlist, a_ops=[], e_ops=[], c_ops=[],
         a_ops = [ [a+a.dag(), ( f(w), g(t)] ]
               
     where f(w) and g(t) are strings or Cubic_spline objects for the bath
-    spectrum and time-dependence, respectively.
+    spectrum and time-dependence, respectively.  If all time-dependence,
+    including the a_op spectra, is given as Cubic_Spline objects or constants,
+    a precompiled right-hand side is used and no code is generated.
               
     Finally, if one has bath-couplimg terms of the form
     H = f(t)*a + conj[f(t)]*a.dag(), then the correct input format is
@@ -207,6 +214,7 @@ def brmesolve(H, psi0, tlist, a_ops=[], e_ops=[], c_ops=[],
         
     if options is None:
         options = Options()
+    _check_precision(options)
 
     if (not options.rhs_reuse) or (not config.tdfunc):
         # reset config collapse and time-dependence flags to default values
@@ -249,6 +257,204 @@ def brmesolve(H, psi0, tlist, a_ops=[], e_ops=[], c_ops=[],
         raise Exception('Cannot mix func and str formats.')
 
 
+# -----------------------------------------------------------------------------
+# Bloch-Redfield tensors for many bath spectra
+#
+class BlochRedfieldBuilder(object):
+    """
+    Builder for time-independent Bloch-Redfield tensors that share the same
+    Hamiltonian and coupling operators but differ in the bath spectra, e.g.
+    in a sweep over temperatures or coupling strengths.
+
+    The eigenbasis of `H`, the coupling operators in that basis, the
+    frequency differences and the index pairs retained by the secular
+    approximation are calculated once.  Each new set of spectra then only
+    evaluates the spectra on the frequency-difference matrix and fills the
+    tensor elements with array operations.
+
+    Parameters
+    ----------
+    H : :class:`qutip.Qobj`
+        System Hamiltonian.
+
+    a_ops : list
+        System operators that couple to the environment, either as Hermitian
+        Qobj or as ``[op, spectrum]`` pairs as for
+        :func:`qutip.bloch_redfield_tensor`.  Spectra given here are used
+        as defaults by :meth:`tensor`.
+
+    c_ops : list of :class:`qutip.Qobj`
+        List of system collapse operators.
+
+    use_secular : bool {True, False}
+        Flag that indicates if the secular approximation should be used.
+
+    sec_cutoff : float {0.1}
+        Threshold for secular approximation.
+
+    atol : float {qutip.settings.atol}
+        Threshold for removing small parameters.
+
+    Attributes
+    ----------
+    evals : array
+        Eigenvalues of `H`.
+
+    ekets : list of :class:`qutip.Qobj`
+        Eigenstates of `H`, the basis of the tensors.
+
+    skew : array
+        Matrix of frequency differences ``evals[i] - evals[j]``.
+
+    """
+    def __init__(self, H, a_ops, c_ops=[], use_secular=True, sec_cutoff=0.1,
+                 atol=qset.atol):
+        if not isinstance(H, Qobj):
+            raise TypeError("H must be an instance of Qobj")
+
+        self.ops = []
+        self.spectra = []
+        for a in a_ops:
+            op, spectrum = (a[0], a[1]) if isinstance(a, list) else (a, None)
+            if not isinstance(op, Qobj) or not op.isherm:
+                raise TypeError("Operators in a_ops must be Hermitian Qobj.")
+            self.ops.append(op)
+            self.spectra.append(spectrum)
+
+        N = H.shape[0]
+        self.dims = [[H.dims[0], H.dims[0]], [H.dims[1], H.dims[1]]]
+        self.use_secular = use_secular
+        self.sec_cutoff = sec_cutoff
+        self.atol = atol
+
+        self.evals, evecs = la.eigh(H.full())
+        ket_dims = [H.dims[0], [1] * len(H.dims[0])]
+        self.ekets = [Qobj(evecs[:, k], dims=ket_dims) for k in range(N)]
+
+        # Hamiltonian and Lindblad part, independent of the spectra
+        evecs_f = np.asfortranarray(evecs)
+        L0 = liou_from_diag_ham(self.evals)
+        for cop in c_ops:
+            L0 = L0 + cop_super_term(cop.full('F'), evecs_f, 1, N, atol)
+        self._L0 = L0
+
+        # coupling operators in the eigenbasis
+        self._A_eig = []
+        for op in self.ops:
+            A = evecs.conj().T.dot(op.full()).dot(evecs)
+            A[abs(A) < atol] = 0
+            self._A_eig.append(A)
+
+        self.skew = self.evals[:, np.newaxis] - self.evals[np.newaxis, :]
+        dw = np.abs(self.skew[self.skew != 0])
+        dw_min = dw.min() if len(dw) else np.finfo(float).max
+
+        # index pairs I = a + N b, J = c + N d kept in the tensor
+        self._rows, self._cols = self._secular_pairs(dw_min)
+        self._a = self._rows % N
+        self._b = self._rows // N
+        self._c = self._cols % N
+        self._d = self._cols // N
+
+    def _secular_pairs(self, dw_min):
+        """
+        Index pairs (I, J) with |skew[a, b] - skew[c, d]| below the secular
+        cutoff, found by sorting the frequency differences.
+        """
+        N2 = len(self.evals) ** 2
+        if not self.use_secular:
+            rows, cols = np.divmod(np.arange(N2 * N2), N2)
+            return rows, cols
+
+        # skew flattened with column-stacking, I = a + N b
+        w = self.skew.ravel('F')
+        tol = dw_min * self.sec_cutoff
+        order = np.argsort(w, kind='mergesort')
+        w_sorted = w[order]
+        lo = np.searchsorted(w_sorted, w_sorted - tol, side='right')
+        hi = np.searchsorted(w_sorted, w_sorted + tol, side='left')
+        counts = hi - lo
+        rows = np.repeat(order, counts)
+        starts = np.repeat(lo - np.cumsum(counts) + counts, counts)
+        cols = order[np.arange(counts.sum()) + starts]
+        return rows, cols
+
+    def _term(self, A, S):
+        """
+        Tensor elements on the retained index pairs for one coupling operator
+        `A` (eigenbasis) and its spectrum `S` evaluated on `skew`.
+        """
+        a, b, c, d = self._a, self._b, self._c, self._d
+        G_db = (A * S).dot(A)
+        G_ac = A.dot(A * S.T)
+        elem = 0.5 * A[a, c] * A[d, b] * (S[c, a] + S[d, b])
+        elem -= 0.5 * (a == c) * G_db[d, b]
+        elem -= 0.5 * (b == d) * G_ac[a, c]
+        return elem
+
+    def tensor(self, spectra=None):
+        """
+        Bloch-Redfield tensor for the given bath spectra.
+
+        Parameters
+        ----------
+        spectra : list of callback functions
+            One spectrum per coupling operator.  Defaults to the spectra
+            given with `a_ops`.
+
+        Returns
+        -------
+        R, kets: :class:`qutip.Qobj`, list of :class:`qutip.Qobj`
+            R is the Bloch-Redfield tensor and kets is a list eigenstates of
+            the Hamiltonian.
+
+        """
+        return self.tensors([spectra])[0], self.ekets
+
+    def tensors(self, spectra_list):
+        """
+        Bloch-Redfield tensors for a batch of sets of bath spectra.  Spectra
+        shared between sets are only evaluated once.
+
+        Parameters
+        ----------
+        spectra_list : list
+            List of sets of spectra, each as accepted by :meth:`tensor`.
+
+        Returns
+        -------
+        R_list : list of :class:`qutip.Qobj`
+            The Bloch-Redfield tensors, all in the basis of `ekets`.
+
+        """
+        N2 = len(self.evals) ** 2
+        cache = {}
+        R_list = []
+        for spectra in spectra_list:
+            if spectra is None:
+                spectra = self.spectra
+            if len(spectra) != len(self.ops):
+                raise ValueError("One spectrum per coupling operator "
+                                 "is required.")
+
+            data = np.zeros(len(self._rows), dtype=complex)
+            for A, spectrum in zip(self._A_eig, spectra):
+                if spectrum is None:
+                    raise ValueError("No spectrum given for a coupling "
+                                     "operator.")
+                if id(spectrum) not in cache:
+                    cache[id(spectrum)] = (spectrum, _spectrum_on_array(
+                        spectrum, self.skew))
+                data += self._term(A, cache[id(spectrum)][1])
+
+            nz = data != 0
+            R = sp.csr_matrix((data[nz], (self._rows[nz], self._cols[nz])),
+                              shape=(N2, N2))
+            R_list.append(Qobj(self._L0 + R, dims=self.dims))
+
+        return R_list
+
+
 # -----------------------------------------------------------------------------
 # Evolution of the Bloch-Redfield master equation given the Bloch-Redfield
 # tensor.
@@ -487,7 +693,15 @@ def _td_brmesolve(H, psi0, tlist, a_ops=[], e_ops=[], c_ops=[], args={},
     #
     # generate and compile new cython code if necessary
     #
-    if not options.rhs_reuse or config.tdfunc is None:
+    # inputs given only with constant and Cubic_Spline terms use the
+    # precompiled right-hand side, no code generation needed
+    spline_rhs = None
+    if not options.use_openmp:
+        spline_rhs = _br_spline_rhs(H, a_ops, c_ops, use_secular,
+                                    sec_cutoff, tol)
+
+    if spline_rhs is None and (not options.rhs_reuse or
+                               config.tdfunc is None):
         if options.rhs_filename is None:
             config.tdname = "rhs" + str(os.getpid()) + str(config.cgen_num)
         else:
@@ -521,9 +735,12 @@ def _td_brmesolve(H, psi0, tlist, a_ops=[], e_ops=[], c_ops=[], args={},
             print('BR compile time:', time.time()-_st)
     initial_vector = mat2vec(rho0.full()).ravel()
     
-    _ode = scipy.integrate.ode(config.tdfunc)
-    code = compile('_ode.set_f_params(' + parameter_string + ')',
-                    '<string>', 'exec')
+    if spline_rhs is not None:
+        _ode = scipy.integrate.ode(spline_rhs)
+    else:
+        _ode = scipy.integrate.ode(config.tdfunc)
+        code = compile('_ode.set_f_params(' + parameter_string + ')',
+                        '<string>', 'exec')
     _ode.set_integrator('zvode', method=options.method, 
                     order=options.order, atol=options.atol, 
                     rtol=options.rtol, nsteps=options.nsteps,
@@ -531,7 +748,8 @@ def _td_brmesolve(H, psi0, tlist, a_ops=[], e_ops=[], c_ops=[], args={},
                     min_step=options.min_step,
                     max_step=options.max_step)
     _ode.set_initial_value(initial_vector, tlist[0])
-    exec(code, locals())
+    if spline_rhs is None:
+        exec(code, locals())
     
     #
     # prepare output array
@@ -623,4 +841,62 @@ def _td_brmesolve(H, psi0, tlist, a_ops=[], e_ops=[], c_ops=[], args={},
         rho.data = dense2D_to_fastcsr_fmode(vec2mat(_ode.y), rho.shape[0], rho.shape[1])
         output.final_state = Qobj(rho, dims=rho0.dims, isherm=True)
 
-    return output
\ No newline at end of file
+    return output
+
+
+def _br_spline_coeff(op, coeff):
+    """
+    Splits a term into (operator, coefficient) for BR_Spline_RHS, or returns
+    None if the coefficient is neither a Cubic_Spline nor a constant.
+    """
+    if coeff is None or isinstance(coeff, Cubic_Spline):
+        return op, coeff
+    if isinstance(coeff, str):
+        try:
+            return complex(coeff) * op, None
+        except ValueError:
+            return None
+    return None
+
+
+def _br_spline_rhs(H, a_ops, c_ops, use_secular, sec_cutoff, tol):
+    """
+    Builds the precompiled Bloch-Redfield right-hand side for a time-dependent
+    problem specified only with constants and Cubic_Spline objects, i.e.
+    H and c_ops as ``[op, Cubic_Spline]`` and a_ops as
+    ``[op, (S(w), g(t))]`` with a Cubic_Spline spectrum.  Returns None if the
+    input needs the code generator.
+    """
+    terms = {'H': ([], []), 'C': ([], [])}
+    for key, ops in [('H', H if isinstance(H, list) else [H]),
+                     ('C', c_ops)]:
+        for h in ops:
+            if isinstance(h, Qobj):
+                term = (h, None)
+            elif isinstance(h, list) and len(h) == 2:
+                term = _br_spline_coeff(h[0], h[1])
+            else:
+                term = None
+            if term is None:
+                return None
+            terms[key][0].append(term[0].full())
+            terms[key][1].append(term[1])
+
+    A_ops, A_spectra, A_coeffs = [], [], []
+    for a in a_ops:
+        if not (isinstance(a, list) and isinstance(a[0], Qobj) and
+                isinstance(a[1], tuple) and len(a[1]) == 2 and
+                isinstance(a[1][0], Cubic_Spline)):
+            return None
+        term = _br_spline_coeff(a[0], a[1][1])
+        if term is None:
+            return None
+        A_ops.append(term[0].full())
+        A_coeffs.append(term[1])
+        A_spectra.append(a[1][0])
+
+    return BR_Spline_RHS(terms['H'][0], terms['H'][1],
+                         terms['C'][0], terms['C'][1],
+                         A_ops, A_spectra, A_coeffs,
+                         use_secular=use_secular, sec_cutoff=sec_cutoff,
+                         atol=tol)
@@ -0,0 +1,285 @@
+# This file is part of QuTiP: Quantum Toolbox in Python.
+#
+#    Copyright (c) 2011 and later, Paul D. Nation and Robert J. Johansson.
+#    All rights reserved.
+#
+#    Redistribution and use in source and binary forms, with or without
+#    modification, are permitted provided that the following conditions are
+#    met:
+#
+#    1. Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#
+#    2. Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#
+#    3. Neither the name of the QuTiP: Quantum Toolbox in Python nor the names
+#       of its contributors may be used to endorse or promote products derived
+#       from this software without specific prior written permission.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+#    "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+#    LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+#    PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+#    HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+#    SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+#    LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+#    DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+#    THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+#    (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+#    OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+###############################################################################
+"""
+This module contains functions for splitting Hamiltonians and Liouvillians
+into invariant subspaces, given by a conserved quantity or by the
+connectivity of the matrix, and for solving the resulting blocks
+independently.
+"""
+
+__all__ = ['invariant_subspaces', 'block_steadystate', 'BlockDecomposition']
+
+import warnings
+import numpy as np
+import scipy.sparse as sp
+import scipy.linalg as la
+from scipy.sparse.linalg import spsolve
+from qutip.qobj import Qobj, issuper, isoper
+from qutip.graph import connected_components
+from qutip.parallel import parallel_map, serial_map
+
+
+def invariant_subspaces(A, conserved=None, tol=1e-10):
+    """
+    Finds the invariant subspaces of a Hamiltonian or Liouvillian.
+
+    Parameters
+    ----------
+    A : qobj
+        Hamiltonian (operator) or Liouvillian (superoperator).
+    conserved : qobj, optional
+        Operator conserved by `A`, diagonal in the basis of `A` (e.g. an
+        excitation number or parity operator).  For a Liouvillian the
+        density matrix element :math:`\\rho_{ij}` is labeled by
+        :math:`q_i - q_j`.  If not given, the connected components of the
+        graph of `A` are used.
+    tol : float
+        Tolerance for grouping the eigenvalues of `conserved`.
+
+    Returns
+    -------
+    blocks : list of arrays
+        Sorted indices of the basis states (vectorized density matrix
+        elements for a Liouvillian) spanning each subspace.
+
+    """
+    if not isinstance(A, Qobj) or not (isoper(A) or issuper(A)):
+        raise TypeError('A must be an operator or superoperator Qobj.')
+    M = A.data.tocsr()
+
+    if conserved is None:
+        labels, _ = connected_components(M)
+    else:
+        Q = conserved.data.tocoo()
+        if np.any(Q.row != Q.col):
+            raise ValueError('The conserved operator must be diagonal in '
+                             'the basis of A.')
+        q = np.real(conserved.data.diagonal())
+        if issuper(A):
+            n = len(q)
+            # column-stacking: I = i + n * j  ->  q_i - q_j
+            q = (q[:, np.newaxis] - q[np.newaxis, :]).ravel('F')
+        _, labels = np.unique(np.round(q / tol).astype(np.int64),
+                              return_inverse=True)
+        Mc = M.tocoo()
+        if np.any(labels[Mc.row] != labels[Mc.col]):
+            raise ValueError('The operator is not conserved by A.')
+
+    order = np.argsort(labels, kind='mergesort')
+    splits = np.flatnonzero(np.diff(labels[order])) + 1
+    blocks = np.split(order, splits)
+    blocks.sort(key=lambda b: b[0])
+    return blocks
+
+
+def _block_eigh(M):
+    return la.eigh(M.toarray())
+
+
+def _block_expm(M, tlist):
+    M = M.toarray()
+    return [la.expm(M * t) for t in tlist]
+
+
+def block_steadystate(block):
+    """
+    Steady state of a single block of a Liouvillian.
+
+    The trace condition is imposed by adding the sum of the diagonal
+    density matrix elements to the first of them, weighted by the mean
+    magnitude of the block so that the system stays well conditioned.
+
+    Parameters
+    ----------
+    block : tuple
+        Pair ``(M, diag)`` of the sparse Liouvillian block `M` and the
+        indices `diag` of the diagonal density matrix elements within the
+        block.  A pair is used so that blocks can be passed directly to
+        :func:`qutip.parallel.parallel_map`.
+
+    Returns
+    -------
+    x : array
+        Unnormalised steady state vector of the block, with the diagonal
+        elements summing to one.
+
+    """
+    M, diag = block
+    weight = np.mean(np.abs(M.data)) if M.nnz else 1.0
+    T = sp.csr_matrix((weight * np.ones(len(diag)),
+                       (np.full(len(diag), diag[0]), diag)), shape=M.shape)
+    b = np.zeros(M.shape[0], dtype=complex)
+    b[diag[0]] = weight
+    return spsolve((M + T).tocsc(), b)
+
+
+class BlockDecomposition(object):
+    """
+    Decomposition of a Hamiltonian or Liouvillian into its invariant
+    subspaces, see :func:`invariant_subspaces`.  Eigenstates, propagators
+    and steady states are calculated block by block and reassembled in the
+    original basis.
+
+    Parameters
+    ----------
+    A : qobj
+        Hamiltonian (operator) or Liouvillian (superoperator).
+    conserved : qobj, optional
+        Diagonal operator conserved by `A`.  If not given, the connected
+        components of the graph of `A` are used.
+    parallel : bool {False, True}
+        Solve the blocks in parallel with :func:`qutip.parallel.parallel_map`.
+
+    Attributes
+    ----------
+    blocks : list of arrays
+        Basis indices spanning each invariant subspace.
+    perm : array
+        Permutation bringing `A` to block-diagonal form.
+
+    """
+    def __init__(self, A, conserved=None, parallel=False):
+        self.A = A
+        self.blocks = invariant_subspaces(A, conserved)
+        self.perm = np.concatenate(self.blocks)
+        self.parallel = parallel
+        M = A.data.tocsr()
+        self._sub = [M[b][:, b] for b in self.blocks]
+
+    @property
+    def sizes(self):
+        """Dimensions of the blocks."""
+        return np.array([len(b) for b in self.blocks])
+
+    def _map(self, task, values, task_args=()):
+        if self.parallel and len(values) > 1:
+            return parallel_map(task, values, task_args=task_args)
+        return serial_map(task, values, task_args=task_args)
+
+    def permuted(self):
+        """
+        Returns the block-diagonal matrix ``A[perm, perm]``.
+        """
+        return self.A.data.tocsr()[self.perm][:, self.perm]
+
+    def eigenstates(self):
+        """
+        Eigenvalues and eigenstates of a Hermitian operator, from the
+        diagonalization of each block.
+
+        Returns
+        -------
+        eigvals, eigkets : array, array of qobj
+            Eigenvalues in ascending order and the corresponding eigenstates.
+
+        """
+        if not isoper(self.A) or not self.A.isherm:
+            raise TypeError('eigenstates requires a Hermitian operator.')
+        n = self.A.shape[0]
+        results = self._map(_block_eigh, self._sub)
+        evals = np.concatenate([res[0] for res in results])
+        evecs = np.zeros((n, n), dtype=complex)
+        col = 0
+        for block, (_, V) in zip(self.blocks, results):
+            evecs[block, col:col + len(block)] = V
+            col += len(block)
+        order = np.argsort(evals, kind='mergesort')
+        ket_dims = [self.A.dims[0], [1] * len(self.A.dims[0])]
+        ekets = np.empty(n, dtype=object)
+        ekets[:] = [Qobj(evecs[:, k], dims=ket_dims) for k in order]
+        return evals[order], ekets
+
+    def propagator(self, t):
+        """
+        Propagator :math:`\\exp(-iHt)` of a Hamiltonian, or :math:`\\exp(Lt)`
+        of a Liouvillian, from the exponential of each block.
+
+        Parameters
+        ----------
+        t : float or array
+            Time or list of times.
+
+        Returns
+        -------
+        U : qobj or list of qobj
+            Propagator(s) at the given time(s).
+
+        """
+        tlist = np.atleast_1d(t)
+        scale = 1 if issuper(self.A) else -1j
+        results = self._map(_block_expm, [scale * M for M in self._sub],
+                            task_args=(tlist,))
+        rows = np.concatenate([np.repeat(b, len(b)) for b in self.blocks])
+        cols = np.concatenate([np.tile(b, len(b)) for b in self.blocks])
+        n = self.A.shape[0]
+        U = []
+        for k in range(len(tlist)):
+            data = np.concatenate([res[k].ravel() for res in results])
+            U.append(Qobj(sp.csr_matrix((data, (rows, cols)), shape=(n, n)),
+                          dims=self.A.dims))
+        return U[0] if np.isscalar(t) else U
+
+    def steadystate(self):
+        """
+        Steady state of a Liouvillian.  Only blocks containing diagonal
+        elements of the density matrix carry trace; the steady state of each
+        is found with a sparse direct solver and all other blocks vanish.
+
+        Returns
+        -------
+        dm : qobj
+            Steady state density matrix.
+
+        """
+        if not issuper(self.A):
+            raise TypeError('steadystate requires a Liouvillian.')
+        n = int(np.sqrt(self.A.shape[0]))
+        trace_blocks = []
+        for k, block in enumerate(self.blocks):
+            diag = np.flatnonzero(block % (n + 1) == 0)
+            if len(diag):
+                trace_blocks.append((k, diag))
+        if len(trace_blocks) > 1:
+            warnings.warn("The Liouvillian has %d blocks carrying trace, the "
+                          "steady state is not unique. Returning the equal "
+                          "mixture of the block steady states." %
+                          len(trace_blocks))
+
+        results = self._map(block_steadystate,
+                            [(self._sub[k], diag) for k, diag in trace_blocks])
+        vec = np.zeros(n * n, dtype=complex)
+        for (k, _), x in zip(trace_blocks, results):
+            vec[self.blocks[k]] = x / len(trace_blocks)
+        data = vec.reshape((n, n), order='F')
+        data = 0.5 * (data + data.conj().T)
+        return Qobj(data, dims=self.A.dims[0], isherm=True)
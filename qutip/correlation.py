@@ -45,7 +45,7 @@ import numpy as np
 import scipy.fftpack
 
 from qutip.eseries import esval, esspec
-from qutip.essolve import ode2es
+from qutip.essolve import ode2es, _ode2es, _ode2es_eig
 from qutip.expect import expect
 from qutip.mesolve import mesolve
 from qutip.mcsolve import mcsolve
@@ -55,7 +55,9 @@ from qutip.rhs_generate import rhs_clear, _td_wrap_array_str
 from qutip.cy.utilities import _cython_build_cleanup
 from qutip.settings import debug
 from qutip.solver import Options, config
-from qutip.steadystate import steadystate
+from qutip.steadystate import steadystate, _pseudo_inverse_sweep
+from qutip.parallel import parallel_map
+import qutip.settings as settings
 from qutip.states import ket2dm
 from qutip.superoperator import liouvillian, spre, mat2vec
 from qutip.tensor import tensor
@@ -525,7 +527,10 @@ def spectrum(H, wlist, c_ops, a_op, b_op, solver="es", use_pinv=False):
         `pi` for psuedo-inverse).
     use_pinv : bool
         For use with the `pi` solver: if `True` use numpy's pinv method,
-        otherwise use a generic solver.
+        otherwise solve :math:`(L - i\omega)x = b` for the required vector
+        only, with a single eigendecomposition of L for moderate system
+        sizes or sparse LU factorizations sharing one column ordering
+        (parallel over frequencies when several CPUs are available).
 
     Returns
     -------
@@ -1099,6 +1104,21 @@ def _correlation_me_2t(H, state0, tlist, taulist, c_ops, a_op, b_op, c_op,
 
     rho_t = mesolve(H, rho0, tlist, c_ops, [],
                     args=args, options=options).states
+
+    if isinstance(H, Qobj) and all(isinstance(c, Qobj) for c in c_ops):
+        # For a constant Liouvillian all tau-evolutions share the propagator
+        # exp(L tau), and since
+        #   tr[b_op exp(L tau) X] = vec(b_op^T) . exp(L tau) vec(X),
+        # one evolution of b_op^T with the transposed Liouvillian gives all
+        # rows of the correlation matrix as overlaps with vec(c_op rho a_op).
+        L = liouvillian(H, c_ops)
+        b_tau = mesolve(L.trans(), b_op.trans(), taulist, [], [],
+                        options=options).states
+        B = np.array([mat2vec(b.full()).ravel() for b in b_tau])
+        X = np.array([mat2vec((c_op * rho * a_op).full()).ravel()
+                      for rho in rho_t])
+        return X.dot(B.T)
+
     corr_mat = np.zeros([np.size(tlist), np.size(taulist)], dtype=complex)
     H_shifted, c_ops_shifted, _args = _transform_L_t_shift(H, c_ops, args)
     if config.tdname:
@@ -1151,12 +1171,14 @@ def _correlation_es_2t(H, state0, tlist, taulist, c_ops, a_op, b_op, c_op):
     L = liouvillian(H, c_ops)
 
     corr_mat = np.zeros([np.size(tlist), np.size(taulist)], dtype=complex)
-    solES_t = ode2es(L, rho0)
+    # one eigendecomposition of L serves all the expansions below
+    eig = _ode2es_eig(L)
+    solES_t = _ode2es(L, rho0, eig)
 
     # evaluate the correlation function
     for t_idx in range(len(tlist)):
         rho_t = esval(solES_t, [tlist[t_idx]])
-        solES_tau = ode2es(L, c_op * rho_t * a_op)
+        solES_tau = _ode2es(L, c_op * rho_t * a_op, eig)
         corr_mat[t_idx, :] = esval(expect(b_op, solES_tau), taulist)
 
     return corr_mat
@@ -1312,6 +1334,37 @@ def _spectrum_pi(H, wlist, c_ops, a_op, b_op, use_pinv=False):
 
     L = H if issuper(H) else liouvillian(H, c_ops)
 
+    rho_ss = steadystate(L)
+
+    if use_pinv:
+        return _spectrum_pi_dense(L, rho_ss, wlist, a_op, b_op)
+
+    tr_mat = tensor([qeye(n) for n in L.dims[0][0]])
+    tr_vec = mat2vec(tr_mat.full())
+    rho = mat2vec(rho_ss.full())
+
+    # S(w) = -2 Re[tr a Q (L - iw)^-1 Q b rho], only the action of the
+    # pseudo-inverse between these two vectors is needed.
+    right = spre(b_op).data.dot(rho)
+    left = spre(a_op).data.T.dot(tr_vec).T
+
+    wlist = np.asarray(wlist, dtype=float)
+    if settings.num_cpus > 1 and len(wlist) >= 100:
+        map_func = parallel_map
+    else:
+        map_func = None
+    s = _pseudo_inverse_sweep(L, rho_ss, -wlist, right, left,
+                              map_func=map_func)
+
+    return -2 * np.real(s[:, 0, 0])
+
+
+def _spectrum_pi_dense(L, rho_ss, wlist, a_op, b_op):
+    """
+    Internal function for calculating the spectrum of the correlation function
+    with numpy's pinv method.
+    """
+
     tr_mat = tensor([qeye(n) for n in L.dims[0][0]])
     N = np.prod(L.dims[0][0])
 
@@ -1320,22 +1373,14 @@ def _spectrum_pi(H, wlist, c_ops, a_op, b_op, use_pinv=False):
     a = spre(a_op).full()
 
     tr_vec = np.transpose(mat2vec(tr_mat.full()))
-
-    rho_ss = steadystate(L)
     rho = np.transpose(mat2vec(rho_ss.full()))
 
     I = np.identity(N * N)
-    P = np.kron(np.transpose(rho), tr_vec)
-    Q = I - P
 
     spectrum = np.zeros(len(wlist))
 
     for idx, w in enumerate(wlist):
-        if use_pinv:
-            MMR = np.linalg.pinv(-1.0j * w * I + A)
-        else:
-            MMR = np.dot(Q, np.linalg.solve(-1.0j * w * I + A, Q))
-
+        MMR = np.linalg.pinv(-1.0j * w * I + A)
         s = np.dot(tr_vec,
                    np.dot(a, np.dot(MMR, np.dot(b, np.transpose(rho)))))
         spectrum[idx] = -2 * np.real(s[0, 0])
@@ -37,17 +37,15 @@ the counting statistics formalism.
 __all__ = ['countstat_current', 'countstat_current_noise']
 
 import numpy as np
-import scipy.sparse as sp
 
 from qutip.expect import expect_rho_vec
-from qutip.steadystate import pseudo_inverse, steadystate
-from qutip.superoperator import mat2vec, sprepost, spre
-from qutip import operator_to_vector, identity, tensor
+from qutip.steadystate import (pseudo_inverse, steadystate,
+                               _pseudo_inverse_sweep)
+from qutip.superoperator import mat2vec, sprepost
+from qutip.parallel import parallel_map
+from qutip import identity, tensor
 import qutip.settings as settings
 from qutip.qobj import Qobj, issuper, isoper
-# Load MKL spsolve if avaiable
-if settings.has_mkl:
-    from qutip._mkl.spsolve import (mkl_splu, mkl_spsolve)
 
 
 def countstat_current(L, c_ops=None, rhoss=None, J_ops=None):
@@ -118,14 +116,16 @@ def countstat_current_noise(L, c_ops, wlist=None, rhoss=None, J_ops=None,
     spectrum.  
     
     Note:
-    The default method is a direct solution using dense matrices, as sparse 
-    matrix methods fail for some examples of small systems.
-    For larger systems it is reccomended to use the sparse solver
-    with the direct method, as it avoids explicit calculation of the
-    pseudo-inverse, as described in page 67 of "Electrons in nanostructures"
-    C. Flindt, PhD Thesis, available online:
+    With the default method 'direct', the reduced resolvent is only applied
+    to the vectors J_j rhoss for all frequencies in one sweep, avoiding the
+    explicit calculation of the pseudo-inverse, as described in page 67 of
+    "Electrons in nanostructures" C. Flindt, PhD Thesis, available online:
     http://orbit.dtu.dk/fedora/objects/orbit:82314/datastreams/file_4732600/content
-    
+    The sparse sweep computes the fill reducing ordering once and reuses it
+    for the LU factorizations at every frequency, which are distributed over
+    `qutip.settings.num_cpus` processes for long frequency lists. The dense
+    sweep diagonalizes the Liouvillian once.
+
     Parameters
     ----------
 
@@ -147,12 +147,14 @@ def countstat_current_noise(L, c_ops, wlist=None, rhoss=None, J_ops=None,
         List of current superoperators.
 
     sparse : bool
-        Flag that indicates whether to use sparse or dense matrix methods when
-        computing the pseudo inverse. Default is false, as sparse solvers
-        can fail for small systems. For larger systems the sparse solvers
-        are reccomended. 
-        
-        
+        Flag that indicates whether to use sparse or dense matrix methods.
+        Default is True.
+
+    method : str
+        'direct' (default) uses the frequency sweep described above. Any other
+        method is passed on to :func:`qutip.steadystate.pseudo_inverse`,
+        which is evaluated at each frequency.
+
     Returns
     --------
     I, S : tuple of arrays
@@ -178,91 +180,39 @@ def countstat_current_noise(L, c_ops, wlist=None, rhoss=None, J_ops=None,
     else:
         S = np.zeros((N, N,len(wlist)))
         
-    if sparse == False: 
-        rhoss_vec = mat2vec(rhoss.full()).ravel()
-        for k,w in enumerate(wlist):
-            R = pseudo_inverse(L, rhoss=rhoss, w= w, sparse = sparse, method=method)
+    rhoss_vec = mat2vec(rhoss.full()).ravel()
+    for i, Ji in enumerate(J_ops):
+        I[i] = expect_rho_vec(Ji.data, rhoss_vec, 1)
+
+    if method == "direct":
+        # Only the matrix elements tr[J_i R(w) J_j rhoss] are needed, so the
+        # reduced resolvent is applied to the vectors J_j rhoss for all
+        # frequencies at once, sharing the fill reducing ordering of the
+        # factorizations instead of forming the pseudo-inverse per frequency.
+        tr_vec = mat2vec(tensor([identity(n)
+                                 for n in L.dims[0][0]]).full()).ravel()
+        right = np.column_stack([Jj.data.dot(rhoss_vec) for Jj in J_ops])
+        left = np.vstack([Ji.data.T.dot(tr_vec) for Ji in J_ops])
+        wlist = np.asarray(wlist, dtype=float)
+        if settings.num_cpus > 1 and len(wlist) >= 100:
+            map_func = parallel_map
+        else:
+            map_func = None
+        M = _pseudo_inverse_sweep(L, rhoss, wlist, right, left,
+                                  method='splu' if sparse else 'auto',
+                                  map_func=map_func)
+        S -= np.real(M + np.transpose(M, (0, 2, 1))).transpose(1, 2, 0)
+        S[np.arange(N), np.arange(N), :] += I[:, np.newaxis]
+
+    else:
+        for k, w in enumerate(wlist):
+            R = pseudo_inverse(L, rhoss=rhoss, w=w, sparse=sparse,
+                               method=method)
             for i, Ji in enumerate(J_ops):
                 for j, Jj in enumerate(J_ops):
                     if i == j:
-                        I[i] = expect_rho_vec(Ji.data, rhoss_vec, 1)
-                        S[i, j,k] = I[i]
-                    S[i, j,k] -= expect_rho_vec((Ji * R * Jj 
-                                                + Jj * R * Ji).data,
-                                                rhoss_vec, 1)
-    else:
-        if method == "direct":
-            N = np.prod(L.dims[0][0])
-            
-            rhoss_vec = operator_to_vector(rhoss)
-            
-            tr_op = tensor([identity(n) for n in L.dims[0][0]])
-            tr_op_vec = operator_to_vector(tr_op)
-            
-            Pop = sp.kron(rhoss_vec.data, tr_op_vec.data.T, format='csr')
-            Iop = sp.eye(N*N, N*N, format='csr')
-            Q = Iop - Pop
-            
-            for k,w in enumerate(wlist):
-                
-                if w != 0.0:    
-                    L_temp = 1.0j*w*spre(tr_op) + L
-                else: #At zero frequency some solvers fail for small systems.
-                      #Adding a small finite frequency of order 1e-15
-                      #helps prevent the solvers from throwing an exception.
-                    L_temp =  1.0j*(1e-15)*spre(tr_op) + L
-                    
-                if not settings.has_mkl:
-                    A = L_temp.data.tocsc()
-                else:
-                    A = L_temp.data.tocsr()
-                    A.sort_indices()                      
-                      
-                rhoss_vec = mat2vec(rhoss.full()).ravel()               
-                
-                for j, Jj in enumerate(J_ops):
-                    Qj = Q.dot( Jj.data.dot( rhoss_vec))
-                    try:
-                        if settings.has_mkl:
-                            X_rho_vec_j = mkl_spsolve(A,Qj)                            
-                        else:
-                            X_rho_vec_j = sp.linalg.splu(A, permc_spec
-                                                 ='COLAMD').solve(Qj)
-                    except:
-                        X_rho_vec_j = sp.linalg.lsqr(A,Qj)[0]
-                    for i, Ji in enumerate(J_ops):
-                        Qi = Q.dot( Ji.data.dot(rhoss_vec))
-                        try:
-                            if settings.has_mkl:                              
-                                X_rho_vec_i = mkl_spsolve(A,Qi)  
-                            else:
-                                X_rho_vec_i = sp.linalg.splu(A, permc_spec
-                                                     ='COLAMD').solve(Qi)
-                        except:
-                             X_rho_vec_i = sp.linalg.lsqr(A,Qi)[0]
-                        if i == j:
-                            I[i] = expect_rho_vec(Ji.data, 
+                        S[i, j, k] = I[i]
+                    S[i, j, k] -= expect_rho_vec((Ji * R * Jj
+                                                 + Jj * R * Ji).data,
                                                  rhoss_vec, 1)
-                            S[j, i, k] = I[i]
-                        
-                        S[j, i, k] -= (expect_rho_vec(Jj.data * Q, 
-                                        X_rho_vec_i, 1) 
-                                        + expect_rho_vec(Ji.data * Q, 
-                                        X_rho_vec_j, 1))
-
-        else:
-            rhoss_vec = mat2vec(rhoss.full()).ravel()
-            for k,w in enumerate(wlist):
-
-                R = pseudo_inverse(L,rhoss=rhoss, w= w, sparse = sparse, 
-                                   method=method)
-                                   
-                for i, Ji in enumerate(J_ops):
-                    for j, Jj in enumerate(J_ops):
-                        if i == j:
-                            I[i] = expect_rho_vec(Ji.data, rhoss_vec, 1)
-                            S[i, j, k] = I[i]
-                        S[i, j, k] -= expect_rho_vec((Ji * R * Jj 
-                                                     + Jj * R * Ji).data,
-                                                     rhoss_vec, 1)
     return I, S
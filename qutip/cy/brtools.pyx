@@ -38,6 +38,7 @@ from qutip.cy.spmath cimport (_zcsr_kron_core, _zcsr_kron,
 from qutip.cy.spconvert cimport fdense2D_to_CSR
 from qutip.cy.spmatfuncs cimport spmvpy
 from qutip.cy.brtools cimport spec_func
+from qutip.cy.interpolate cimport interp, zinterp
 from libc.math cimport fabs, fmin
 from libc.float cimport DBL_MAX
 from libcpp.vector cimport vector
@@ -625,6 +626,179 @@ cdef CSR_Matrix sparse_to_eigbasis(complex[::1] Adata, int[::1] Aind, int[::1] A
     free_CSR(&B)
     free_CSR(&C)
     return A_eig
-     
- 
-   
\ No newline at end of file
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void br_term_mult_spectra(complex[::1,:] A_eig, complex[:,::1] spec,
+                double[:,::1] skew, double dw_min,
+                double complex * vec, double complex * out,
+                unsigned int nrows, int use_secular, double sec_cutoff):
+    """
+    Adds the product of the Bloch-Redfield tensor term for the coupling
+    operator `A_eig` (in the eigenbasis) onto `vec`, given the bath spectrum
+    evaluated on the frequency-difference matrix, spec[i,j] = S(skew[i,j]).
+    The tensor elements are evaluated on the fly and never stored.
+    """
+    cdef size_t a, b, c, d, kk
+    cdef size_t I, J
+    cdef complex elem
+    cdef complex[::1,:] G_ac = farray_alloc(nrows)
+    cdef complex[::1,:] G_db = farray_alloc(nrows)
+
+    # G_db[d,b] = sum_k A[d,k] A[k,b] S[d,k]
+    # G_ac[a,c] = sum_k A[a,k] A[k,c] S[c,k]
+    for a in range(nrows):
+        for b in range(nrows):
+            for kk in range(nrows):
+                G_db[a,b] = G_db[a,b] + A_eig[a,kk]*A_eig[kk,b]*spec[a,kk]
+                G_ac[a,b] = G_ac[a,b] + A_eig[a,kk]*A_eig[kk,b]*spec[b,kk]
+
+    for I in range(nrows**2):
+        a = I % nrows
+        b = I // nrows
+        for J in range(nrows**2):
+            c = J % nrows
+            d = J // nrows
+            if use_secular and (fabs(skew[a,b]-skew[c,d]) >= (dw_min * sec_cutoff)):
+                continue
+            elem = 0.5 * (A_eig[a,c]*A_eig[d,b]) * (spec[c,a]+spec[d,b])
+            if a == c:
+                elem -= 0.5 * G_db[d,b]
+            if b == d:
+                elem -= 0.5 * G_ac[a,c]
+            out[I] += elem * vec[J]
+
+    PyDataMem_FREE(&G_ac[0,0])
+    PyDataMem_FREE(&G_db[0,0])
+
+
+cdef class BR_Spline_RHS:
+    """
+    Right-hand side of the time-dependent Bloch-Redfield master equation for
+    time-dependence given as tabulated cubic splines.  Replaces the code
+    generated and compiled at runtime by :class:`qutip.cy.br_codegen.BR_Codegen`
+    for inputs of this form.
+
+    Coefficients are given as ``None`` (constant one) or
+    :class:`qutip.Cubic_Spline` objects in `t`, bath spectra as
+    :class:`qutip.Cubic_Spline` objects in `w`.
+
+    Parameters
+    ----------
+    H_ops, C_ops, A_ops : list of ndarray
+        Hamiltonian, collapse and bath-coupling operators as dense arrays.
+    H_coeffs, C_coeffs, A_coeffs : list
+        Time-dependence of each operator.
+    A_spectra : list
+        Bath spectrum for each coupling operator.
+    use_secular : bool
+        Flag that indicates if the secular approximation should be used.
+    sec_cutoff : float
+        Threshold for secular approximation.
+    atol : float
+        Threshold for removing small parameters.
+    """
+    cdef unsigned int nrows
+    cdef int use_secular
+    cdef double sec_cutoff, atol
+    cdef list H_ops, C_ops, A_ops
+    cdef list H_coeffs, C_coeffs, A_coeffs, A_spectra
+
+    def __init__(self, list H_ops, list H_coeffs, list C_ops, list C_coeffs,
+                 list A_ops, list A_spectra, list A_coeffs,
+                 bint use_secular=True, double sec_cutoff=0.1,
+                 double atol=1e-12):
+        self.nrows = H_ops[0].shape[0]
+        self.use_secular = use_secular
+        self.sec_cutoff = sec_cutoff
+        self.atol = atol
+        self.H_ops = [np.asfortranarray(op, dtype=complex) for op in H_ops]
+        self.C_ops = [np.asfortranarray(op, dtype=complex) for op in C_ops]
+        self.A_ops = [np.asfortranarray(op, dtype=complex) for op in A_ops]
+        self.H_coeffs = [self._spline_data(S) for S in H_coeffs]
+        self.C_coeffs = [self._spline_data(S) for S in C_coeffs]
+        self.A_coeffs = [self._spline_data(S) for S in A_coeffs]
+        self.A_spectra = [self._spline_data(S) for S in A_spectra]
+
+    def _spline_data(self, S):
+        if S is None:
+            return None
+        # real splines keep real coefficients and use interp
+        if S.is_complex:
+            return (S.a, S.b, np.ascontiguousarray(S.coeffs, dtype=complex),
+                    True)
+        return (S.a, S.b, np.ascontiguousarray(S.coeffs, dtype=float), False)
+
+    cdef complex _coeff(self, object S, double x):
+        if S is None:
+            return 1
+        if S[3]:
+            return zinterp(x, S[0], S[1], S[2])
+        return interp(x, S[0], S[1], S[2])
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    def __call__(self, double t, complex[::1] vec):
+        cdef unsigned int nrows = self.nrows
+        cdef size_t kk, ii, jj
+        cdef double complex * out = <complex *>PyDataMem_NEW_ZEROED(nrows**2,sizeof(complex))
+        cdef complex[::1, :] H = farray_alloc(nrows)
+        cdef complex[::1, :] evecs = farray_alloc(nrows)
+        cdef double * eigvals = <double *>PyDataMem_NEW_ZEROED(nrows,sizeof(double))
+        cdef complex[::1, :] A_eig
+        cdef complex[:,::1] spec
+        cdef double[:,::1] skew
+        cdef double dw_min
+        cdef complex alpha
+        cdef double a, b
+        cdef double[::1] coeffs
+        cdef complex[::1] zcoeffs
+        cdef object S
+
+        for kk in range(len(self.H_ops)):
+            dense_add_mult(H, self.H_ops[kk], self._coeff(self.H_coeffs[kk], t))
+        ZHEEVR(H, eigvals, evecs, nrows)
+        PyDataMem_FREE(&H[0,0])
+
+        cdef double complex * eig_vec = vec_to_eigbasis(vec, evecs, nrows)
+        diag_liou_mult(eigvals, eig_vec, out, nrows)
+
+        for kk in range(len(self.C_ops)):
+            cop_super_mult(self.C_ops[kk], evecs, eig_vec,
+                           self._coeff(self.C_coeffs[kk], t), out, nrows,
+                           self.atol)
+
+        if len(self.A_ops):
+            skew = np.zeros((nrows, nrows), dtype=float)
+            dw_min = skew_and_dwmin(eigvals, skew, nrows)
+            spec = np.zeros((nrows, nrows), dtype=complex)
+            for kk in range(len(self.A_ops)):
+                S = self.A_spectra[kk]
+                a = S[0]
+                b = S[1]
+                alpha = self._coeff(self.A_coeffs[kk], t)
+                if S[3]:
+                    zcoeffs = S[2]
+                    for ii in range(nrows):
+                        for jj in range(nrows):
+                            spec[ii,jj] = alpha * zinterp(skew[ii,jj], a, b,
+                                                          zcoeffs)
+                else:
+                    coeffs = S[2]
+                    for ii in range(nrows):
+                        for jj in range(nrows):
+                            spec[ii,jj] = alpha * interp(skew[ii,jj], a, b,
+                                                         coeffs)
+                A_eig = dense_to_eigbasis(self.A_ops[kk], evecs, nrows,
+                                          self.atol)
+                br_term_mult_spectra(A_eig, spec, skew, dw_min, eig_vec, out,
+                                     nrows, self.use_secular, self.sec_cutoff)
+                PyDataMem_FREE(&A_eig[0,0])
+
+        cdef np.ndarray[complex, ndim=1, mode='c'] arr_out = vec_to_fockbasis(out, evecs, nrows)
+        PyDataMem_FREE(&evecs[0,0])
+        PyDataMem_FREE(eigvals)
+        PyDataMem_FREE(eig_vec)
+        PyDataMem_FREE(out)
+        return arr_out
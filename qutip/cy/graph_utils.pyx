@@ -137,6 +137,44 @@ def _breadth_first_search(
     return order, level
 
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _connected_components(
+        cnp.ndarray[ITYPE_t, ndim=1, mode="c"] ind,
+        cnp.ndarray[ITYPE_t, ndim=1, mode="c"] ptr,
+        int num_rows):
+    """
+    Labels the connected components of a graph in sparse CSR format matrix
+    form with a single breadth first search over all nodes.  Components are
+    numbered in order of their lowest node.
+    """
+    cdef unsigned int i, j, ii, jj, seed
+    cdef unsigned int N = 0, level_start
+    cdef int num_comp = 0
+    cdef cnp.ndarray[ITYPE_t] order = np.empty(num_rows, dtype=ITYPE)
+    cdef cnp.ndarray[ITYPE_t] label = -1 * np.ones(num_rows, dtype=ITYPE)
+
+    for seed in range(num_rows):
+        if label[seed] != -1:
+            continue
+        label[seed] = num_comp
+        order[N] = seed
+        level_start = N
+        N += 1
+        while level_start < N:
+            i = order[level_start]
+            for jj in range(ptr[i], ptr[i + 1]):
+                j = ind[jj]
+                if label[j] == -1:
+                    label[j] = num_comp
+                    order[N] = j
+                    N += 1
+            level_start += 1
+        num_comp += 1
+
+    return label, num_comp
+
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
 def _reverse_cuthill_mckee(int[::1] ind, int[::1] ptr, int num_rows):
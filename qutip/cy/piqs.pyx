@@ -40,6 +40,12 @@ from qutip import Qobj
 
 cimport numpy as cnp
 cimport cython
+from libc.math cimport sqrt
+
+# Shifts (dj, dm) of the (j + dj, m + dm, m1 + dm) element coupled by each of
+# the nine rates, gamma1 to gamma9 (tau1 to tau9 for diagonal problems).
+cdef int[9] _DJ = [0, 0, 1, -1, 1, -1, 1, 0, -1]
+cdef int[9] _DM = [0, 1, 1, 1, 0, 0, -1, -1, -1]
 
 
 def _num_dicke_states(N):
@@ -228,6 +234,264 @@ cpdef list jmm1_dictionary(int N):
     return [jmm1_dict, jmm1_inv, jmm1_flat, jmm1_flat_inv]
 
 
+def jmm1_indices(N, j, m, m1):
+    """
+    Get the (i, k) indices in the density matrix of the (j, m, m1) elements.
+
+    This is the closed-form, vectorised equivalent of the map given by
+    `jmm1_dictionary`, without building the dictionaries.
+
+    Parameters
+    ----------
+    N: int
+        The number of two-level systems.
+
+    j, m, m1: float or array_like
+        The j, m, m1 values.
+
+    Returns
+    -------
+    i, k: int or ndarray
+        The row and column indices.
+    """
+    j = np.asarray(j, dtype=float)
+    m = np.asarray(m, dtype=float)
+    m1 = np.asarray(m1, dtype=float)
+    if (np.any(j < j_min(N)) or np.any(j > N/2) or
+            np.any(np.abs(m) > j) or np.any(np.abs(m1) > j)):
+        raise ValueError("Invalid (j, m, m1) values for N = {}".format(N))
+    block = np.rint(N/2 - j).astype(np.int64)
+    offset = block * (N + 2 - block)
+    i = offset + np.rint(j - m).astype(np.int64)
+    k = offset + np.rint(j - m1).astype(np.int64)
+    if i.ndim == 0:
+        return int(i), int(k)
+    return i, k
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef double _gamma(int which, double j, double m, double m1, double N,
+                   double yE, double yD, double yP, double yCE, double yCD,
+                   double yCP):
+    """
+    Rate gamma1 to gamma9 for the element (j, m, m1) it couples to.
+    """
+    cdef double g = 0.
+
+    if which == 1:
+        g = (yCE/2 * (2*j*(j+1) - m*(m-1) - m1*(m1-1)) +
+             yE/2 * (N+m+m1) + yP/2 * (N-m-m1) +
+             yCP/2 * (2*j*(j+1) - m*(m+1) - m1*(m1+1)) +
+             yCD/2 * (m-m1)**2)
+        if j <= 0:
+            g += yD*N/4
+        else:
+            g += yD/2*(N/2 - m*m1 * (N/2 + 1)/j/(j+1))
+        return -g
+    elif which == 2:
+        if yCE != 0:
+            g = yCE * sqrt((j+m) * (j-m+1) * (j+m1) * (j-m1+1))
+        if yE != 0 and j > 0:
+            g += (yE/2 * sqrt((j+m) * (j-m+1) * (j+m1) * (j-m1+1)) *
+                  (N/2 + 1)/(j*(j+1)))
+    elif which == 3:
+        if yE != 0 and j > 0:
+            g = (yE/2 * sqrt((j+m) * (j+m-1) * (j+m1) * (j+m1-1)) *
+                 (N/2 + j+1)/(j*(2*j + 1)))
+    elif which == 4:
+        if yE != 0 and j+1 > 0:
+            g = (yE/2 * sqrt((j-m+1) * (j-m+2) * (j-m1+1) * (j-m1+2)) *
+                 (N/2 - j)/((j+1) * (2*j + 1)))
+    elif which == 5:
+        if yD != 0 and j > 0:
+            g = (yD/2 * sqrt((j*j - m*m) * (j*j - m1*m1)) *
+                 (N/2 + j + 1)/(j*(2*j + 1)))
+    elif which == 6:
+        if yD != 0:
+            g = (yD/2 * sqrt(((j+1)**2 - m*m) * ((j+1)**2 - m1*m1)) *
+                 (N/2 - j)/((j+1) * (2*j+1)))
+    elif which == 7:
+        if yP != 0 and j > 0:
+            g = (yP/2 * sqrt((j-m-1) * (j-m) * (j-m1-1) * (j-m1)) *
+                 (N/2 + j + 1)/(j * (2*j+1)))
+    elif which == 8:
+        if yP != 0 and j > 0:
+            g = (yP/2 * sqrt((j+m+1) * (j-m) * (j+m1+1) * (j-m1)) *
+                 (N/2 + 1)/(j*(j+1)))
+        if yCP != 0:
+            g += yCP * sqrt((j-m) * (j+m+1) * (j+m1+1) * (j-m1))
+    elif which == 9:
+        if yP != 0:
+            g = (yP/2 * sqrt((j+m+1) * (j+m+2) * (j+m1+1) * (j+m1+2)) *
+                 (N/2 - j)/((j+1) * (2*j+1)))
+    return g
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef tuple _lindbladian_coo(int N, double emission=0., double dephasing=0.,
+                             double pumping=0., double collective_emission=0.,
+                             double collective_dephasing=0.,
+                             double collective_pumping=0.):
+    """
+    Build the nonzero elements of the Lindbladian in COO format.
+
+    The rows and columns are the flattened indices nds * i + k of the
+    density matrix elements, computed from the block structure of the Dicke
+    basis instead of dictionaries.
+
+    Returns
+    -------
+    rows, cols: ndarray
+        The row and column indices of the nonzero elements.
+
+    data: ndarray
+        The values of the nonzero elements.
+    """
+    cdef int nds = _num_dicke_states(N)
+    cdef int num_ladders = _num_dicke_ladders(N)
+    cdef double Nf = N
+    cdef long nnz_max = 0
+    cdef int b, a, a1, size, offset, t, b2, a2, a12, size2, offset2
+    cdef double j, m, m1, g
+    cdef long idx = 0
+
+    for b in range(num_ladders):
+        nnz_max += 9 * (N + 1 - 2*b)**2
+    cdef cnp.ndarray[cnp.int64_t, ndim=1] rows = np.empty(nnz_max,
+                                                          dtype=np.int64)
+    cdef cnp.ndarray[cnp.int64_t, ndim=1] cols = np.empty(nnz_max,
+                                                          dtype=np.int64)
+    cdef cnp.ndarray[cnp.float64_t, ndim=1] data = np.empty(nnz_max,
+                                                            dtype=np.float64)
+
+    for b in range(num_ladders):
+        j = Nf/2 - b
+        size = N + 1 - 2*b
+        offset = b * (N + 2 - b)
+        for a in range(size):
+            for a1 in range(size):
+                for t in range(9):
+                    b2 = b - _DJ[t]
+                    if b2 < 0 or b2 >= num_ladders:
+                        continue
+                    size2 = N + 1 - 2*b2
+                    a2 = a + _DJ[t] - _DM[t]
+                    a12 = a1 + _DJ[t] - _DM[t]
+                    if a2 < 0 or a2 >= size2 or a12 < 0 or a12 >= size2:
+                        continue
+                    m = j - a + _DM[t]
+                    m1 = j - a1 + _DM[t]
+                    g = _gamma(t + 1, j + _DJ[t], m, m1, Nf, emission,
+                               dephasing, pumping, collective_emission,
+                               collective_dephasing, collective_pumping)
+                    if g == 0:
+                        continue
+                    offset2 = b2 * (N + 2 - b2)
+                    rows[idx] = <long>nds * (offset + a) + offset + a1
+                    cols[idx] = <long>nds * (offset2 + a2) + offset2 + a12
+                    data[idx] = g
+                    idx += 1
+    return rows[:idx].copy(), cols[:idx].copy(), data[:idx].copy()
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef tuple _pim_coefficient_coo(int N, double emission=0.,
+                                 double dephasing=0., double pumping=0.,
+                                 double collective_emission=0.,
+                                 double collective_pumping=0.):
+    """
+    Build the nonzero elements of the coefficient matrix M of the rate
+    equation dp/dt = Mp for the diagonal elements p of the density matrix
+    in the Dicke basis, in COO format.
+
+    Returns
+    -------
+    rows, cols: ndarray
+        The row and column indices of the nonzero elements.
+
+    data: ndarray
+        The values of the nonzero elements.
+    """
+    cdef int num_ladders = _num_dicke_ladders(N)
+    cdef double Nf = N
+    cdef long nnz_max = 9 * _num_dicke_states(N)
+    cdef int b, a, size, offset, t, b2, a2, size2
+    cdef double j, j2, m2, tau
+    cdef long idx = 0
+    cdef double yS = collective_emission, yL = emission, yD = dephasing
+    cdef double yP = pumping, yCP = collective_pumping
+
+    cdef cnp.ndarray[cnp.int64_t, ndim=1] rows = np.empty(nnz_max,
+                                                          dtype=np.int64)
+    cdef cnp.ndarray[cnp.int64_t, ndim=1] cols = np.empty(nnz_max,
+                                                          dtype=np.int64)
+    cdef cnp.ndarray[cnp.float64_t, ndim=1] data = np.empty(nnz_max,
+                                                            dtype=np.float64)
+
+    for b in range(num_ladders):
+        j = Nf/2 - b
+        size = N + 1 - 2*b
+        offset = b * (N + 2 - b)
+        for a in range(size):
+            for t in range(9):
+                b2 = b - _DJ[t]
+                if b2 < 0 or b2 >= num_ladders:
+                    continue
+                size2 = N + 1 - 2*b2
+                a2 = a + _DJ[t] - _DM[t]
+                if a2 < 0 or a2 >= size2:
+                    continue
+                # the rates are evaluated at the coupled element (j2, m2)
+                j2 = j + _DJ[t]
+                m2 = j - a + _DM[t]
+                if t == 0:
+                    tau = (yS * (1 + j2 - m2) * (j2 + m2) + yL * (Nf/2 + m2) +
+                           yP * (Nf/2 - m2) +
+                           yCP * (1 + j2 + m2) * (j2 - m2))
+                    if j2 == 0:
+                        tau += yD * Nf/4
+                    else:
+                        tau += yD * (Nf/4 - m2*m2 * ((1 + Nf/2) /
+                                                     (2 * j2 * (j2+1))))
+                    tau = -tau
+                elif t == 1:
+                    tau = (yS * (1 + j2 - m2) * (j2 + m2) +
+                           yL * (((Nf/2 + 1) * (j2 - m2 + 1) * (j2 + m2)) /
+                                 (2 * j2 * (j2+1))))
+                elif t == 2:
+                    tau = yL * ((j2 + m2 - 1) * (j2 + m2) * (j2 + 1 + Nf/2) /
+                                (2 * j2 * (2 * j2 + 1)))
+                elif t == 3:
+                    tau = yL * ((j2 - m2 + 1) * (j2 - m2 + 2) * (Nf/2 - j2) /
+                                (2 * (j2 + 1) * (2 * j2 + 1)))
+                elif t == 4:
+                    tau = yD * ((j2 - m2) * (j2 + m2) * (j2 + 1 + Nf/2) /
+                                (2 * j2 * (2 * j2 + 1)))
+                elif t == 5:
+                    tau = yD * ((j2 - m2 + 1) * (j2 + m2 + 1) * (Nf/2 - j2) /
+                                (2 * (j2 + 1) * (2 * j2 + 1)))
+                elif t == 6:
+                    tau = yP * ((j2 - m2 - 1) * (j2 - m2) * (j2 + 1 + Nf/2) /
+                                (2 * j2 * (2 * j2 + 1)))
+                elif t == 7:
+                    tau = (yP * ((1 + Nf/2) * (j2 - m2) * (j2 + m2 + 1) /
+                                 (2 * j2 * (j2+1))) +
+                           yCP * (j2 - m2) * (j2 + m2 + 1))
+                else:
+                    tau = yP * ((j2 + m2 + 1) * (j2 + m2 + 2) * (Nf/2 - j2) /
+                                (2 * (j2 + 1) * (2 * j2 + 1)))
+                if tau == 0:
+                    continue
+                rows[idx] = offset + a
+                cols[idx] = b2 * (N + 2 - b2) + a2
+                data[idx] = tau
+                idx += 1
+    return rows[:idx].copy(), cols[:idx].copy(), data[:idx].copy()
+
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
 cdef class Dicke(object):
@@ -293,12 +557,13 @@ cdef class Dicke(object):
         default: 0.0
     """
     cdef int N
-    cdef float emission, dephasing, pumping
-    cdef float collective_emission, collective_dephasing, collective_pumping
+    cdef double emission, dephasing, pumping
+    cdef double collective_emission, collective_dephasing, collective_pumping
 
-    def __init__(self, int N, float emission=0., float dephasing=0.,
-                 float pumping=0., float collective_emission=0.,
-                 collective_dephasing=0., collective_pumping=0.):
+    def __init__(self, int N, double emission=0., double dephasing=0.,
+                 double pumping=0., double collective_emission=0.,
+                 double collective_dephasing=0.,
+                 double collective_pumping=0.):
         self.N = N
         self.emission = emission
         self.dephasing = dephasing
@@ -320,116 +585,15 @@ cdef class Dicke(object):
             The matrix size is (nds**2, nds**2) where nds is the number of
             Dicke states.
         """
-        N = self.N
-        cdef int nds = _num_dicke_states(N)
-        cdef int num_ladders = _num_dicke_ladders(N)
-
-        cdef list lindblad_row = []
-        cdef list lindblad_col = []
-        cdef list lindblad_data = []
-        cdef tuple jmm1_1
-        cdef tuple jmm1_2
-        cdef tuple jmm1_3
-        cdef tuple jmm1_4
-        cdef tuple jmm1_5
-        cdef tuple jmm1_6
-        cdef tuple jmm1_7
-        cdef tuple jmm1_8
-        cdef tuple jmm1_9
-
-        _1, _2, jmm1_row, jmm1_inv = jmm1_dictionary(N)
-
-        # perform loop in each row of matrix
-        for r in jmm1_row:
-            j, m, m1 = jmm1_row[r]
-            jmm1_1 = (j, m, m1)
-            jmm1_2 = (j, m+1, m1+1)
-            jmm1_3 = (j+1, m+1, m1+1)
-            jmm1_4 = (j-1, m+1, m1+1)
-            jmm1_5 = (j+1, m, m1)
-            jmm1_6 = (j-1, m, m1)
-            jmm1_7 = (j+1, m-1, m1-1)
-            jmm1_8 = (j, m-1, m1-1)
-            jmm1_9 = (j-1, m-1, m1-1)
-
-            g1 = self.gamma1(jmm1_1)
-            c1 = jmm1_inv[jmm1_1]
-
-            lindblad_row.append(int(r))
-            lindblad_col.append(int(c1))
-            lindblad_data.append(g1)
-
-            # generate gammas in the given row
-            # check if the gammas exist
-            # load gammas in the lindbladian in the correct position
-
-            if jmm1_2 in jmm1_inv:
-                g2 = self.gamma2(jmm1_2)
-                c2 = jmm1_inv[jmm1_2]
-
-                lindblad_row.append(int(r))
-                lindblad_col.append(int(c2))
-                lindblad_data.append(g2)
-
-            if jmm1_3 in jmm1_inv:
-                g3 = self.gamma3(jmm1_3)
-                c3 = jmm1_inv[jmm1_3]
-
-                lindblad_row.append(int(r))
-                lindblad_col.append(int(c3))
-                lindblad_data.append(g3)
-
-            if jmm1_4 in jmm1_inv:
-                g4 = self.gamma4(jmm1_4)
-                c4 = jmm1_inv[jmm1_4]
-
-                lindblad_row.append(int(r))
-                lindblad_col.append(int(c4))
-                lindblad_data.append(g4)
-
-            if jmm1_5 in jmm1_inv:
-                g5 = self.gamma5(jmm1_5)
-                c5 = jmm1_inv[jmm1_5]
-
-                lindblad_row.append(int(r))
-                lindblad_col.append(int(c5))
-                lindblad_data.append(g5)
-
-            if jmm1_6 in jmm1_inv:
-                g6 = self.gamma6(jmm1_6)
-                c6 = jmm1_inv[jmm1_6]
-
-                lindblad_row.append(int(r))
-                lindblad_col.append(int(c6))
-                lindblad_data.append(g6)
-
-            if jmm1_7 in jmm1_inv:
-                g7 = self.gamma7(jmm1_7)
-                c7 = jmm1_inv[jmm1_7]
-
-                lindblad_row.append(int(r))
-                lindblad_col.append(int(c7))
-                lindblad_data.append(g7)
-
-            if jmm1_8 in jmm1_inv:
-                g8 = self.gamma8(jmm1_8)
-                c8 = jmm1_inv[jmm1_8]
-
-                lindblad_row.append(int(r))
-                lindblad_col.append(int(c8))
-                lindblad_data.append(g8)
-
-            if jmm1_9 in jmm1_inv:
-                g9 = self.gamma9(jmm1_9)
-                c9 = jmm1_inv[jmm1_9]
-
-                lindblad_row.append(int(r))
-                lindblad_col.append(int(c9))
-                lindblad_data.append(g9)
-
-        cdef lindblad_matrix = csr_matrix((lindblad_data,
-                                          (lindblad_row, lindblad_col)),
-                                          shape=(nds**2, nds**2))
+        cdef long nds = _num_dicke_states(self.N)
+        rows, cols, data = _lindbladian_coo(self.N, self.emission,
+                                            self.dephasing, self.pumping,
+                                            self.collective_emission,
+                                            self.collective_dephasing,
+                                            self.collective_pumping)
+        cdef object lindblad_matrix = csr_matrix((data, (rows, cols)),
+                                                 shape=(nds**2, nds**2),
+                                                 dtype=complex)
 
         # make matrix a Qobj superoperator with expected dims
         llind_dims = [[[nds], [nds]], [[nds], [nds]]]
@@ -442,11 +606,11 @@ cdef class Dicke(object):
         """
         Calculate gamma1 for value of j, m, m'.
         """
-        cdef float j, m, m1
-        cdef float yCE, yE, yD, yP, yCP, yCD
-        cdef float N
-        cdef float spontaneous, losses, pump, collective_pump
-        cdef float dephase, collective_dephase, g1
+        cdef double j, m, m1
+        cdef double yCE, yE, yD, yP, yCP, yCD
+        cdef double N
+        cdef double spontaneous, losses, pump, collective_pump
+        cdef double dephase, collective_dephase, g1
 
         j, m, m1 = jmm1
         N = float(self.N)
@@ -481,11 +645,11 @@ cdef class Dicke(object):
         """
         Calculate gamma2 for given j, m, m'.
         """
-        cdef float j, m, m1
-        cdef float yCE, yE, yD, yP, yCP, yCD, g2
-        cdef float N
-        cdef float spontaneous, losses, pump, collective_pump
-        cdef float dephase, collective_dephase
+        cdef double j, m, m1
+        cdef double yCE, yE, yD, yP, yCP, yCD, g2
+        cdef double N
+        cdef double spontaneous, losses, pump, collective_pump
+        cdef double dephase, collective_dephase
 
         j, m, m1 = jmm1
         N = float(self.N)
@@ -511,11 +675,11 @@ cdef class Dicke(object):
         """
         Calculate gamma3 for given j, m, m'.
         """
-        cdef float j, m, m1
-        cdef float yE
-        cdef float N
-        cdef float spontaneous, losses, pump, collective_pump
-        cdef float dephase, collective_dephase
+        cdef double j, m, m1
+        cdef double yE
+        cdef double N
+        cdef double spontaneous, losses, pump, collective_pump
+        cdef double dephase, collective_dephase
 
         cdef complex g3
         j, m, m1 = jmm1
@@ -535,10 +699,10 @@ cdef class Dicke(object):
         """
         Calculate gamma4 for given j, m, m'.
         """
-        cdef float j, m, m1
+        cdef double j, m, m1
         cdef complex g4
-        cdef float yE
-        cdef float N
+        cdef double yE
+        cdef double N
 
         N = float(self.N)
         j, m, m1 = jmm1
@@ -557,11 +721,11 @@ cdef class Dicke(object):
         """
         Calculate gamma5 for given j, m, m'.
         """
-        cdef float j, m, m1
+        cdef double j, m, m1
         cdef complex g5
         j, m, m1 = jmm1
-        cdef float yD
-        cdef float N
+        cdef double yD
+        cdef double N
 
         N = float(self.N)
         yD = self.dephasing
@@ -580,9 +744,9 @@ cdef class Dicke(object):
         """
         Calculate gamma6 for given j, m, m'.
         """
-        cdef float j, m, m1
-        cdef float yD
-        cdef float N
+        cdef double j, m, m1
+        cdef double yD
+        cdef double N
         cdef complex g6
 
         j, m, m1 = jmm1
@@ -603,9 +767,9 @@ cdef class Dicke(object):
         """
         Calculate gamma7 for given j, m, m'.
         """
-        cdef float j, m, m1
-        cdef float yP
-        cdef float N
+        cdef double j, m, m1
+        cdef double yP
+        cdef double N
         cdef complex g7
 
         j, m, m1 = jmm1
@@ -625,9 +789,9 @@ cdef class Dicke(object):
         """
         Calculate gamma8 for given j, m, m'.
         """
-        cdef float j, m, m1
-        cdef float yP, yCP
-        cdef float N
+        cdef double j, m, m1
+        cdef double yP, yCP
+        cdef double N
         cdef complex g8
 
         j, m, m1 = jmm1
@@ -653,9 +817,9 @@ cdef class Dicke(object):
         """
         Calculate gamma9 for given j, m, m'.
         """
-        cdef float j, m, m1
-        cdef float yP
-        cdef float N
+        cdef double j, m, m1
+        cdef double yP
+        cdef double N
         cdef complex g9
 
         j, m, m1 = jmm1
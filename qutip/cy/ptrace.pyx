@@ -31,7 +31,7 @@
 #    OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 ###############################################################################
 import numpy as np
-from qutip.cy.spconvert import zcsr_reshape
+from qutip.cy.spconvert import zcsr_reshape, dense2D_to_fastcsr_cmode
 from qutip.cy.spmath import zcsr_mult
 from qutip.fastsparse import fast_csr_matrix
 cimport numpy as cnp
@@ -55,7 +55,8 @@ def _ptrace(object rho, _sel):
     if isinstance(_sel, int):
         _sel = np.array([_sel], dtype=np.int32)
     else:
-        _sel = np.asarray(_sel, dtype = np.int32)
+        # the kept subsystems are in ascending order, as in _ptrace_dense
+        _sel = np.sort(np.asarray(_sel, dtype = np.int32).ravel())
     
     cdef int[::1] sel = _sel
     
@@ -96,6 +97,56 @@ def _ptrace(object rho, _sel):
     return rho1_data, rho1_dims, rho1_shape
 
 
+def _ptrace_dense(object Q, _sel):
+    """
+    Private function calculating the partial trace with dense tensor
+    reshapes.  Kets are reshaped into a (kept x traced) matrix and the
+    reduced density matrix is formed by a single matrix product, so that
+    the full density matrix is never built.  Operators are reshaped into
+    a rank-2n tensor and the traced axes are contracted with einsum.
+    """
+    cdef int nd, M, R
+    cdef cnp.ndarray[int, ndim=1, mode='c'] drho
+    cdef bint ket = np.prod(Q.dims[1]) == 1
+
+    drho = np.asarray(Q.dims[0], dtype=np.int32).ravel()
+    nd = drho.shape[0]
+
+    if isinstance(_sel, int):
+        sel = [_sel]
+    else:
+        sel = sorted(np.asarray(_sel, dtype=np.int32).ravel().tolist())
+    for mm in sel:
+        if (mm < 0) or (mm >= nd):
+            raise TypeError("Invalid selection index in ptrace.")
+    if len(set(sel)) != len(sel):
+        raise TypeError("Duplicate selection index in ptrace.")
+
+    rest = [mm for mm in range(nd) if mm not in sel]
+    dims_kept = drho.take(sel).tolist()
+    M = np.prod(dims_kept)
+    R = np.prod(drho.take(rest))
+    dims = drho.tolist()
+
+    if ket:
+        vmat = (Q.full()
+                .reshape(dims)
+                .transpose(sel + rest)
+                .reshape(M, R))
+        rhomat = vmat.dot(vmat.conj().T)
+    else:
+        rhomat = np.einsum('ijik->jk',
+                           Q.full()
+                           .reshape(dims + dims)
+                           .transpose(rest + sel +
+                                      [nd + mm for mm in rest] +
+                                      [nd + mm for mm in sel])
+                           .reshape(R, M, R, M))
+    rho1_data = dense2D_to_fastcsr_cmode(
+        np.ascontiguousarray(rhomat, dtype=complex), M, M)
+    return rho1_data, [dims_kept, dims_kept], [M, M]
+
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
 @cython.cdivision(True)
@@ -39,6 +39,8 @@ from libcpp cimport bool
 cdef extern from "src/zspmv.hpp" nogil:
     void zspmvpy(double complex *data, int *ind, int *ptr, double complex *vec, 
                 double complex a, double complex *out, int nrows)
+    void cspmvpy(float complex *data, int *ind, int *ptr, double complex *vec,
+                double complex a, double complex *out, int nrows)
 
 include "complex_math.pxi"
 
@@ -157,6 +159,28 @@ cpdef cnp.ndarray[complex, ndim=1, mode="c"] cy_ode_rhs(
     return out
 
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef cnp.ndarray[complex, ndim=1, mode="c"] cy_ode_rhs_single(
+        double t,
+        complex[::1] rho,
+        float complex[::1] data,
+        int[::1] ind,
+        int[::1] ptr):
+    """
+    Single precision version of cy_ode_rhs.  The sparse matrix data is
+    complex64, which halves the memory traffic of the matrix elements, and
+    is widened to double for each product, so the state and the returned
+    derivative stay complex128 as required by ZVODE.
+    """
+    cdef unsigned int nrows = rho.shape[0]
+    cdef cnp.ndarray[complex, ndim=1, mode="c"] out = \
+        np.zeros(nrows, dtype=complex)
+    cspmvpy(&data[0], &ind[0], &ptr[0], &rho[0], 1.0, &out[0], nrows)
+
+    return out
+
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
 cpdef cnp.ndarray[complex, ndim=1, mode="c"] cy_ode_psi_func_td(
@@ -244,6 +268,34 @@ cpdef cy_expect_psi_csr(complex[::1] data,
         return expt
 
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef cy_expect_psi_csr_single(float complex[::1] data,
+                               int[::1] ind,
+                               int[::1] ptr,
+                               complex[::1] vec,
+                               bool isherm):
+    """
+    Expectation value of a complex64 CSR operator with respect to a
+    complex128 state vector.  The operator elements are widened to double
+    for the products, and all accumulation is done in double precision.
+    """
+    cdef size_t row
+    cdef unsigned int nrows = vec.shape[0]
+    cdef complex expt = 0
+    cdef cnp.ndarray[complex, ndim=1, mode="c"] y = \
+        np.zeros(nrows, dtype=complex)
+    cspmvpy(&data[0], &ind[0], &ptr[0], &vec[0], 1.0, &y[0], nrows)
+
+    for row in range(nrows):
+        expt += conj(vec[row])*y[row]
+
+    if isherm :
+        return real(expt)
+    else:
+        return expt
+
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
 cpdef cy_expect_rho_vec(object super_op,
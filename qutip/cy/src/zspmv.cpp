@@ -69,6 +69,44 @@ void zspmvpy(const std::complex<double> * __restrict__ data, const int * __restr
         _mm_storeu_pd((double *)&out[row], num3);
     }
 }
+void cspmvpy(const std::complex<float> * __restrict__ data, const int * __restrict__ ind,
+            const int * __restrict__ ptr,
+            const std::complex<double> * __restrict__ vec, const std::complex<double> a,
+            std::complex<double> * __restrict__ out, const unsigned int nrows)
+{
+    size_t row, jj;
+    unsigned int row_start, row_end;
+    __m128d num1, num2, num3, num4, dat;
+    for (row=0; row < nrows; row++)
+    {
+        num4 = _mm_setzero_pd();
+        row_start = ptr[row];
+        row_end = ptr[row+1];
+        for (jj=row_start; jj <row_end; jj++)
+        {
+            // single precision matrix element widened to double
+            dat = _mm_cvtps_pd(_mm_castpd_ps(_mm_load_sd(
+                    reinterpret_cast<const double *>(&data[jj]))));
+            num1 = _mm_unpacklo_pd(dat, dat);
+            num2 = _mm_loadu_pd(reinterpret_cast<const double *>(&vec[ind[jj]]));
+            num3 = _mm_mul_pd(num2, num1);
+            num1 = _mm_unpackhi_pd(dat, dat);
+            num2 = _mm_shuffle_pd(num2, num2, 1);
+            num2 = _mm_mul_pd(num2, num1);
+            num3 = _mm_addsub_pd(num3, num2);
+            num4 = _mm_add_pd(num3, num4);
+        }
+        num1 = _mm_loaddup_pd(&reinterpret_cast<const double(&)[2]>(a)[0]);
+        num3 = _mm_mul_pd(num4, num1);
+        num1 = _mm_loaddup_pd(&reinterpret_cast<const double(&)[2]>(a)[1]);
+        num4 = _mm_shuffle_pd(num4, num4, 1);
+        num4 = _mm_mul_pd(num4, num1);
+        num3 = _mm_addsub_pd(num3, num4);
+        num2 = _mm_loadu_pd((double *)&out[row]);
+        num3 = _mm_add_pd(num2, num3);
+        _mm_storeu_pd((double *)&out[row], num3);
+    }
+}
 #elif defined(__GNUC__) // Using GCC or CLANG but no SSE3
 void zspmvpy(const std::complex<double> * __restrict__ data, const int * __restrict__ ind,
             const int * __restrict__ ptr,
@@ -90,6 +128,27 @@ void zspmvpy(const std::complex<double> * __restrict__ data, const int * __restr
         out[row] += a*dot;
     }
 }
+
+void cspmvpy(const std::complex<float> * __restrict__ data, const int * __restrict__ ind,
+            const int * __restrict__ ptr,
+            const std::complex<double> * __restrict__ vec, const std::complex<double> a,
+            std::complex<double> * __restrict__ out, const unsigned int nrows)
+{
+    size_t row, jj;
+    unsigned int row_start, row_end;
+    std::complex<double> dot;
+    for (row=0; row < nrows; row++)
+    {
+        dot = 0;
+        row_start = ptr[row];
+        row_end = ptr[row+1];
+        for (jj=row_start; jj <row_end; jj++)
+        {
+            dot += std::complex<double>(data[jj])*vec[ind[jj]];
+        }
+        out[row] += a*dot;
+    }
+}
 #elif defined(_MSC_VER) && defined(__AVX__) // Visual Studio with AVX
 #include <pmmintrin.h>
 void zspmvpy(const std::complex<double> * __restrict data, const int * __restrict ind,
@@ -127,6 +186,27 @@ void zspmvpy(const std::complex<double> * __restrict data, const int * __restric
         _mm_storeu_pd((double *)&out[row], num3);
     }
 }
+
+void cspmvpy(const std::complex<float> * __restrict data, const int * __restrict ind,
+            const int * __restrict ptr,
+            const std::complex<double> * __restrict vec, const std::complex<double> a,
+            std::complex<double> * __restrict out, const unsigned int nrows)
+{
+    size_t row, jj;
+    unsigned int row_start, row_end;
+    std::complex<double> dot;
+    for (row=0; row < nrows; row++)
+    {
+        dot = 0;
+        row_start = ptr[row];
+        row_end = ptr[row+1];
+        for (jj=row_start; jj <row_end; jj++)
+        {
+            dot += std::complex<double>(data[jj])*vec[ind[jj]];
+        }
+        out[row] += a*dot;
+    }
+}
 #elif defined(_MSC_VER) // Visual Studio no AVX
 void zspmvpy(const std::complex<double> * __restrict data, const int * __restrict ind,
             const int * __restrict ptr,
@@ -148,6 +228,27 @@ void zspmvpy(const std::complex<double> * __restrict data, const int * __restric
         out[row] += a*dot;
     }
 }
+
+void cspmvpy(const std::complex<float> * __restrict data, const int * __restrict ind,
+            const int * __restrict ptr,
+            const std::complex<double> * __restrict vec, const std::complex<double> a,
+            std::complex<double> * __restrict out, const unsigned int nrows)
+{
+    size_t row, jj;
+    unsigned int row_start, row_end;
+    std::complex<double> dot;
+    for (row=0; row < nrows; row++)
+    {
+        dot = 0;
+        row_start = ptr[row];
+        row_end = ptr[row+1];
+        for (jj=row_start; jj <row_end; jj++)
+        {
+            dot += std::complex<double>(data[jj])*vec[ind[jj]];
+        }
+        out[row] += a*dot;
+    }
+}
 #else // Everything else
 void zspmvpy(const std::complex<double> * data, const int * ind,
             const int * ptr,
@@ -169,4 +270,25 @@ void zspmvpy(const std::complex<double> * data, const int * ind,
         out[row] += a*dot;
     }
 }
+
+void cspmvpy(const std::complex<float> * data, const int * ind,
+            const int * ptr,
+            const std::complex<double> * vec, const std::complex<double> a,
+            std::complex<double> * out, const unsigned int nrows)
+{
+    size_t row, jj;
+    unsigned int row_start, row_end;
+    std::complex<double> dot;
+    for (row=0; row < nrows; row++)
+    {
+        dot = 0;
+        row_start = ptr[row];
+        row_end = ptr[row+1];
+        for (jj=row_start; jj <row_end; jj++)
+        {
+            dot += std::complex<double>(data[jj])*vec[ind[jj]];
+        }
+        out[row] += a*dot;
+    }
+}
 #endif
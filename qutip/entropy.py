@@ -32,11 +32,13 @@
 ###############################################################################
 
 __all__ = ['entropy_vn', 'entropy_linear', 'entropy_mutual', 'negativity',
-           'concurrence', 'entropy_conditional', 'entangling_power']
+           'concurrence', 'entropy_conditional', 'entangling_power',
+           'schmidt_spectrum', 'entropy_entanglement']
 
+import numpy as np
 from numpy import e, real, sort, sqrt
 from scipy import log, log2
-from qutip.qobj import ptrace
+from qutip.qobj import Qobj, ptrace
 from qutip.states import ket2dm
 from qutip.tensor import tensor
 from qutip.operators import sigmay
@@ -161,21 +163,30 @@ def negativity(rho, subsys, method='tracenorm', logarithmic=False):
     by the density matrix rho. The subsys argument is an index that
     indicates which system to compute the negativity for.
 
+    For a ket the negativity of `subsys` with respect to the rest of the
+    system follows directly from the Schmidt coefficients and no partial
+    transpose is formed.
+
     .. note::
 
         Experimental.
     """
-    mask = [idx == subsys for idx, n in enumerate(rho.dims[0])]
-    rho_pt = partial_transpose(rho, mask)
-
-    if method == 'tracenorm':
-        N = ((rho_pt.dag() * rho_pt).sqrtm().tr().real - 1)/2.0
-    elif method == 'eigenvalues':
-        l = rho_pt.eigenenergies()
-        N = ((abs(l)-l)/2).sum()
-    else:
+    if method not in ['tracenorm', 'eigenvalues']:
         raise ValueError("Unknown method %s" % method)
 
+    if rho.isket:
+        svals = _schmidt_values(rho, [subsys])[0]
+        N = (svals.sum() ** 2 - 1) / 2.0
+    else:
+        mask = [idx == subsys for idx, n in enumerate(rho.dims[0])]
+        rho_pt = partial_transpose(rho, mask)
+
+        if method == 'tracenorm':
+            N = ((rho_pt.dag() * rho_pt).sqrtm().tr().real - 1)/2.0
+        else:
+            l = rho_pt.eigenenergies()
+            N = ((abs(l)-l)/2).sum()
+
     if logarithmic:
         return log2(2 * N + 1)
     else:
@@ -190,7 +201,7 @@ def entropy_mutual(rho, selA, selB, base=e, sparse=False):
     Parameters
     ----------
     rho : qobj
-        Density matrix for composite quantum systems
+        Density matrix or ket for composite quantum systems
     selA : int/list
         `int` or `list` of first selected density matrix components.
     selB : int/list
@@ -198,7 +209,8 @@ def entropy_mutual(rho, selA, selB, base=e, sparse=False):
     base : {e,2}
         Base of logarithm.
     sparse : {False,True}
-        Use sparse eigensolver.
+        Use sparse eigensolver.  Not used for kets, whose mutual information
+        follows from the Schmidt coefficients.
 
     Returns
     -------
@@ -210,12 +222,16 @@ def entropy_mutual(rho, selA, selB, base=e, sparse=False):
         selA = [selA]
     if isinstance(selB, int):
         selB = [selB]
-    if rho.type != 'oper':
-        raise TypeError("Input must be a density matrix.")
+    if rho.type not in ['oper', 'ket']:
+        raise TypeError("Input must be a density matrix or ket.")
     if (len(selA) + len(selB)) != len(rho.dims[0]):
         raise TypeError("Number of selected components must match " +
                         "total number.")
 
+    if rho.isket:
+        # S(A) = S(B) and S(AB) = 0 for a pure state.
+        return 2 * entropy_entanglement(rho, selA, base)
+
     rhoA = ptrace(rho, selA)
     rhoB = ptrace(rho, selB)
     out = (entropy_vn(rhoA, base, sparse=sparse) +
@@ -224,6 +240,128 @@ def entropy_mutual(rho, selA, selB, base=e, sparse=False):
     return out
 
 
+def _schmidt_values(states, sel):
+    """
+    Schmidt coefficients of one or more kets with respect to the bipartition
+    `sel` versus the remaining components.  The kets are reshaped into
+    (kept x traced) matrices and stacked, so that a single batched thin SVD
+    gives the coefficients of all states.  Returns an array of shape
+    (n_states, min(kept, traced)) sorted in descending order.
+    """
+    if isinstance(states, Qobj):
+        states = [states]
+    if len(states) == 0:
+        raise ValueError("At least one ket is required.")
+    dims = states[0].dims
+    for psi in states:
+        if not psi.isket:
+            raise TypeError("Input must be a ket or a list of kets.")
+        if psi.dims != dims:
+            raise TypeError("All kets must have the same dimensions.")
+
+    if isinstance(sel, int):
+        sel = [sel]
+    sel = sorted(sel)
+    ndims = dims[0]
+    if any(k < 0 or k >= len(ndims) for k in sel) or len(set(sel)) != len(sel):
+        raise TypeError("Invalid selection index.")
+    rest = [k for k in range(len(ndims)) if k not in sel]
+    M = int(np.prod([ndims[k] for k in sel]))
+    R = int(np.prod([ndims[k] for k in rest]))
+
+    vecs = np.array([psi.full().ravel() for psi in states])
+    vmats = (vecs.reshape([len(states)] + ndims)
+             .transpose([0] + [k + 1 for k in sel] + [k + 1 for k in rest])
+             .reshape(len(states), M, R))
+    return np.linalg.svd(vmats, compute_uv=False)
+
+
+def schmidt_spectrum(psi, sel, tol=0):
+    """
+    Schmidt spectrum of a pure bipartite state, i.e. the non-zero
+    eigenvalues of the reduced density matrix of the selected components.
+    It is computed from a singular value decomposition of the ket reshaped
+    to the bipartition, without forming any density matrix.
+
+    Parameters
+    ----------
+    psi : qobj / list
+        Ket or list of kets with identical dims (e.g. ``Result.states``).
+    sel : int/list
+        `int` or `list` of components that form the first part of the
+        bipartition.
+    tol : float {0}
+        Schmidt weights smaller than or equal to `tol` are discarded.
+
+    Returns
+    -------
+    spectrum : array / list of arrays
+        Schmidt weights in descending order.  A list of arrays is returned
+        if `psi` is a list.
+
+    """
+    weights = _schmidt_values(psi, sel) ** 2
+    out = [w[w > tol] for w in weights]
+    if isinstance(psi, Qobj):
+        return out[0]
+    return out
+
+
+def entropy_entanglement(psi, sel, base=e, alpha=1):
+    """
+    Entanglement entropy of a pure bipartite state, i.e. the entropy of
+    the reduced density matrix of the selected components, computed from
+    the Schmidt coefficients of the ket.
+
+    Parameters
+    ----------
+    psi : qobj / list
+        Ket or list of kets with identical dims (e.g. ``Result.states``).
+    sel : int/list
+        `int` or `list` of components that form the first part of the
+        bipartition.
+    base : {e,2}
+        Base of logarithm.
+    alpha : float {1}
+        Order of the Renyi entropy.  The default, `alpha=1`, gives the
+        von-Neumann entropy.
+
+    Returns
+    -------
+    entropy : float / array
+        Entanglement entropy of `psi`, or an array of entropies if `psi`
+        is a list.
+
+    Examples
+    --------
+    >>> bell = (tensor(basis(2, 0), basis(2, 0)) +
+    ...         tensor(basis(2, 1), basis(2, 1))).unit()
+    >>> entropy_entanglement(bell, 0, 2)
+    1.0
+
+    """
+    if base == 2:
+        logfunc = np.log2
+    elif base == e:
+        logfunc = np.log
+    else:
+        raise ValueError("Base must be 2 or e.")
+    if alpha < 0:
+        raise ValueError("alpha must be non-negative.")
+
+    weights = _schmidt_values(psi, sel) ** 2
+    if alpha == 1:
+        nzweights = np.where(weights > 0, weights, 1)
+        out = -np.sum(weights * logfunc(nzweights), axis=1)
+    elif alpha == 0:
+        out = logfunc(np.sum(weights > 0, axis=1))
+    else:
+        out = logfunc(np.sum(weights ** alpha, axis=1)) / (1 - alpha)
+    if isinstance(psi, Qobj):
+        return float(out[0])
+    return out
+
+
 def _entropy_relative(rho, sigma, base=e, sparse=False):
     """
     ****NEEDS TO BE WORKED ON****
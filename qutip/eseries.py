@@ -79,7 +79,8 @@ class eseries():
 
         elif np.any(np.asarray(q, dtype=object)) and (len(s) == 0):
             if isinstance(q, eseries):
-                self.ampl = q.ampl
+                self._ampl = q._ampl
+                self._ampl_data = q._ampl_data
                 self.rates = q.rates
                 self.dims = q.dims
                 self.shape = q.shape
@@ -141,6 +142,57 @@ class eseries():
             self.ampl = np.array(ampl, dtype=object)
             self.rates = np.array(rates)
 
+    @property
+    def ampl(self):
+        if self._ampl is None:
+            # amplitudes are only held as a dense array, build the Qobj view
+            self._ampl = np.empty(len(self._ampl_data), dtype=object)
+            for k, a in enumerate(self._ampl_data):
+                self._ampl[k] = Qobj(a.reshape(self.shape), dims=self.dims)
+        return self._ampl
+
+    @ampl.setter
+    def ampl(self, value):
+        self._ampl = value
+        self._ampl_data = None
+
+    @classmethod
+    def _from_array(cls, ampl, rates, dims, shape):
+        """
+        Create an exponential series with quantum object amplitudes from a
+        dense array with one flattened (row-major) amplitude per row.
+        """
+        out = cls()
+        out._ampl = None
+        out._ampl_data = np.asarray(ampl, dtype=complex)
+        out.rates = np.asarray(rates)
+        out.dims = dims
+        out.shape = shape
+        return out
+
+    def _is_qobj(self):
+        """
+        Returns True if the amplitudes are quantum objects.
+        """
+        if self._ampl is None:
+            return True
+        return len(self._ampl) > 0 and isinstance(self._ampl[0], Qobj)
+
+    def _ampl_array(self):
+        """
+        Dense array of amplitudes of shape (number of terms, size of the
+        amplitudes), with quantum objects flattened in row-major order.
+        """
+        if self._ampl_data is None:
+            if self._is_qobj():
+                self._ampl_data = np.array([a.full().ravel()
+                                            for a in self._ampl],
+                                           dtype=complex)
+            else:
+                self._ampl_data = np.asarray(
+                    self._ampl, dtype=complex).reshape(len(self._ampl), -1)
+        return self._ampl_data
+
     def __str__(self):  # string of ESERIES information
         self.tidyup()
         s = "ESERIES object: " + str(len(self.ampl)) + " terms\n"
@@ -253,30 +305,22 @@ class eseries():
         if isinstance(tlist, float) or isinstance(tlist, int):
             tlist = [tlist]
 
-        if isinstance(self.ampl[0], Qobj):
-            # amplitude vector contains quantum objects
-            val_list = []
+        # all terms at all times as one product exp(tlist x rates) . ampl
+        exp_factors = np.exp(np.outer(tlist, self.rates))
+        vals = exp_factors.dot(self._ampl_array())
 
+        if self._is_qobj():
+            # amplitude vector contains quantum objects
+            val_list = np.empty(len(tlist), dtype=object)
             for j in range(len(tlist)):
-                exp_factors = np.exp(np.array(self.rates) * tlist[j])
-
-                val = 0
-                for i in range(len(self.ampl)):
-                    val += self.ampl[i] * exp_factors[i]
-
-                val_list.append(val)
-
-            val_list = np.array(val_list, dtype=object)
+                val_list[j] = Qobj(vals[j].reshape(self.shape),
+                                   dims=self.dims)
         else:
             # the amplitude vector contains c numbers
-            val_list = np.zeros(np.size(tlist), dtype=complex)
+            val_list = vals[:, 0]
+            if all(np.imag(val_list) == 0):
+                val_list = np.real(val_list)
 
-            for j in range(len(tlist)):
-                exp_factors = np.exp(np.array(self.rates) * tlist[j])
-                val_list[j] = np.sum(np.dot(self.ampl, exp_factors))
-
-        if all(np.imag(val_list) == 0):
-            val_list = np.real(val_list)
         if len(tlist) == 1:
             return val_list[0]
         else:
@@ -298,13 +342,10 @@ class eseries():
             Values of exponential series at frequencies in ``wlist``.
 
         """
-        val_list = np.zeros(np.size(wlist))
-
-        for i in range(len(wlist)):
-            val_list[i] = 2 * np.real(
-                np.dot(self.ampl, 1. / (1.0j * wlist[i] - self.rates)))
-
-        return val_list
+        wlist = np.atleast_1d(np.asarray(wlist, dtype=float))
+        return 2 * np.real(
+            (1. / (1.0j * wlist[:, np.newaxis] - self.rates)).dot(
+                np.asarray(self.ampl, dtype=complex)))
 
     def tidyup(self, *args):
         """ Returns a tidier version of exponential series.
@@ -315,46 +356,40 @@ class eseries():
         rate_tol = 1e-10
         ampl_tol = 1e-10
 
-        ampl_dict = {}
-        unique_rates = {}
-        ur_len = 0
-
-        for r_idx in range(len(self.rates)):
-
-            # look for a matching rate in the list of unique rates
-            idx = -1
-            for ur_key in unique_rates.keys():
-                if abs(self.rates[r_idx] - unique_rates[ur_key]) < rate_tol:
-                    idx = ur_key
-                    break
+        rates = np.asarray(self.rates)
+        if len(rates) == 0:
+            return self
+        is_qobj = self._is_qobj()
+        ampl = self._ampl_array()
 
-            if idx == -1:
-                # no matching rate, add it
-                unique_rates[ur_len] = self.rates[r_idx]
-                ampl_dict[ur_len] = [self.ampl[r_idx]]
-                ur_len = len(unique_rates)
+        # label each rate with the first matching unique rate
+        unique_rates = np.empty(len(rates), dtype=np.result_type(rates, float))
+        labels = np.empty(len(rates), dtype=int)
+        ur_len = 0
+        for r_idx, rate in enumerate(rates):
+            match = np.abs(unique_rates[:ur_len] - rate) < rate_tol
+            if np.any(match):
+                labels[r_idx] = np.argmax(match)
             else:
-                # found matching rate, append amplitude to its list
-                ampl_dict[idx].append(self.ampl[r_idx])
+                unique_rates[ur_len] = rate
+                labels[r_idx] = ur_len
+                ur_len += 1
 
         # create new amplitude and rate list with only unique rates, and
         # nonzero amplitudes
-        self.rates = np.array([])
-        self.ampl = np.array([])
-        for ur_key in unique_rates.keys():
-            total_ampl = np.sum(np.asarray(ampl_dict[ur_key], dtype=object))
-
-            if (isinstance(total_ampl, float) or
-                    isinstance(total_ampl, complex)):
-                if abs(total_ampl) > ampl_tol:
-                    self.rates = np.append(self.rates, unique_rates[ur_key])
-                    self.ampl = np.append(self.ampl, total_ampl)
-            else:
-                if abs(total_ampl.full()).max() > ampl_tol:
-                    self.rates = np.append(self.rates, unique_rates[ur_key])
-                    self.ampl = np.append(self.ampl,
-                                          np.asarray(total_ampl,
-                                                     dtype=object))
+        total_ampl = np.zeros((ur_len, ampl.shape[1]), dtype=complex)
+        np.add.at(total_ampl, labels, ampl)
+        keep = np.abs(total_ampl).max(axis=1) > ampl_tol
+
+        self.rates = unique_rates[:ur_len][keep]
+        if is_qobj:
+            self._ampl = None
+            self._ampl_data = total_ampl[keep]
+        else:
+            total_ampl = total_ampl[keep, 0]
+            if np.asarray(self._ampl).dtype.kind in 'iuf':
+                total_ampl = np.real(total_ampl)
+            self.ampl = total_ampl
 
         return self
 
@@ -38,9 +38,8 @@ import scipy.linalg as la
 import scipy.sparse as sp
 
 from qutip.qobj import Qobj, issuper, isket, isoper
-from qutip.eseries import eseries, estidy, esval
-from qutip.expect import expect
-from qutip.superoperator import liouvillian, mat2vec, vec2mat
+from qutip.eseries import eseries, estidy
+from qutip.superoperator import liouvillian, mat2vec
 from qutip.solver import Result
 from qutip.operators import qzero
 
@@ -103,8 +102,19 @@ def essolve(H, rho0, tlist, c_op_list, e_ops):
     else:
         results = np.zeros([n_expt_op, n_tsteps], dtype=complex)
 
-    for n, e in enumerate(e_ops):
-        results[n, :] = expect(e, esval(es, tlist))
+    if n_expt_op > 0:
+        # evaluate all terms at all times with one product exp(tlist x rates)
+        exp_factors = np.exp(np.outer(tlist, es.rates))
+        ampl = es._ampl_array()
+        if isoper(L):
+            psi_t = exp_factors.dot(ampl)
+            for n, e in enumerate(e_ops):
+                results[n, :] = np.sum(psi_t.conj() * e.data.dot(psi_t.T).T,
+                                       axis=1)
+        else:
+            # Tr(A rho) = sum_ij A_ij rho_ji on row-major amplitudes
+            ops = np.array([e.full().T.ravel() for e in e_ops])
+            results[:, :] = exp_factors.dot(ampl.dot(ops.T)).T
 
     data = Result()
     data.solver = "essolve"
@@ -137,7 +147,17 @@ def ode2es(L, rho0):
         ``eseries`` represention of the system dynamics.
 
     """
+    if not (issuper(L) or isoper(L)):
+        raise TypeError('First argument must be a Hamiltonian or Liouvillian.')
+    return _ode2es(L, rho0, _ode2es_eig(L))
+
 
+def _ode2es(L, rho0, eig):
+    """
+    Private function expanding `rho0` in the eigensystem `eig` of `L`, as
+    returned by :func:`_ode2es_eig`.  Callers evolving several initial
+    states with the same generator compute `eig` once and pass it here.
+    """
     if issuper(L):
 
         # check initial state
@@ -150,23 +170,16 @@ def ode2es(L, rho0):
             # enforce zero operator
             return eseries(qzero(rho0.dims[0]))
 
-        w, v = L.eigenstates()
-        v = np.hstack([ket.full() for ket in v])
+        w, v, lu = eig
         # w[i]   = eigenvalue i
         # v[:,i] = eigenvector i
 
-        rlen = np.prod(rho0.shape)
-        r0 = mat2vec(rho0.full())
-        v0 = la.solve(v, r0)
-        vv = v * sp.spdiags(v0.T, 0, rlen, rlen)
-
-        out = None
-        for i in range(rlen):
-            qo = Qobj(vec2mat(vv[:, i]), dims=rho0.dims, shape=rho0.shape)
-            if out:
-                out += eseries(qo, w[i])
-            else:
-                out = eseries(qo, w[i])
+        v0 = la.lu_solve(lu, mat2vec(rho0.full()).ravel())
+        # amplitude i is vec2mat(v[:, i] * v0[i]), stored row-major
+        n, m = rho0.shape
+        ampl = (v * v0).T.reshape(-1, m, n).transpose(0, 2, 1)
+        out = eseries._from_array(ampl.reshape(len(w), -1), w,
+                                  rho0.dims, rho0.shape)
 
     elif isoper(L):
 
@@ -181,25 +194,27 @@ def ode2es(L, rho0):
             return eseries(Qobj(sp.csr_matrix((dims[0][0], dims[1][0]),
                                               dtype=complex)))
 
-        w, v = L.eigenstates()
-        v = np.hstack([ket.full() for ket in v])
+        w, v, lu = eig
         # w[i]   = eigenvalue i
         # v[:,i] = eigenvector i
 
-        rlen = np.prod(rho0.shape)
-        r0 = rho0.full()
-        v0 = la.solve(v, r0)
-        vv = v * sp.spdiags(v0.T, 0, rlen, rlen)
-
-        out = None
-        for i in range(rlen):
-            qo = Qobj(np.matrix(vv[:, i]).T, dims=rho0.dims, shape=rho0.shape)
-            if out:
-                out += eseries(qo, -1.0j * w[i])
-            else:
-                out = eseries(qo, -1.0j * w[i])
+        v0 = la.lu_solve(lu, rho0.full().ravel())
+        out = eseries._from_array((v * v0).T, -1.0j * w,
+                                  rho0.dims, rho0.shape)
 
     else:
         raise TypeError('First argument must be a Hamiltonian or Liouvillian.')
 
     return estidy(out)
+
+
+def _ode2es_eig(L):
+    """
+    Private function returning the eigenvalues, the eigenvectors and the LU
+    factorization of the eigenvector matrix of L.
+    """
+    if isoper(L) and L.isherm:
+        w, v = la.eigh(L.full())
+    else:
+        w, v = la.eig(L.full())
+    return w, v, la.lu_factor(v)
@@ -37,6 +37,7 @@ import numpy as np
 import scipy.sparse as sp
 
 from qutip.qobj import Qobj, isoper
+from qutip.qobjarray import QobjArray, _stack_states
 from qutip.eseries import eseries
 from qutip.cy.spmatfuncs import (cy_expect_rho_vec, cy_expect_psi, cy_spmm_tr,
                                 expect_csr_ket)
@@ -45,6 +46,10 @@ from qutip.cy.spmatfuncs import (cy_expect_rho_vec, cy_expect_psi, cy_spmm_tr,
 expect_rho_vec = cy_expect_rho_vec
 expect_psi = cy_expect_psi
 
+# Maximum number of elements in a dense block of stacked states used by
+# the batched expectation value functions.
+_BLOCK_ELEMS = 2 ** 22
+
 
 def expect(oper, state):
     '''Calculates the expectation value for operator(s) and state(s).
@@ -54,7 +59,7 @@ def expect(oper, state):
     oper : qobj/array-like
         A single or a `list` or operators for expectation value.
 
-    state : qobj/array-like
+    state : qobj/array-like/QobjArray
         A single or a `list` of quantum states or density matrices.
 
     Returns
@@ -76,6 +81,11 @@ def expect(oper, state):
     elif isinstance(oper, Qobj) and isinstance(state, eseries):
         return _single_eseries_expect(oper, state)
 
+    elif isinstance(state, QobjArray):
+        if isinstance(oper, Qobj):
+            return state.expect(oper)
+        return [state.expect(o) for o in oper]
+
     elif isinstance(oper, (list, np.ndarray)):
         if isinstance(state, Qobj):
             if (all([op.isherm for op in oper]) and
@@ -84,12 +94,28 @@ def expect(oper, state):
             else:
                 return np.array([_single_qobj_expect(o, state) for o in oper],
                                 dtype=complex)
+        stype = None
+        if (isinstance(state, (list, np.ndarray)) and
+                all([isinstance(op, Qobj) for op in oper])):
+            stype = _batch_state_type(state)
+        if stype is not None:
+            expt = _batch_qobj_expect(oper, state)
+            real_state = stype == 'ket' or all([x.isherm for x in state])
+            return [expt[k].real if (op.isherm and real_state) else expt[k]
+                    for k, op in enumerate(oper)]
         else:
             return [expect(o, state) for o in oper]
 
     elif isinstance(state, (list, np.ndarray)):
-        if oper.isherm and all([(op.isherm or op.type == 'ket')
-                                for op in state]):
+        stype = _batch_state_type(state)
+        if stype is not None:
+            expt = _batch_qobj_expect([oper], state)[0]
+            if oper.isherm and (stype == 'ket' or
+                                all([x.isherm for x in state])):
+                return expt.real
+            return expt
+        elif oper.isherm and all([(op.isherm or op.type == 'ket')
+                                  for op in state]):
             return np.array([_single_qobj_expect(oper, x) for x in state])
         else:
             return np.array([_single_qobj_expect(oper, x) for x in state],
@@ -121,6 +147,75 @@ def _single_qobj_expect(oper, state):
         raise TypeError('Invalid operand types')
 
 
+def _batch_state_type(states):
+    """
+    Private function returning the common type ('ket' or 'oper') of a list
+    of states with identical dims, or None if the list cannot be stacked.
+    """
+    if len(states) == 0 or not isinstance(states[0], Qobj):
+        return None
+    stype = states[0].type
+    dims = states[0].dims
+    if stype not in ['ket', 'oper']:
+        return None
+    # equal dims imply equal types
+    for x in states:
+        if not isinstance(x, Qobj) or x.dims != dims:
+            return None
+    return stype
+
+
+def _batch_qobj_expect(opers, states):
+    """
+    Private function used by expect to calculate the expectation values of
+    a list of operators for a list of kets or density matrices with equal
+    dims.  The states are stacked into dense blocks and all values are
+    obtained from a single sparse-dense matrix product per block.  Returns
+    a complex array of shape (len(opers), len(states)).
+    """
+    for op in opers:
+        if not isoper(op):
+            raise TypeError('Invalid operand types')
+        if op.dims[1] != states[0].dims[0]:
+            raise Exception('Operator and state do not have same tensor ' +
+                            'structure: %s and %s' %
+                            (op.dims[1], states[0].dims[0]))
+
+    n_ops = len(opers)
+    n_states = len(states)
+    N = states[0].shape[0]
+    out = np.zeros((n_ops, n_states), dtype=complex)
+
+    if states[0].type == 'ket':
+        # <psi|A|psi> for all A: stack the operators vertically, one SpMM
+        # per block of kets followed by column-wise dot products.
+        A = sp.csr_matrix(sp.vstack([op.data for op in opers], format='csr'))
+        block = max(1, _BLOCK_ELEMS // (N * n_ops))
+        for start in range(0, n_states, block):
+            psi = _stack_states(states[start:start + block])[:, :, 0].T
+            Apsi = A.dot(psi).reshape(n_ops, N, psi.shape[1])
+            out[:, start:start + block] = np.einsum('ij,kij->kj',
+                                                    psi.conj(), Apsi)
+    else:
+        # Tr(A rho) = sum_ij A_ij rho_ji: each operator becomes one row of
+        # a sparse (n_ops, N**2) matrix acting on row-major flattened rho.
+        rows, cols, vals = [], [], []
+        for k, op in enumerate(opers):
+            coo = op.data.tocoo()
+            rows.append(np.full(coo.nnz, k, dtype=np.int64))
+            cols.append(coo.col.astype(np.int64) * N + coo.row)
+            vals.append(coo.data)
+        A = sp.csr_matrix((np.concatenate(vals),
+                           (np.concatenate(rows), np.concatenate(cols))),
+                          shape=(n_ops, N * N))
+        block = max(1, _BLOCK_ELEMS // (N * N))
+        for start in range(0, n_states, block):
+            rho = _stack_states(states[start:start + block])
+            out[:, start:start + block] = A.dot(rho.reshape(-1, N * N).T)
+
+    return out
+
+
 def _single_eseries_expect(oper, state):
     """
     Private function used by expect to calculate expectation values for
@@ -129,26 +224,19 @@ def _single_eseries_expect(oper, state):
 
     out = eseries()
 
-    if isoper(state.ampl[0]):
-        out.rates = state.rates
-        out.ampl = np.array([expect(oper, a) for a in state.ampl])
+    rates = np.asarray(state.rates)
+    ampl = state._ampl_array()
 
-    else:
-        out.rates = np.array([])
-        out.ampl = np.array([])
+    # decided from the shape, so that the Qobj amplitudes are not built
+    if state.shape[1] != 1:
+        # Tr(A rho) = sum_ij A_ij rho_ji for all row-major amplitudes at once
+        out.rates = rates
+        out.ampl = ampl.dot(oper.full().T.ravel())
 
-        for m in range(len(state.rates)):
-            op_m = state.ampl[m].data.conj().T * oper.data
-
-            for n in range(len(state.rates)):
-                a = op_m * state.ampl[n].data
-
-                if isinstance(a, sp.spmatrix):
-                    a = a.todense()
-
-                out.rates = np.append(out.rates, state.rates[n] -
-                                      state.rates[m])
-                out.ampl = np.append(out.ampl, a)
+    else:
+        # <psi_m| A |psi_n> exp((rate_n - rate_m) t) for all pairs m, n
+        out.rates = (rates[np.newaxis, :] - rates[:, np.newaxis]).ravel()
+        out.ampl = ampl.conj().dot(oper.data.dot(ampl.T)).ravel()
 
     return out
 
@@ -171,4 +259,16 @@ def variance(oper, state):
         Variance of operator 'oper' for given state.
 
     """
+    if isinstance(state, QobjArray):
+        return state.expect(oper ** 2) - state.expect(oper) ** 2
+    stype = None
+    if isinstance(state, (list, np.ndarray)):
+        stype = _batch_state_type(state)
+    if stype is not None:
+        expt = _batch_qobj_expect([oper ** 2, oper], state)
+        var = expt[0] - expt[1] ** 2
+        if oper.isherm and (stype == 'ket' or
+                            all([x.isherm for x in state])):
+            return var.real
+        return var
     return expect(oper ** 2, state) - expect(oper, state) ** 2
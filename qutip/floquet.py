@@ -47,16 +47,16 @@ from scipy import angle, pi, exp, sqrt
 from types import FunctionType
 from qutip.qobj import Qobj, isket
 from qutip.superoperator import vec2mat_index, mat2vec, vec2mat
-from qutip.mesolve import mesolve
+from qutip.sesolve import sesolve
 from qutip.steadystate import steadystate
 from qutip.states import ket2dm
 from qutip.states import projection
 from qutip.solver import Options
 from qutip.propagator import propagator
-from qutip.solver import Result, _solver_safety_check
+from qutip.solver import Result, _solver_safety_check, _check_precision
 from qutip.cy.spmatfuncs import cy_ode_rhs
 from qutip.expect import expect
-from qutip.utilities import n_thermal
+from qutip.utilities import _spectrum_on_array
 
 def floquet_modes(H, T, args=None, sort=False, U=None):
     """
@@ -216,20 +216,56 @@ def floquet_modes_table(f_modes_0, f_energies, tlist, H, T, args=None):
     # truncate tlist to the driving period
     tlist_period = tlist[np.where(tlist <= T)]
 
-    f_modes_table_t = [[] for t in tlist_period]
+    U_table = _floquet_unitary_table(H, tlist_period, args)
+
+    return _floquet_modes_table_from_unitaries(f_modes_0, f_energies,
+                                               tlist_period, U_table.data)
+
+
+def _floquet_unitary_table(H, tlist, args=None):
+    """
+    Internal function returning the propagators U(t) for all times in `tlist`
+    as a :class:`qutip.QobjArray` (dense data of shape (len(tlist), N, N)),
+    from a single integration of the full unitary starting from the identity.
+    """
+    if isinstance(H, list):
+        H0 = H[0][0] if isinstance(H[0], list) else H[0]
+    elif callable(H):
+        H0 = H(0.0, args)
+    else:
+        H0 = H
 
     opt = Options()
-    opt.rhs_reuse = True
+    opt.store_states_array = True
+    opt.normalize_output = False
+
+    U0 = Qobj(np.identity(H0.shape[0]), dims=H0.dims)
+    output = sesolve(H, U0, tlist, [], args, opt, _safe_mode=False)
+
+    return output.states
+
 
-    for n, f_mode in enumerate(f_modes_0):
-        output = mesolve(H, f_mode, tlist_period, [], [], args, opt)
-        for t_idx, f_state_t in enumerate(output.states):
-            f_modes_table_t[t_idx].append(
-                f_state_t * exp(1j * f_energies[n] * tlist_period[t_idx]))
+def _floquet_modes_table_from_unitaries(f_modes_0, f_energies, tlist,
+                                        U_table):
+    """
+    Internal function building the nested list of Floquet modes at times
+    `tlist` from the dense propagators `U_table`, shape (len(tlist), N, N),
+    with one matrix product per time.
+    """
+    f_energies = np.asarray(f_energies)
+    F0 = np.hstack([f_mode.full() for f_mode in f_modes_0])
+    dims = f_modes_0[0].dims
+
+    f_modes_table_t = []
+    for t_idx, t in enumerate(tlist):
+        F_t = U_table[t_idx].dot(F0) * np.exp(1j * f_energies * t)
+        f_modes_table_t.append([Qobj(F_t[:, [n]], dims=dims)
+                                for n in range(F_t.shape[1])])
 
     return f_modes_table_t
 
-def floquet_modes_t_lookup(f_modes_table_t, t, T):
+
+def floquet_modes_t_lookup(f_modes_table_t, t, T, interpolate=False):
     """
     Lookup the floquet mode at time t in the pre-calculated table of floquet
     modes in the first period of the time-dependence.
@@ -247,6 +283,11 @@ def floquet_modes_t_lookup(f_modes_table_t, t, T):
     T : float
         The period of the time-dependence of the hamiltonian.
 
+    interpolate : bool
+        If `True`, linearly interpolate between the two neighbouring entries
+        of a table calculated on equally spaced times spanning ``[0, T]``,
+        instead of returning the nearest preceding entry.
+
     Returns
     -------
 
@@ -259,6 +300,14 @@ def floquet_modes_t_lookup(f_modes_table_t, t, T):
     # find t_wrap in [0,T] such that t = t_wrap + n * T for integer n
     t_wrap = t - int(t / T) * T
 
+    if interpolate:
+        x = t_wrap / T * (len(f_modes_table_t) - 1)
+        t_idx = min(int(x), len(f_modes_table_t) - 2)
+        frac = x - t_idx
+        return [((1 - frac) * f_a + frac * f_b).unit()
+                for f_a, f_b in zip(f_modes_table_t[t_idx],
+                                    f_modes_table_t[t_idx + 1])]
+
     # find the index in the table that corresponds to t_wrap (= tlist[t_idx])
     t_idx = int(t_wrap / T * len(f_modes_table_t))
 
@@ -589,16 +638,8 @@ def floquet_master_equation_rates(f_modes_0, f_energies, c_op, H, T,
 
     """
 
-    N = len(f_energies)
-    M = 2 * kmax + 1
-
     omega = (2 * pi) / T
 
-    Delta = np.zeros((N, N, M))
-    X = np.zeros((N, N, M), dtype=complex)
-    Gamma = np.zeros((N, N, M))
-    A = np.zeros((N, N))
-
     nT = 100
     dT = T / nT
     tlist = np.arange(dT, T + dT / 2, dT)
@@ -608,42 +649,50 @@ def floquet_master_equation_rates(f_modes_0, f_energies, c_op, H, T,
                                               np.linspace(0, T, nT + 1), H, T,
                                               args)
 
-    for t in tlist:
-        # TODO: repeated invocations of floquet_modes_t is
-        # inefficient...  make a and b outer loops and use the mesolve
-        # instead of the propagator.
+    # Floquet modes for all times stacked as columns: (nT, N_sys, N)
+    modes = np.array([np.hstack([f_mode.full() for f_mode in
+                                 floquet_modes_t_lookup(f_modes_table_t, t, T)])
+                      for t in tlist])
 
-        # f_modes_t = floquet_modes_t(f_modes_0, f_energies, t, H, T, args)
-        f_modes_t = floquet_modes_t_lookup(f_modes_table_t, t, T)
-        for a in range(N):
-            for b in range(N):
-                k_idx = 0
-                for k in range(-kmax, kmax + 1, 1):
-                    X[a, b, k_idx] += (dT / T) * exp(-1j * k * omega * t) * \
-                        (f_modes_t[a].dag() * c_op * f_modes_t[b])[0, 0]
-                    k_idx += 1
-
-    Heaviside = lambda x: ((np.sign(x) + 1) / 2.0)
-    for a in range(N):
-        for b in range(N):
-            k_idx = 0
-            for k in range(-kmax, kmax + 1, 1):
-                Delta[a, b, k_idx] = f_energies[a] - f_energies[b] + k * omega
-                Gamma[a, b, k_idx] = 2 * pi * Heaviside(Delta[a, b, k_idx]) * \
-                    J_cb(Delta[a, b, k_idx]) * abs(X[a, b, k_idx]) ** 2
-                k_idx += 1
+    # matrix elements <a(t)|c_op|b(t)> for all times with one product
+    c_full = c_op.full()
+    Xt = np.matmul(modes.conj().transpose(0, 2, 1), np.matmul(c_full, modes))
 
-    for a in range(N):
-        for b in range(N):
-            for k in range(-kmax, kmax + 1, 1):
-                k1_idx = k + kmax
-                k2_idx = -k + kmax
-                A[a, b] += Gamma[a, b, k1_idx] + \
-                    n_thermal(abs(Delta[a, b, k1_idx]), w_th) * \
-                    (Gamma[a, b, k1_idx] + Gamma[b, a, k2_idx])
+    # Fourier components along time for all k at once: tlist[j] = (j+1) dT,
+    # so the sample at t = T is rolled to the front.
+    Xw = np.fft.fft(np.roll(Xt, 1, axis=0), axis=0)
+    k = np.arange(-kmax, kmax + 1)
+    X = (dT / T) * Xw[k % len(tlist)].transpose(1, 2, 0)
+
+    Delta = (np.asarray(f_energies)[:, np.newaxis, np.newaxis] -
+             np.asarray(f_energies)[np.newaxis, :, np.newaxis] +
+             k[np.newaxis, np.newaxis, :] * omega)
+    Gamma = 2 * pi * (np.sign(Delta) + 1) / 2.0 * \
+        _spectrum_on_array(J_cb, Delta) * abs(X) ** 2
+
+    # Gamma[b, a, -k] for every (a, b, k)
+    Gamma_T = Gamma.transpose(1, 0, 2)[:, :, ::-1]
+    A = np.sum(Gamma + _n_thermal_array(abs(Delta), w_th) *
+               (Gamma + Gamma_T), axis=2)
 
     return Delta, X, Gamma, A
 
+
+def _n_thermal_array(w, w_th):
+    """
+    Element-wise :func:`qutip.utilities.n_thermal` for an array of
+    frequencies, including its convention of zero occupation at zero
+    temperature or frequency.
+    """
+    n = np.zeros(w.shape)
+    if w_th > 0:
+        with np.errstate(over='ignore'):
+            e = np.exp(w / w_th)
+        mask = e != 1.0
+        n[mask] = 1.0 / (e[mask] - 1.0)
+    return n
+
+
 def floquet_collapse_operators(A):
     """
     Construct collapse operators corresponding to the Floquet-Markov
@@ -758,6 +807,7 @@ def floquet_markov_mesolve(R, ekets, rho0, tlist, e_ops, f_modes_table=None,
         opt = Options()
     else:
         opt = options
+    _check_precision(opt)
 
     if opt.tidy:
         R.tidyup()
@@ -945,11 +995,15 @@ def fmmesolve(H, rho0, tlist, c_ops=[], e_ops=[], spectra_cb=[], T=None,
         # add white noise callbacks if absent
         spectra_cb = [lambda w: 1.0] * len(c_ops)
 
-    f_modes_0, f_energies = floquet_modes(H, T, args)
+    # one evolution of the full unitary over a period gives both the
+    # one-period propagator and the table of Floquet modes
+    tlist_table = np.linspace(0, T, 500 + 1)
+    U_table = _floquet_unitary_table(H, tlist_table, args)
 
-    f_modes_table_t = floquet_modes_table(f_modes_0, f_energies,
-                                          np.linspace(0, T, 500 + 1),
-                                          H, T, args)
+    f_modes_0, f_energies = floquet_modes(H, T, args, U=U_table[-1])
+
+    f_modes_table_t = _floquet_modes_table_from_unitaries(
+        f_modes_0, f_energies, tlist_table, U_table.data)
 
     # get w_th from args if it exists
     if 'w_th' in args:
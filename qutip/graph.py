@@ -37,12 +37,12 @@ to reorder matrices for iterative steady state solvers.
 
 __all__ = ['graph_degree', 'column_permutation', 'breadth_first_search', 
             'reverse_cuthill_mckee', 'maximum_bipartite_matching', 
-            'weighted_bipartite_matching']
+            'weighted_bipartite_matching', 'connected_components']
 
 import numpy as np
 import scipy.sparse as sp
 from qutip.cy.graph_utils import (
-    _breadth_first_search, _node_degrees,
+    _breadth_first_search, _node_degrees, _connected_components,
     _reverse_cuthill_mckee, _maximum_bipartite_matching,
     _weighted_bipartite_matching)
 
@@ -102,6 +102,42 @@ def breadth_first_search(A, start):
     return order[order != -1], levels[levels != -1]
 
 
+def connected_components(A, sym=False):
+    """
+    Labels the connected components of the graph of a sparse matrix in CSR
+    or CSC format.  Rows and columns in different components are never
+    coupled by the matrix, so the components are its invariant subspaces.
+
+    Parameters
+    ----------
+    A : csc_matrix, csr_matrix
+        Input sparse CSR or CSC matrix.
+    sym : bool {False, True}
+        Flag to set whether input matrix has symmetric structure. If not,
+        the components of A + trans(A) are found.
+
+    Returns
+    -------
+    labels : array
+        Component index of every node (row), numbered in order of the lowest
+        node in each component.
+    num_comp : int
+        Number of connected components.
+
+    """
+    if not (sp.isspmatrix_csc(A) or sp.isspmatrix_csr(A)):
+        raise TypeError('Input must be CSC or CSR sparse matrix.')
+    nrows = A.shape[0]
+    if not sym:
+        # absolute values so that no entries cancel in the sum
+        A = abs(A)
+        A = A + A.transpose()
+    A = sp.csr_matrix(A)
+    labels, num_comp = _connected_components(
+        A.indices.astype(np.int32), A.indptr.astype(np.int32), nrows)
+    return labels, num_comp
+
+
 def column_permutation(A):
     """
     Finds the non-symmetric column permutation of A such that the columns 
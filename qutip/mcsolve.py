@@ -43,11 +43,13 @@ from scipy.integrate._ode import zvode
 from scipy.linalg.blas import get_blas_funcs
 from qutip.qobj import Qobj
 from qutip.parallel import parfor, parallel_map, serial_map
-from qutip.cy.spmatfuncs import cy_ode_rhs, cy_expect_psi_csr, spmv, spmv_csr
+from qutip.cy.spmatfuncs import (cy_ode_rhs, cy_ode_rhs_single,
+                                 cy_expect_psi_csr, spmv, spmv_csr)
 from qutip.cy.codegen import Codegen
 from qutip.cy.utilities import _cython_build_cleanup
 from qutip.cy.spconvert import dense2D_to_fastcsr_cmode
-from qutip.solver import Options, Result, config, _solver_safety_check
+from qutip.solver import (Options, Result, config, _solver_safety_check,
+                          _check_precision)
 from qutip.rhs_generate import _td_format_check, _td_wrap_array_str
 from qutip.interpolate import Cubic_Spline
 from qutip.settings import debug
@@ -265,6 +267,7 @@ def mcsolve(H, psi0, tlist, c_ops=[], e_ops=[], ntraj=None,
         c_terms = len(c_stuff[0]) + len(c_stuff[1]) + len(c_stuff[2])
         # set time_type for use in multiprocessing
         config.tflag = time_type
+        _check_precision(options, supported=time_type == 0)
 
         # check for collapse operators
         if c_terms > 0:
@@ -600,6 +603,9 @@ def _evolve_no_collapse_psi_out(config):
         else:
             ODE = ode(_pyRHSc)
         ODE.set_f_params(config)
+    elif opt.precision == 'single':
+        ODE = ode(cy_ode_rhs_single)
+        ODE.set_f_params(config.h_data, config.h_ind, config.h_ptr)
     else:
         ODE = ode(cy_ode_rhs)
         ODE.set_f_params(config.h_data, config.h_ind, config.h_ptr)
@@ -686,6 +692,9 @@ def _evolve_no_collapse_expect_out(config):
         else:
             ODE = ode(_pyRHSc)
         ODE.set_f_params(config)
+    elif opt.precision == 'single':
+        ODE = ode(cy_ode_rhs_single)
+        ODE.set_f_params(config.h_data, config.h_ind, config.h_ptr)
     else:
         ODE = ode(cy_ode_rhs)
         ODE.set_f_params(config.h_data, config.h_ind, config.h_ptr)
@@ -1025,7 +1034,10 @@ def _mc_func_load(config):
                 config.col_expect_code, '<string>', 'exec')
 
     elif config.tflag == 0:
-        _cy_rhs_func = cy_ode_rhs
+        if config.options.precision == 'single':
+            _cy_rhs_func = cy_ode_rhs_single
+        else:
+            _cy_rhs_func = cy_ode_rhs
 
 
 def _mc_data_config(H, psi0, h_stuff, c_ops, c_stuff, args, e_ops,
@@ -1092,6 +1104,8 @@ def _mc_data_config(H, psi0, h_stuff, c_ops, c_stuff, args, e_ops,
         if options.tidy:
             H = H.tidyup(options.atol)
         config.h_data = -1.0j * H.data.data
+        if options.precision == 'single':
+            config.h_data = config.h_data.astype(np.complex64)
         config.h_ind = H.data.indices
         config.h_ptr = H.data.indptr
 
@@ -46,9 +46,11 @@ import scipy.integrate
 import warnings
 import qutip.settings as qset
 from qutip.qobj import Qobj, isket, isoper, issuper
+from qutip.qobjarray import QobjArray
 from qutip.superoperator import spre, spost, liouvillian, mat2vec, vec2mat
 from qutip.expect import expect_rho_vec
-from qutip.solver import Options, Result, config, _solver_safety_check
+from qutip.solver import (Options, Result, config, _solver_safety_check,
+                          _check_precision)
 from qutip.cy.spmatfuncs import cy_ode_rhs, cy_ode_rho_func_td, spmvpy_csr
 from qutip.cy.spconvert import dense2D_to_fastcsr_fmode
 from qutip.cy.codegen import Codegen
@@ -243,6 +245,7 @@ def mesolve(H, rho0, tlist, c_ops=[], e_ops=[], args={}, options=None,
 
     if options is None:
         options = Options()
+    _check_precision(options)
 
     if (not options.rhs_reuse) or (not config.tdfunc):
         # reset config collapse and time-dependence flags to default values
@@ -1028,6 +1031,12 @@ def _generic_ode_solve(r, rho0, tlist, e_ops, opt, progress_bar):
     else:
         raise TypeError("Expectation parameter must be a list or a function")
 
+    store_array = opt.store_states and opt.store_states_array
+    store_list = opt.store_states and not opt.store_states_array
+    if store_array:
+        states_array = np.zeros((n_tsteps,) + tuple(rho0.shape),
+                                dtype=complex)
+
     #
     # start evolution
     #
@@ -1044,10 +1053,13 @@ def _generic_ode_solve(r, rho0, tlist, e_ops, opt, progress_bar):
                             "the allowed number of substeps by increasing "
                             "the nsteps parameter in the Options class.")
 
-        if opt.store_states or expt_callback:
+        if store_array:
+            states_array[t_idx] = vec2mat(r.y)
+
+        if store_list or expt_callback:
             rho.data = dense2D_to_fastcsr_fmode(vec2mat(r.y), rho.shape[0], rho.shape[1])
 
-            if opt.store_states:
+            if store_list:
                 output.states.append(Qobj(rho, isherm=True))
 
             if expt_callback:
@@ -1067,6 +1079,9 @@ def _generic_ode_solve(r, rho0, tlist, e_ops, opt, progress_bar):
 
     progress_bar.finished()
 
+    if store_array:
+        output.states = QobjArray(states_array, dims=rho0.dims)
+
     if (not opt.rhs_reuse) and (config.tdname is not None):
         _cython_build_cleanup(config.tdname)
 
@@ -40,20 +40,25 @@ hierarchy equations of motion (HEOM).
 # Contact: nwlambert@gmail.com
 
 import timeit
+import copy
 import numpy as np
 #from scipy.misc import factorial
 import scipy.sparse as sp
 import scipy.integrate
-from copy import copy
-from qutip import Qobj, qeye
+from scipy.sparse.linalg import splu, spilu, lgmres, LinearOperator
+from qutip import Qobj
+from qutip.expect import expect
 from qutip.states import enr_state_dictionaries
 from qutip.superoperator import liouvillian, spre, spost
 from qutip.cy.spmatfuncs import cy_ode_rhs
-from qutip.solver import Options, Result, Stats
+from qutip.solver import Options, Result, Stats, _check_precision
 from qutip.ui.progressbar import BaseProgressBar, TextProgressBar
-from qutip.cy.heom import cy_pad_csr
-from qutip.cy.spmath import zcsr_kron
-from qutip.fastsparse import fast_csr_matrix, fast_identity
+from qutip.fastsparse import fast_csr_matrix
+from qutip.parallel import parallel_map, serial_map
+import qutip.settings as settings
+
+if settings.has_mkl:
+    from qutip._mkl.spsolve import mkl_splu
 
 
 class HEOMSolver(object):
@@ -268,6 +273,7 @@ class HSolverDL(HEOMSolver):
         self.cut_freq = 1.0
         self.renorm = False
         self.bnd_cut_approx = False
+        self._pattern = None
 
     def configure(self, H_sys, coup_op, coup_strength, temperature,
                      N_cut, N_exp, cut_freq, planck=None, boltzmann=None,
@@ -302,7 +308,7 @@ class HSolverDL(HEOMSolver):
 
         c, nu = self._calc_matsubara_params()
 
-        if renorm:
+        if self.renorm:
             norm_plus, norm_minus = self._calc_renorm_factors()
             if stats:
                 stats.add_message('options', 'renormalisation', ss_conf)
@@ -311,7 +317,6 @@ class HSolverDL(HEOMSolver):
         for i in H_sys.dims[0]:
             N_temp *= i
         sup_dim = N_temp**2
-        unit_sys = qeye(N_temp)
 
 
         # Use shorthands (mainly as in referenced PRL)
@@ -325,86 +330,61 @@ class HSolverDL(HEOMSolver):
         # Ntot is the total number of ancillary elements in the hierarchy
         # Ntot = factorial(N_c + N_m) / (factorial(N_c)*factorial(N_m))
         # Turns out to be the same as nstates from state_number_enumerate
-        N_he, he2idx, idx2he = enr_state_dictionaries([N_c + 1]*N_m , N_c)
-
-        unit_helems = fast_identity(N_he)
+        # The hierarchy structure and the sparsity pattern of the
+        # Liouvillian are kept while the truncation and system operators
+        # are unchanged, so that only the values are refilled
+        pattern = self._pattern
+        if pattern is None or not pattern.matches(H_sys, Q, N_c, N_m,
+                                                   self.bnd_cut_approx):
+            pattern = _HierarchyPattern(H_sys, Q, N_c, N_m,
+                                        self.bnd_cut_approx)
+            self._pattern = pattern
+        he_states = pattern.he_states
+        N_he = pattern.N_he
+
+        approx_factr = None
         if self.bnd_cut_approx:
             # the Tanimura boundary cut off operator
             if stats:
                 stats.add_message('options', 'boundary cutoff approx', ss_conf)
-            op = -2*spre(Q)*spost(Q.dag()) + spre(Q.dag()*Q) + spost(Q.dag()*Q)
-
             approx_factr = ((2*lam0 / (beta*gam*hbar)) - 1j*lam0) / hbar
             for k in range(N_m):
                 approx_factr -= (c[k] / nu[k])
-            L_bnd = -approx_factr*op.data
-            L_helems = zcsr_kron(unit_helems, L_bnd)
-        else:
-            L_helems = fast_csr_matrix(shape=(N_he*sup_dim, N_he*sup_dim))
 
         # Build the hierarchy element interaction matrix
         if stats: start_helem_constr = timeit.default_timer()
 
-        unit_sup = spre(unit_sys).data
-        spreQ = spre(Q).data
-        spostQ = spost(Q).data
-        commQ = (spre(Q) - spost(Q)).data
-        N_he_interact = 0
-
-        for he_idx in range(N_he):
-            he_state = list(idx2he[he_idx])
-            n_excite = sum(he_state)
-
-            # The diagonal elements for the hierarchy operator
-            # coeff for diagonal elements
-            sum_n_m_freq = 0.0
-            for k in range(N_m):
-                sum_n_m_freq += he_state[k]*nu[k]
-
-            op = -sum_n_m_freq*unit_sup
-            L_he = cy_pad_csr(op, N_he, N_he, he_idx, he_idx)
-            L_helems += L_he
-
-            # Add the neighour interations
-            he_state_neigh = copy(he_state)
-            for k in range(N_m):
-
-                n_k = he_state[k]
-                if n_k >= 1:
-                    # find the hierarchy element index of the neighbour before
-                    # this element, for this Matsubara term
-                    he_state_neigh[k] = n_k - 1
-                    he_idx_neigh = he2idx[tuple(he_state_neigh)]
-
-                    op = c[k]*spreQ - np.conj(c[k])*spostQ
-                    if renorm:
-                        op = -1j*norm_minus[n_k, k]*op
-                    else:
-                        op = -1j*n_k*op
-
-                    L_he = cy_pad_csr(op, N_he, N_he, he_idx, he_idx_neigh)
-                    L_helems += L_he
-                    N_he_interact += 1
-
-                    he_state_neigh[k] = n_k
+        # The diagonal elements for the hierarchy operator
+        he_diag = -np.dot(he_states, np.asarray(nu, dtype=complex))
 
-                if n_excite <= N_c - 1:
-                    # find the hierarchy element index of the neighbour after
-                    # this element, for this Matsubara term
-                    he_state_neigh[k] = n_k + 1
-                    he_idx_neigh = he2idx[tuple(he_state_neigh)]
-
-                    op = commQ
-                    if renorm:
-                        op = -1j*norm_plus[n_k, k]*op
-                    else:
-                        op = -1j*op
-
-                    L_he = cy_pad_csr(op, N_he, N_he, he_idx, he_idx_neigh)
-                    L_helems += L_he
-                    N_he_interact += 1
+        # Couplings to the neighbour before each element, for each
+        # Matsubara term, act as c Q rho - conj(c) rho Q
+        rows, srcs, ks = pattern.lower
+        n_k = he_states[rows, ks]
+        c_arr = np.asarray(c, dtype=complex)
+        if self.renorm:
+            coeff = -1j*norm_minus[n_k, ks]
+        else:
+            coeff = -1j*n_k
+        pre_minus = coeff*c_arr[ks]
+        post_minus = -coeff*np.conj(c_arr[ks])
+
+        # Couplings to the neighbour after each element act as the
+        # commutator with Q
+        rows_p, srcs_p, ks_p = pattern.upper
+        if self.renorm:
+            coeff = -1j*norm_plus[he_states[rows_p, ks_p], ks_p]
+        else:
+            coeff = -1j*np.ones(len(rows_p))
 
-                    he_state_neigh[k] = n_k
+        pre_vals = np.concatenate((pre_minus, coeff))
+        post_vals = np.concatenate((post_minus, -coeff))
+        he_pre = sp.csr_matrix((pre_vals, (pattern.he_rows, pattern.he_cols)),
+                               shape=(N_he, N_he))
+        he_post = sp.csr_matrix((post_vals,
+                                 (pattern.he_rows, pattern.he_cols)),
+                                shape=(N_he, N_he))
+        N_he_interact = len(pattern.he_rows)
 
         if stats:
             stats.add_timing('hierarchy contruct',
@@ -416,10 +396,9 @@ class HSolverDL(HEOMSolver):
         # Setup Liouvillian
         if stats: 
             start_louvillian = timeit.default_timer()
-        
-        H_he = zcsr_kron(unit_helems, liouvillian(H_sys).data)
 
-        L_helems += H_he
+        L_helems = pattern.liouvillian(he_diag, pre_minus, post_minus, coeff,
+                                       approx_factr)
 
         if stats:
             stats.add_timing('Liouvillian contruct',
@@ -449,9 +428,17 @@ class HSolverDL(HEOMSolver):
         self._ode = r
         self._N_he = N_he
         self._sup_dim = sup_dim
+        self._L_helems = L_helems
+        # hierarchy structure in block form for the dense engine
+        self._he_diag = he_diag
+        self._he_pre = he_pre
+        self._he_post = he_post
+        self._Q = Q.full()
+        self._H = H_sys.full()
+        self._bnd_factor = approx_factr
         self._configured = True
 
-    def run(self, rho0, tlist):
+    def run(self, rho0, tlist, method='sparse', ado_tol=None):
         """
         Function to solve for an open quantum system using the
         HEOM model.
@@ -464,6 +451,20 @@ class HSolverDL(HEOMSolver):
         tlist : list
             Time over which system evolves.
 
+        method : str {'sparse', 'dense'}
+            'sparse' integrates the full hierarchy Liouvillian as one sparse
+            matrix. 'dense' stores the hierarchy elements as an
+            (N_he, N, N) array and applies the couplings as a few batched
+            products of system-sized matrices, which is faster when the
+            system Hamiltonian and the coupling operator are not sparse.
+
+        ado_tol : float
+            Only used with method='dense'. If set, the hierarchy elements
+            whose norm is below `ado_tol` at a time in `tlist` are dropped
+            from the integration, unless they neighbour an element above
+            the threshold. Dropped elements rejoin when a neighbour grows
+            above the threshold.
+
         Returns
         -------
         results : :class:`qutip.solver.Result`
@@ -478,6 +479,7 @@ class HSolverDL(HEOMSolver):
 
         if not self._configured:
             raise RuntimeError("Solver must be configured before it is run")
+        _check_precision(self.options)
         if stats:
             ss_conf = stats.sections.get('config')
             if ss_conf is None:
@@ -494,10 +496,25 @@ class HSolverDL(HEOMSolver):
 
         if stats: start_init = timeit.default_timer()
         output.states.append(Qobj(rho0))
-        rho0_flat = rho0.full().ravel('F') # Using 'F' effectively transposes
-        rho0_he = np.zeros([sup_dim*self._N_he], dtype=complex)
-        rho0_he[:sup_dim] = rho0_flat
-        r.set_initial_value(rho0_he, tlist[0])
+        if method == 'sparse':
+            # column stacked density matrices
+            rho0_flat = rho0.full().ravel('F')
+            rho0_he = np.zeros([sup_dim*self._N_he], dtype=complex)
+            rho0_he[:sup_dim] = rho0_flat
+            r.set_initial_value(rho0_he, tlist[0])
+        elif method == 'dense':
+            engine = _DenseHierarchy(self, ado_tol)
+            r = scipy.integrate.ode(engine.rhs)
+            options = self.options
+            r.set_integrator('zvode', method=options.method,
+                             order=options.order, atol=options.atol,
+                             rtol=options.rtol, nsteps=options.nsteps,
+                             first_step=options.first_step,
+                             min_step=options.min_step,
+                             max_step=options.max_step)
+            r.set_initial_value(engine.initial_value(rho0.full()), tlist[0])
+        else:
+            raise ValueError("method must be 'sparse' or 'dense'")
 
         if stats:
             stats.add_timing('initialize',
@@ -509,13 +526,31 @@ class HSolverDL(HEOMSolver):
         for t_idx, t in enumerate(tlist):
             if t_idx < n_tsteps - 1:
                 r.integrate(r.t + dt[t_idx])
-                rho = Qobj(r.y[:sup_dim].reshape(rho0.shape), dims=rho0.dims)
+                if not r.successful():
+                    raise Exception("ODE integration error: Try to increase "
+                                    "the allowed number of substeps by "
+                                    "increasing the nsteps parameter in the "
+                                    "Options class.")
+                if method == 'dense':
+                    # the dense engine stores the elements row-major
+                    rho = Qobj(r.y[:sup_dim].reshape(rho0.shape),
+                               dims=rho0.dims)
+                    if ado_tol is not None:
+                        y = engine.filter(r.y)
+                        if y is not None:
+                            r.set_initial_value(y, r.t)
+                else:
+                    rho = Qobj(r.y[:sup_dim].reshape(rho0.shape, order='F'),
+                               dims=rho0.dims)
                 output.states.append(rho)
 
         if stats:
             time_now = timeit.default_timer()
             stats.add_timing('integrate',
                              time_now - start_integ, ss_run)
+            if method == 'dense' and ado_tol is not None:
+                stats.add_count('Num active hierarchy elements',
+                                len(engine.active), ss_run)
             if ss_run.total_time is None:
                 ss_run.total_time = time_now - start_run
             else:
@@ -524,6 +559,189 @@ class HSolverDL(HEOMSolver):
 
         return output
 
+    def steady_state(self, method='direct', use_mkl=True, tol=1e-10,
+                     maxiter=1000, drop_tol=1e-4, fill_factor=100,
+                     return_ados=False):
+        """
+        Solve directly for the steady state of the system and the hierarchy,
+        rather than integrating the equations of motion to long times.
+
+        The hierarchy Liouvillian is singular, so the trace of the system
+        density matrix, weighted by the mean magnitude of the Liouvillian
+        elements, is added to its first row, which fixes the normalisation
+        of the null vector.
+
+        Parameters
+        ----------
+        method : str {'direct', 'iterative'}
+            'direct' uses a sparse LU decomposition of the hierarchy
+            Liouvillian. 'iterative' uses LGMRES with an incomplete LU
+            preconditioner, which needs less memory for large hierarchies.
+
+        use_mkl : bool
+            Use the MKL PARDISO solver for the 'direct' method, when
+            it is available.
+
+        tol : float
+            Relative tolerance of the 'iterative' method.
+
+        maxiter : int
+            Maximum number of iterations of the 'iterative' method.
+
+        drop_tol : float
+            Drop tolerance of the incomplete LU preconditioner.
+
+        fill_factor : float
+            Fill factor of the incomplete LU preconditioner.
+
+        return_ados : bool
+            Also return the steady state of all the hierarchy elements.
+
+        Returns
+        -------
+        rho : Qobj
+            Steady state density matrix of the system.
+
+        ados : ndarray
+            Only if `return_ados` is True. The (N_he, N, N) array of the
+            hierarchy elements in the steady state, the first of which is
+            the system density matrix.
+        """
+        if not self._configured:
+            raise RuntimeError("Solver must be configured before it is run")
+
+        start_ss = timeit.default_timer()
+        stats = self.stats
+        sup_dim = self._sup_dim
+        N = int(np.sqrt(sup_dim))
+        L = sp.csr_matrix(self._L_helems)
+
+        weight = np.mean(np.abs(L.data))
+        trace_row = sp.csr_matrix(
+            (weight*np.ones(N), (np.zeros(N, dtype=int), np.arange(N)*(N+1))),
+            shape=L.shape)
+        L = (L + trace_row).tocsr()
+        L.sort_indices()
+        b = np.zeros(L.shape[0], dtype=complex)
+        b[0] = weight
+
+        if method == 'direct':
+            if use_mkl and settings.has_mkl:
+                L.indices = L.indices.astype(np.int32)
+                L.indptr = L.indptr.astype(np.int32)
+                lu = mkl_splu(L)
+                v = lu.solve(b)
+                lu.delete()
+            else:
+                v = splu(L.tocsc(), permc_spec='COLAMD').solve(b)
+        elif method == 'iterative':
+            try:
+                P = spilu(L.tocsc(), drop_tol=drop_tol,
+                          fill_factor=fill_factor)
+            except RuntimeError:
+                raise Exception("Failed to build preconditioner. Try "
+                                "increasing fill_factor and/or drop_tol.")
+            M = LinearOperator(L.shape, matvec=P.solve, dtype=complex)
+            try:
+                v, check = lgmres(L, b, tol=tol, atol=0, M=M,
+                                  maxiter=maxiter)
+            except TypeError as e:
+                if "unexpected keyword argument 'atol'" in str(e):
+                    v, check = lgmres(L, b, tol=tol, M=M, maxiter=maxiter)
+                else:
+                    raise
+            if check > 0:
+                raise Exception("Steady state solver did not reach "
+                                "tolerance after %d steps." % check)
+        else:
+            raise ValueError("method must be 'direct' or 'iterative'")
+
+        # column stacked hierarchy elements
+        ados = v.reshape((self._N_he, N, N)).transpose(0, 2, 1)
+        ados = ados / np.trace(ados[0])
+        rho = 0.5*(ados[0] + ados[0].conj().T)
+        rho = Qobj(rho, dims=self.H_sys.dims)
+
+        if stats:
+            ss_ss = stats.sections.get('steady state')
+            if ss_ss is None:
+                ss_ss = stats.add_section('steady state')
+            stats.add_timing('solve', timeit.default_timer() - start_ss,
+                             ss_ss)
+
+        if return_ados:
+            return rho, ados
+        return rho
+
+    def sweep(self, rho0, tlist, e_ops, params, method='sparse',
+              parallel=True):
+        """
+        Run the solver for a list of bath parameter sets, and calculate
+        the expectation values of `e_ops` for each of them.
+
+        The runs reconfigure copies of this solver, so the hierarchy
+        structure and the sparsity pattern of the Liouvillian are reused,
+        unless a parameter set changes the truncation or the system
+        operators.
+
+        Parameters
+        ----------
+        rho0 : Qobj
+            Initial state (density matrix) of the system.
+
+        tlist : list
+            Time over which system evolves.
+
+        e_ops : list of Qobj
+            Operators for which to calculate the expectation values.
+
+        params : list of dict
+            Each dict holds the arguments of :meth:`configure` that change
+            from the present configuration for one run, for example
+            ``{'temperature': 2.0, 'coup_strength': 0.05}``.
+
+        method : str {'sparse', 'dense'}
+            Integration method, as for :meth:`run`.
+
+        parallel : bool
+            Distribute the parameter sets over worker processes with
+            :func:`qutip.parallel.parallel_map`.
+
+        Returns
+        -------
+        expect : ndarray
+            Expectation values with shape (len(params), len(e_ops),
+            len(tlist)).
+        """
+        if not self._configured:
+            raise RuntimeError("Solver must be configured before it is run")
+        if isinstance(e_ops, Qobj):
+            e_ops = [e_ops]
+
+        config = dict(H_sys=self.H_sys, coup_op=self.coup_op,
+                      coup_strength=self.coup_strength,
+                      temperature=self.temperature, N_cut=self.N_cut,
+                      N_exp=self.N_exp, cut_freq=self.cut_freq,
+                      planck=self.planck, boltzmann=self.boltzmann,
+                      renorm=self.renorm, bnd_cut_approx=self.bnd_cut_approx)
+        for point in params:
+            for key in point:
+                if key not in config:
+                    raise ValueError("Cannot sweep over '%s'" % key)
+
+        # only the hierarchy structure needs passing to the workers
+        solver = copy.copy(self)
+        solver._ode = None
+        solver._L_helems = None
+        solver._configured = False
+        solver.stats = None
+
+        map_func = parallel_map if parallel else serial_map
+        results = map_func(_sweep_point, params,
+                           task_args=(solver, config, rho0, tlist, e_ops,
+                                      method))
+        return np.array(results)
+
     def _calc_matsubara_params(self):
         """
         Calculate the Matsubara coefficents and frequencies
@@ -578,6 +796,274 @@ class HSolverDL(HEOMSolver):
         return norm_plus, norm_minus
 
 
+def _sweep_point(point, solver, config, rho0, tlist, e_ops, method):
+    """
+    Configure a copy of `solver` with `point` updating `config`, run it and
+    return the expectation values of `e_ops`.
+    """
+    solver = copy.copy(solver)
+    args = dict(config)
+    args.update(point)
+    solver.configure(stats=False, **args)
+    result = solver.run(rho0, tlist, method=method)
+    return np.array([expect(op, result.states) for op in e_ops])
+
+
+class _DenseHierarchy(object):
+    """
+    Right hand side of the hierarchy equations with the hierarchy elements
+    stored as an (N_he, N, N) array, for the 'dense' method of
+    :meth:`HSolverDL.run`.
+
+    The system part and the boundary cut off act on every element as
+    K_l rho + rho K_r + 2 a Q rho Q^dag, and the couplings between the
+    elements as sparse (N_he, N_he) matrices applied to the stacked products
+    Q rho and rho Q. If `ado_tol` is set, only the elements in `active` are
+    integrated.
+    """
+    def __init__(self, solver, ado_tol=None):
+        H = solver._H
+        Q = solver._Q
+        a = solver._bnd_factor
+        self.N = H.shape[0]
+        self.Q = Q
+        self.K_left = -1j*H
+        self.K_right = 1j*H
+        self.QdQ_factor = None
+        if a is not None:
+            QdQ = np.dot(Q.conj().T, Q)
+            self.K_left = self.K_left - a*QdQ
+            self.K_right = self.K_right - a*QdQ
+            self.QdQ_factor = 2*a
+            self.Qd = Q.conj().T
+        self.he_diag = solver._he_diag
+        self.he_pre = solver._he_pre.tocsr()
+        self.he_post = solver._he_post.tocsr()
+        self.ado_tol = ado_tol
+        if ado_tol is not None:
+            # elements fed by each element, by row
+            self.receivers = (abs(self.he_pre) + abs(self.he_post)).T.tocsr()
+        self.set_active(np.arange(len(self.he_diag)))
+
+    def _neighbourhood(self, keep):
+        """
+        The elements in `keep`, the top element, and all their neighbours.
+        """
+        near = self.receivers[keep].indices
+        return np.union1d(np.union1d(keep, near), [0])
+
+    def set_active(self, active):
+        """
+        Restrict the integration to the hierarchy elements in `active`.
+        """
+        self.active = active
+        self.diag = self.he_diag[active]
+        if len(active) == len(self.he_diag):
+            self.pre = self.he_pre
+            self.post = self.he_post
+        else:
+            self.pre = self.he_pre[active][:, active]
+            self.post = self.he_post[active][:, active]
+
+    def initial_value(self, rho0):
+        """
+        Flattened hierarchy with the system state in the top element.
+        """
+        y = np.zeros((len(self.active), self.N, self.N), dtype=complex)
+        y[0] = rho0
+        return y.ravel()
+
+    def rhs(self, t, y):
+        n = len(self.active)
+        R = y.reshape(n, self.N, self.N)
+        QR = _left_product(self.Q, R)
+        RQ = _right_product(R, self.Q)
+        out = _left_product(self.K_left, R) + _right_product(R, self.K_right)
+        out += self.diag[:, None, None]*R
+        if self.QdQ_factor is not None:
+            out += self.QdQ_factor*_right_product(QR, self.Qd)
+        out += (self.pre.dot(QR.reshape(n, -1)) +
+                self.post.dot(RQ.reshape(n, -1))).reshape(R.shape)
+        return out.ravel()
+
+    def filter(self, y):
+        """
+        Update the active elements from the hierarchy `y`. Returns the new
+        flattened hierarchy, or None if the active elements did not change.
+        """
+        n = len(self.active)
+        R = y.reshape(n, self.N, self.N)
+        norms = np.sqrt(np.sum(abs(R)**2, axis=(1, 2)))
+        active = self._neighbourhood(self.active[norms >= self.ado_tol])
+        if np.array_equal(active, self.active):
+            return None
+        R_new = np.zeros((len(active), self.N, self.N), dtype=complex)
+        # dropped elements are set to zero
+        kept = np.isin(self.active, active)
+        R_new[np.searchsorted(active, self.active[kept])] = R[kept]
+        self.set_active(active)
+        return R_new.ravel()
+
+
+def _left_product(A, R):
+    """
+    The products A R[i] for a stack R of matrices, as one matrix product.
+    """
+    return np.tensordot(A, R, axes=([1], [1])).transpose(1, 0, 2)
+
+
+def _right_product(R, A):
+    """
+    The products R[i] A for a stack R of matrices, as one matrix product.
+    """
+    return np.dot(R.reshape(-1, R.shape[2]), A).reshape(R.shape)
+
+
+def _hierarchy_couplings(N_c, N_m):
+    """
+    Enumerate the hierarchy elements and their neighbours.
+
+    Returns the (N_he, N_m) array of hierarchy element states, in the order
+    of :func:`qutip.states.enr_state_dictionaries`, and two tuples
+    (rows, srcs, ks) of index arrays. In the first, element srcs is the
+    neighbour of element rows with one excitation less in Matsubara term ks;
+    in the second, with one excitation more.
+    """
+    N_he, he2idx, idx2he = enr_state_dictionaries([N_c + 1]*N_m, N_c)
+    he_states = np.array([idx2he[idx] for idx in range(N_he)],
+                         dtype=int).reshape(N_he, N_m)
+    # look up neighbours through the state encoded as an integer
+    place = (N_c + 1)**np.arange(N_m)
+    codes = np.dot(he_states, place)
+    order = np.argsort(codes)
+    n_excite = he_states.sum(axis=1)
+
+    lower = ([], [], [])
+    upper = ([], [], [])
+    for k in range(N_m):
+        rows = np.nonzero(he_states[:, k] >= 1)[0]
+        srcs = order[np.searchsorted(codes[order], codes[rows] - place[k])]
+        for out, val in zip(lower, (rows, srcs, np.full(len(rows), k))):
+            out.append(val)
+        rows = np.nonzero(n_excite <= N_c - 1)[0]
+        srcs = order[np.searchsorted(codes[order], codes[rows] + place[k])]
+        for out, val in zip(upper, (rows, srcs, np.full(len(rows), k))):
+            out.append(val)
+    lower = tuple(np.concatenate(x).astype(int) for x in lower)
+    upper = tuple(np.concatenate(x).astype(int) for x in upper)
+    return he_states, lower, upper
+
+
+class _HierarchyPattern(object):
+    """
+    Structure of the hierarchy Liouvillian for a given truncation, system
+    Hamiltonian and coupling operator.
+
+    The Liouvillian is a sum of Kronecker products of hierarchy matrices,
+    whose values depend on the bath parameters, with fixed system
+    superoperators. Its stored values are therefore linear in the hierarchy
+    coefficients, and `assembly` maps the coefficients
+    [he_diag, lower pre, lower post, upper, 1, -bnd_factor] to the values at
+    the fixed positions `rows`, `indices`.
+    """
+    def __init__(self, H_sys, Q, N_c, N_m, bnd_cut_approx):
+        self.N_c = N_c
+        self.N_m = N_m
+        self.bnd_cut_approx = bool(bnd_cut_approx)
+        self.dims = H_sys.dims
+        self.H = H_sys.full()
+        self.Q = Q.full()
+
+        he_states, lower, upper = _hierarchy_couplings(N_c, N_m)
+        self.he_states = he_states
+        self.lower = lower
+        self.upper = upper
+        N_he = he_states.shape[0]
+        self.N_he = N_he
+        self.he_rows = np.concatenate((lower[0], upper[0]))
+        self.he_cols = np.concatenate((lower[1], upper[1]))
+        n_low = len(lower[0])
+        n_up = len(upper[0])
+        self.num_params = N_he + 2*n_low + n_up + 2
+
+        sup_dim = self.H.shape[0]**2
+        n = N_he*sup_dim
+        elems = np.arange(N_he)
+        # hierarchy rows, columns and coefficient index of each term, with
+        # the system superoperator it multiplies. The top element has no
+        # diagonal term, and the couplings to the elements after each
+        # element are commutators.
+        spre_Q = spre(Q)
+        spost_Q = spost(Q)
+        terms = [(elems[1:], elems[1:], elems[1:], sp.identity(sup_dim)),
+                 (lower[0], lower[1], N_he + np.arange(n_low), spre_Q.data),
+                 (lower[0], lower[1], N_he + n_low + np.arange(n_low),
+                  spost_Q.data),
+                 (upper[0], upper[1], N_he + 2*n_low + np.arange(n_up),
+                  (spre_Q - spost_Q).data),
+                 (elems, elems, np.full(N_he, self.num_params - 2),
+                  liouvillian(H_sys).data)]
+        if self.bnd_cut_approx:
+            # the Tanimura boundary cut off operator
+            op = (-2*spre_Q*spost(Q.dag()) + spre(Q.dag()*Q)
+                  + spost(Q.dag()*Q))
+            terms.append((elems, elems, np.full(N_he, self.num_params - 1),
+                          op.data))
+
+        positions = []
+        params = []
+        values = []
+        for he_r, he_c, par, B in terms:
+            B = B.tocoo()
+            B.eliminate_zeros()
+            he_r = he_r.astype(np.int64)[:, None]*sup_dim
+            he_c = he_c.astype(np.int64)[:, None]*sup_dim
+            positions.append(((he_r + B.row)*n + he_c + B.col).ravel())
+            params.append(np.repeat(par, B.nnz))
+            values.append(np.tile(B.data, len(par)))
+        positions, pos_idx = np.unique(np.concatenate(positions),
+                                       return_inverse=True)
+
+        self.shape = (n, n)
+        self.rows = positions // n
+        self.indices = (positions % n).astype(np.int32)
+        self.assembly = sp.csr_matrix(
+            (np.concatenate(values).astype(complex),
+             (pos_idx, np.concatenate(params))),
+            shape=(len(positions), self.num_params))
+
+    def matches(self, H_sys, Q, N_c, N_m, bnd_cut_approx):
+        """
+        Whether the pattern applies to the given truncation and operators.
+        """
+        return (N_c == self.N_c and N_m == self.N_m
+                and bool(bnd_cut_approx) == self.bnd_cut_approx
+                and H_sys.dims == self.dims
+                and np.array_equal(H_sys.full(), self.H)
+                and np.array_equal(Q.full(), self.Q))
+
+    def liouvillian(self, he_diag, lower_pre, lower_post, upper,
+                    bnd_factor=None):
+        """
+        Fill the hierarchy Liouvillian for the given hierarchy coefficients,
+        in the order of `lower` and `upper` for the couplings.
+        """
+        coeffs = np.zeros(self.num_params, dtype=complex)
+        coeffs[:self.N_he] = he_diag
+        coeffs[self.N_he:-2] = np.concatenate((lower_pre, lower_post, upper))
+        coeffs[-2] = 1
+        if bnd_factor is not None:
+            coeffs[-1] = -bnd_factor
+        data = self.assembly.dot(coeffs)
+        # drop the values that cancel for these coefficients
+        keep = data != 0
+        indptr = np.zeros(self.shape[0] + 1, dtype=np.int32)
+        indptr[1:] = np.cumsum(np.bincount(self.rows[keep],
+                                           minlength=self.shape[0]))
+        return fast_csr_matrix((data[keep], self.indices[keep], indptr),
+                               shape=self.shape)
+
+
 def _pad_csr(A, row_scale, col_scale, insertrow=0, insertcol=0):
     """
     Expand the input csr_matrix to a greater space as given by the scale.
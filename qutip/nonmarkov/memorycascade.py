@@ -47,8 +47,15 @@ method in qutip.
 
 import numpy as np
 import warnings
+import hashlib
+from collections import OrderedDict
+from copy import copy
 
 import qutip as qt
+from qutip.parallel import parallel_map
+
+# maximum number of entries kept in each of the memoisation caches
+_CACHE_SIZE = 128
 
 
 class MemoryCascade:
@@ -82,8 +89,9 @@ class MemoryCascade:
         faster for long times (i.e., large Hilbert space).
 
     parallel : bool
-        Run integrator in parallel if True. Only implemented for 'propagator'
-        as the integrator method.
+        Run integrator in parallel if True. Independent time intervals are
+        integrated in a worker pool. For a single interval, parallelization
+        is only implemented for 'propagator' as the integrator method.
 
     options : :class:`qutip.solver.Options`
         Generic solver options.
@@ -98,7 +106,6 @@ class MemoryCascade:
             self.options = options
 
         self.H_S = H_S
-        self.sysdims = H_S.dims
         if isinstance(L1, qt.Qobj):
             self.L1 = [L1]
         else:
@@ -118,13 +125,36 @@ class MemoryCascade:
             self.S_matrix = np.identity(len(self.L1))
         else:
             self.S_matrix = S_matrix
-        # create system identity superoperator
-        self.Id = qt.qeye(H_S.shape[0])
-        self.Id.dims = self.sysdims
-        self.Id = qt.sprepost(self.Id, self.Id)
         self.store_states = self.options.store_states
         self.integrator = integrator
         self.parallel = parallel
+        # memoised generators, interval propagators and reduced propagators,
+        # valid for the system data with fingerprint self._cache_key
+        self._generators = OrderedDict()
+        self._segments = OrderedDict()
+        self._reduced = OrderedDict()
+        self._cache_key = None
+        # sets the system dims and identity superoperator
+        self._check_cache()
+
+    def _check_cache(self):
+        """
+        Clear the memoised propagators if the system operators, the
+        integrator or the options have changed since they were computed.
+        """
+        key = _fingerprint([self.H_S, self.L1, self.L2, self.S_matrix,
+                            self.c_ops_markov, self.integrator,
+                            sorted(vars(self.options).items())])
+        if key != self._cache_key:
+            self._generators.clear()
+            self._segments.clear()
+            self._reduced.clear()
+            # system identity superoperator
+            self.sysdims = self.H_S.dims
+            Id = qt.qeye(self.H_S.shape[0])
+            Id.dims = self.sysdims
+            self.Id = qt.sprepost(Id, Id)
+            self._cache_key = key
 
     def propagator(self, t, tau, notrace=False):
         """
@@ -148,23 +178,93 @@ class MemoryCascade:
         : :class:`qutip.Qobj`
             time-propagator for reduced system dynamics
         """
+        self._check_cache()
         k = int(t/tau)+1
         s = t-(k-1)*tau
-        G1, E0 = _generator(k, self.H_S, self.L1, self.L2, self.S_matrix,
-                            self.c_ops_markov)
-        E = _integrate(G1, E0, 0., s, integrator=self.integrator,
-                       parallel=self.parallel, opt=self.options)
+        key = (k, _dtkey(s), _dtkey(tau), notrace)
+        if key in self._reduced:
+            return self._reduced[key]
+        E0 = self._generator(k)[1]
+        segments = [(k, False, s)]
         if k > 1:
-            G2, null = _generator(k-1, self.H_S, self.L1, self.L2,
-                                  self.S_matrix, self.c_ops_markov)
-            G2 = qt.composite(G2, self.Id)
-            E = _integrate(G2, E, s, tau, integrator=self.integrator, 
-                    parallel=self.parallel, opt=self.options)
+            segments.append((k-1, True, tau-s))
+        P = self._segment_propagators(segments)
+        E = P[0]
+        if k > 1:
+            E = P[1]*E
         E.dims = E0.dims
         if not notrace:
             E = _genptrace(E, k)
+        _cache_store(self._reduced, key, E)
         return E
 
+    def _generator(self, k, composite=False):
+        """
+        Memoised generator for a cascade of k systems, and the corresponding
+        identity superoperator. If composite is True, the generator is
+        extended by the identity on one more system.
+        """
+        key = (k, composite)
+        if key not in self._generators:
+            if composite:
+                G, E0 = self._generator(k)
+                G = qt.composite(G, self.Id)
+                E0 = qt.composite(E0, self.Id)
+                E0.dims = G.dims
+            else:
+                G, E0 = _generator(k, self.H_S, self.L1, self.L2,
+                                   self.S_matrix, self.c_ops_markov)
+            _cache_store(self._generators, key, (G, E0))
+        return self._generators[key]
+
+    def _segment_propagators(self, segments):
+        """
+        Propagators over the intervals in `segments`, a list of tuples
+        (k, composite, dt). Propagators are memoised by (k, composite, dt).
+        An interval that is an integer multiple of a memoised interval with
+        the same generator is obtained by exponentiation by squaring, and
+        the remaining intervals are integrated, in a worker pool if
+        `parallel` is set.
+        """
+        found = {}
+        todo = []
+        for k, composite, dt in segments:
+            key = (k, composite, _dtkey(dt))
+            if key in found or key in [x[0] for x in todo]:
+                continue
+            if key in self._segments:
+                found[key] = self._segments[key]
+                continue
+            G, E0 = self._generator(k, composite)
+            if dt <= 0:
+                found[key] = E0
+                continue
+            base = _integer_multiple(dt, [(x[2], P) for x, P in
+                                          self._segments.items()
+                                          if x[:2] == key[:2] and x[2] > 0])
+            if base is not None:
+                P, n = base
+                found[key] = _power(P, n)
+            else:
+                todo.append((key, G, E0, dt))
+
+        if len(todo) > 1 and self.parallel:
+            props = parallel_map(_segment_propagator,
+                                 [(G, E0, dt) for key, G, E0, dt in todo],
+                                 task_args=(self.integrator, False,
+                                            self.options))
+        else:
+            props = [_segment_propagator((G, E0, dt), self.integrator,
+                                         self.parallel, self.options)
+                     for key, G, E0, dt in todo]
+        for (key, G, E0, dt), P in zip(todo, props):
+            found[key] = P
+        for key, P in found.items():
+            _cache_store(self._segments, key, P)
+
+        return [found[(k, composite, _dtkey(dt))]
+                for k, composite, dt in segments]
+
     def outfieldpropagator(self, blist, tlist, tau, c1=None, c2=None,
                            notrace=False):
         """
@@ -233,13 +333,14 @@ class MemoryCascade:
         klist = [k for (s, k, b) in zipped]
         blist = [b for (s, k, b) in zipped]
 
-        G1, E0 = _generator(kmax, self.H_S, self.L1, self.L2, self.S_matrix,
-                            self.c_ops_markov)
-        sprev = 0.
+        self._check_cache()
+        E0 = self._generator(kmax)[1]
+        # the intervals between the sorted times are independent
+        steps = np.diff([0.] + slist + [tau])
+        P = self._segment_propagators([(kmax, False, dt) for dt in steps])
         E = E0
         for i, s in enumerate(slist):
-            E = _integrate(G1, E, sprev, s, integrator=self.integrator,
-                    parallel=self.parallel, opt=self.options)
+            E = P[i]*E
             if klist[i] == 1:
                 l1 = 0.*qt.Qobj()
             else:
@@ -260,9 +361,7 @@ class MemoryCascade:
                                  'and 4.')
             superop.dims = E.dims
             E = superop*E
-            sprev = s
-        E = _integrate(G1, E, slist[-1], tau, integrator=self.integrator,
-                parallel=self.parallel, opt=self.options)
+        E = P[-1]*E
 
         E.dims = E0.dims
         if not notrace:
@@ -414,6 +513,89 @@ def _generator(k, H, L1, L2, S=None, c_ops_markov=None):
     return L, E0
 
 
+def _fingerprint(obj):
+    """
+    Digest of the data of a (nested list of) Qobj, arrays and plain values,
+    used to detect changes to the inputs of the memoised propagators.
+    """
+    digest = hashlib.sha1()
+
+    def update(x):
+        if isinstance(x, qt.Qobj):
+            digest.update(repr(x.dims).encode())
+            M = x.data
+            for arr in [M.data, M.indices, M.indptr]:
+                digest.update(np.ascontiguousarray(arr).tobytes())
+        elif isinstance(x, np.ndarray) and x.dtype != object:
+            digest.update(repr(x.shape).encode())
+            digest.update(np.ascontiguousarray(x).tobytes())
+        elif isinstance(x, (list, tuple, np.ndarray)):
+            digest.update(b'[')
+            for y in x:
+                update(y)
+            digest.update(b']')
+        else:
+            digest.update(repr(x).encode())
+
+    update(obj)
+    return digest.hexdigest()
+
+
+def _cache_store(cache, key, value):
+    """
+    Store `value` in the OrderedDict `cache`, dropping the oldest entries
+    beyond _CACHE_SIZE.
+    """
+    cache[key] = value
+    while len(cache) > _CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+def _dtkey(dt):
+    """
+    Key for memoising a time interval, insensitive to round-off.
+    """
+    return round(float(dt), 12)
+
+
+def _integer_multiple(dt, bases):
+    """
+    Find the longest interval in `bases`, a list of (dt, propagator), of
+    which `dt` is an integer multiple n > 1. Returns (propagator, n) or None.
+    """
+    best = None
+    for b, P in bases:
+        n = int(round(dt / b))
+        if n > 1 and abs(n * b - dt) <= 1e-10 * dt:
+            if best is None or best[1] > n:
+                best = (P, n)
+    return best
+
+
+def _power(E, n):
+    """
+    Compute E**n for a superoperator E by exponentiation by squaring.
+    """
+    out = None
+    while n > 0:
+        if n & 1:
+            out = E if out is None else out*E
+        n >>= 1
+        if n:
+            E = E*E
+    return out
+
+
+def _segment_propagator(segment, integrator='propagator', parallel=False,
+                        opt=qt.Options()):
+    """
+    Propagator over one interval of length dt for the segment (L, E0, dt).
+    """
+    L, E0, dt = segment
+    return _integrate(L, E0, 0., dt, integrator=integrator,
+                      parallel=parallel, opt=opt)
+
+
 def _integrate(L, E0, ti, tf, integrator='propagator', parallel=False,
         opt=qt.Options()):
     """
@@ -423,6 +605,7 @@ def _integrate(L, E0, ti, tf, integrator='propagator', parallel=False,
         if integrator == 'mesolve':
             if parallel:
                 warnings.warn('parallelization not implemented for "mesolve"')
+            opt = copy(opt)
             opt.store_final_state = True
             sol = qt.mesolve(L, E0, [ti, tf], [], [], options=opt)
             return sol.final_state
@@ -46,10 +46,9 @@ method (TTM), introduced in [1].
 import numpy as np
 
 
-from qutip import (Options, spre, vector_to_operator, operator_to_vector,
+from qutip import (Qobj, Options, vector_to_operator, operator_to_vector,
                    ket2dm, isket)
 from qutip.solver import Result
-from qutip.expect import expect_rho_vec
 
 
 class TTMSolverOptions:
@@ -140,7 +139,7 @@ def ttmsolve(dynmaps, rho0, times, e_ops=[], learningtimes=None, tensors=None,
         rho0 = ket2dm(rho0)
 
     output = Result()
-    e_sops_data = []
+    e_ops_data = []
 
     if callable(e_ops):
         n_expt_op = 0
@@ -159,7 +158,9 @@ def ttmsolve(dynmaps, rho0, times, e_ops=[], learningtimes=None, tensors=None,
                 opt.store_states = True
 
             for op in e_ops:
-                e_sops_data.append(spre(op).data)
+                # Tr(op rho) is the dot product of the row-major flattened
+                # op with the column-stacked rho
+                e_ops_data.append(op.full().ravel())
                 if op.isherm and rho0.isherm:
                     output.expect.append(np.zeros(len(times)))
                 else:
@@ -178,27 +179,30 @@ def ttmsolve(dynmaps, rho0, times, e_ops=[], learningtimes=None, tensors=None,
         # rho0 might be a super in which case we should not vectorize
         rho0vec = rho0
 
-    K = len(tensors)
-    states = [rho0vec]
-    for n in range(1, len(times)):
-        states.append(None)
-        for k in range(n):
-            if n-k < K:
-                states[-1] += tensors[n-k]*states[k]
-    for i, r in enumerate(states):
-        if opt.store_states or expt_callback:
+    states = _propagate(np.array([T.full() for T in tensors]),
+                        rho0vec.full(), len(times))
+
+    if n_expt_op > 0:
+        if rho0vec.type != 'operator-ket':
+            raise TypeError("Expectation values require an initial state " +
+                            "or density matrix.")
+        vecs = states[:, :, 0]
+        for m in range(n_expt_op):
+            expt = vecs.dot(e_ops_data[m])
+            if output.expect[m].dtype == complex:
+                output.expect[m][:] = expt
+            else:
+                output.expect[m][:] = expt.real
+
+    if opt.store_states or expt_callback:
+        states = [Qobj(r, dims=rho0vec.dims, superrep=rho0vec.superrep)
+                  for r in states]
+        for i, r in enumerate(states):
             if r.type == 'operator-ket':
                 states[i] = vector_to_operator(r)
-            else:
-                states[i] = r
             if expt_callback:
                 # use callback method
                 e_ops(times[i], states[i])
-        for m in range(n_expt_op):
-            if output.expect[m].dtype == complex:
-                output.expect[m][i] = expect_rho_vec(e_sops_data[m], r, 0)
-            else:
-                output.expect[m][i] = expect_rho_vec(e_sops_data[m], r, 1)
 
     output.solver = "ttmsolve"
     output.times = times
@@ -264,17 +268,73 @@ def _generatetensors(dynmaps, learningtimes=None, **kwargs):
     else:
         opt = kwargs['opt']
 
-    Tlist = []
+    tensors, diff = _transfer_tensors(dynmapfunc, Kmax, opt.thres)
+    E0 = dynmapfunc(0)
+    Tlist = [Qobj(T, dims=E0.dims, superrep=E0.superrep) for T in tensors]
+    return Tlist, diff
+
+
+def _transfer_tensors(dynmapfunc, Kmax, thres=0.0):
+    """
+    Private function computing the transfer tensors as a dense
+    (K, d, d) array.
+
+    The tensors obey :math:`T_n = E_n - \\sum_{m=1}^{n-1} T_{n-m} E_m`. The
+    tensors found so far are kept side by side in reversed order in one
+    (d, Kmax*d) matrix, so that the sum is a single matrix product with the
+    stacked maps :math:`E_1,\\dots,E_{n-1}`. Every dynamical map is evaluated
+    only once.
+    """
+    E0 = dynmapfunc(0).full()
+    d = E0.shape[0]
+    E = np.zeros((Kmax, d, d), dtype=complex)
+    E[0] = E0
+    # T_j is stored in the column block Kmax - j
+    Tcat = np.zeros((d, Kmax * d), dtype=complex)
     diff = [0.0]
-    for n in range(Kmax):
-        T = dynmapfunc(n)
-        for m in range(1, n):
-            T -= Tlist[n-m]*dynmapfunc(m)
-        Tlist.append(T)
+    K = Kmax
+    for n in range(1, Kmax):
+        E[n] = dynmapfunc(n).full()
+        T = E[n].copy()
+        if n > 1:
+            T -= Tcat[:, (Kmax - n + 1) * d:].dot(
+                E[1:n].reshape((n - 1) * d, d))
+        Tcat[:, (Kmax - n) * d:(Kmax - n + 1) * d] = T
         if n > 1:
-            diff.append((Tlist[-1]-Tlist[-2]).norm())
-            if diff[-1] < opt.thres:
+            diff.append(np.sum(np.linalg.svd(
+                T - Tcat[:, (Kmax - n + 1) * d:(Kmax - n + 2) * d],
+                compute_uv=False)))
+            if diff[-1] < thres:
                 # Below threshold for truncation
-                print('breaking', (Tlist[-1]-Tlist[-2]).norm(), n)
+                K = n + 1
                 break
-    return Tlist, diff
+    tensors = np.zeros((K, d, d), dtype=complex)
+    tensors[0] = E0
+    tensors[1:] = Tcat[:, (Kmax - K + 1) * d:].reshape(d, K - 1, d)[
+        :, ::-1, :].transpose(1, 0, 2)
+    return tensors, diff
+
+
+def _propagate(tensors, rho0vec, nsteps):
+    """
+    Private function propagating a vectorized state, or a superoperator,
+    with dense transfer tensors of shape (K, d, d).
+
+    Returns an array of shape (nsteps, d, m) with
+    :math:`\\rho_n = \\sum_{k=1}^{K-1} T_k \\rho_{n-k}`. The tensors are
+    concatenated in reversed order once, so every step is one matrix
+    product of that block row with the contiguous window of the last K-1
+    states.
+    """
+    K, d = tensors.shape[:2]
+    rho0vec = np.asarray(rho0vec, dtype=complex)
+    states = np.zeros((nsteps, d, rho0vec.shape[1]), dtype=complex)
+    states[0] = rho0vec
+    if K < 2:
+        return states
+    Tcat = np.concatenate(tensors[K - 1:0:-1], axis=1)
+    for n in range(1, nsteps):
+        kmax = min(n, K - 1)
+        states[n] = Tcat[:, (K - 1 - kmax) * d:].dot(
+            states[n - kmax:n].reshape(kmax * d, -1))
+    return states
@@ -43,18 +43,25 @@ processes by exploiting permutational symmetry and using the Dicke basis.
 from math import factorial
 from decimal import Decimal
 
+import warnings
+
 import numpy as np
-from scipy.integrate import odeint
 from scipy import constants
-from scipy.sparse import dok_matrix, block_diag, lil_matrix
+from scipy.linalg import eig
+from scipy.sparse import (dok_matrix, block_diag, csr_matrix, kron, diags,
+                          identity as sp_identity)
+from scipy.sparse.linalg import expm_multiply
 from qutip.solver import Options, Result
 from qutip import (Qobj, spre, spost, tensor, identity, ket2dm,
                    vector_to_operator)
 from qutip import sigmax, sigmay, sigmaz, sigmap, sigmam
+from qutip.graph import connected_components
+from qutip.blockdiag import block_steadystate
+from qutip.parallel import parallel_map, serial_map
 from qutip.cy.piqs import Dicke as _Dicke
-from qutip.cy.piqs import (jmm1_dictionary, _num_dicke_states,
-                           _num_dicke_ladders, get_blocks, j_min,
-                           m_vals, j_vals)
+from qutip.cy.piqs import (_num_dicke_states, _num_dicke_ladders,
+                           get_blocks, j_min, m_vals, j_vals, jmm1_indices,
+                           _lindbladian_coo, _pim_coefficient_coo)
 
 
 # Functions necessary to generate the Lindbladian/Liouvillian
@@ -343,7 +350,7 @@ class Dicke(object):
         pim = Pim(self.N, self.emission, self.dephasing, self.pumping,
                   self.collective_emission, self.collective_pumping,
                   self.collective_dephasing)
-        result = pim.solve(initial_state, tlist, options=None)
+        result = pim.solve(initial_state, tlist, options=options)
         return result
 
     def prune_eigenstates(self, liouvillian):
@@ -434,6 +441,288 @@ class Dicke(object):
         return coef_matrix
 
 
+def _dicke_block_sizes(N):
+    """
+    Dimensions 2j + 1 of the blocks of the Dicke basis, from j = N/2 down to
+    the minimum value of j.
+    """
+    return N + 1 - 2 * np.arange(_num_dicke_ladders(N))
+
+
+def _dicke_support(N):
+    """
+    Flattened (row-major) indices nds * i + k of the density matrix elements
+    inside the j-blocks, in ascending order.
+    """
+    nds = _num_dicke_states(N)
+    sizes = _dicke_block_sizes(N)
+    offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    support = []
+    for offset, size in zip(offsets, sizes):
+        idx = offset + np.arange(size)
+        support.append((nds * idx[:, np.newaxis] + idx).ravel())
+    return np.concatenate(support)
+
+
+def _sector_evolve(sector, tlist):
+    """
+    Evolve one sector of the Liouvillian with sparse exponential
+    integration over the times in `tlist`.
+    """
+    L, x0 = sector
+    tlist = np.asarray(tlist, dtype=float)
+    dt = np.diff(tlist)
+    if len(tlist) > 2 and np.allclose(dt, dt[0]):
+        return expm_multiply(L, x0, start=0, stop=tlist[-1] - tlist[0],
+                             num=len(tlist), endpoint=True)
+    out = np.zeros((len(tlist), len(x0)),
+                   dtype=np.result_type(L.dtype, x0.dtype))
+    out[0] = x0
+    for k in range(1, len(tlist)):
+        out[k] = expm_multiply(L * dt[k - 1], out[k - 1])
+    return out
+
+
+def _sector_eig(L):
+    """
+    Eigenvalues and right eigenvectors of one sector of the Liouvillian.
+    """
+    return eig(L.toarray())
+
+
+class DickeBlocks(object):
+    """Block representation of the Liouvillian of a :class:`Dicke` system.
+
+    The density matrix of a permutationally invariant system is block
+    diagonal in j, and the dynamics never leaves these blocks. The
+    Liouvillian is therefore only built on the elements of the j-blocks
+    (of the order of N**3 elements instead of nds**2), where it consists of
+    the Hamiltonian and the collective terms acting inside each block plus
+    the local terms coupling neighbouring blocks. This space is further
+    split into the invariant sectors of the Liouvillian, e.g. into the
+    sectors of fixed m - m1 for a Hamiltonian diagonal in the Dicke basis.
+    Time evolution, steady states and eigenvalues are computed sector by
+    sector, optionally in parallel.
+
+    Example
+    -------
+    >>> from piqs import Dicke, DickeBlocks, jspin, excited
+    >>> N = 20
+    >>> jx, jy, jz = jspin(N)
+    >>> system = Dicke(N, hamiltonian=jz, emission=1., dephasing=0.5)
+    >>> blocks = DickeBlocks(system)
+    >>> result = blocks.evolve(excited(N), np.linspace(0, 2, 20), [jz])
+
+    Parameters
+    ----------
+    system: :class: piqs.Dicke
+        The system, with a Hamiltonian given in the Dicke basis.
+
+    parallel: bool
+        Solve the independent sectors with `qutip.parallel.parallel_map`.
+        default: False
+
+    Attributes
+    ----------
+    N: int
+        The number of two-level systems.
+
+    nds: int
+        The number of Dicke states.
+
+    support: ndarray
+        The flattened indices nds * i + k of the density matrix elements
+        inside the j-blocks.
+
+    liouvillian: :class: scipy.sparse.csr_matrix
+        The Liouvillian acting on the elements in `support`.
+
+    sectors: list
+        Positions in `support` of the elements of each invariant sector.
+    """
+    def __init__(self, system, parallel=False):
+        self.N = system.N
+        self.nds = system.nds
+        self.parallel = parallel
+        self.support = _dicke_support(self.N)
+        self.liouvillian = self._build_liouvillian(system)
+        labels, num_sectors = connected_components(self.liouvillian)
+        order = np.argsort(labels, kind='mergesort')
+        splits = np.flatnonzero(np.diff(labels[order])) + 1
+        self.sectors = np.split(order, splits)
+        self._sector_L = [self.liouvillian[sec][:, sec]
+                          for sec in self.sectors]
+
+    def _build_liouvillian(self, system):
+        """
+        Build the Liouvillian on the elements of the j-blocks.
+        """
+        rows, cols, data = _lindbladian_coo(
+            int(self.N), float(system.emission), float(system.dephasing),
+            float(system.pumping), float(system.collective_emission),
+            float(system.collective_dephasing),
+            float(system.collective_pumping))
+        n = len(self.support)
+        liouv = csr_matrix((data, (np.searchsorted(self.support, rows),
+                                   np.searchsorted(self.support, cols))),
+                           shape=(n, n), dtype=complex)
+
+        if system.hamiltonian is not None:
+            H = system.hamiltonian.data.tocsr()
+            sizes = _dicke_block_sizes(self.N)
+            block_of = np.repeat(np.arange(len(sizes)), sizes)
+            H_coo = H.tocoo()
+            if np.any(block_of[H_coo.row] != block_of[H_coo.col]):
+                raise ValueError("The Hamiltonian must be block diagonal in "
+                                 "the Dicke basis.")
+            # -i [H, rho] on each row-major flattened block
+            offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+            blocks = []
+            for offset, size in zip(offsets, sizes):
+                Hb = H[offset:offset + size, offset:offset + size]
+                Ib = sp_identity(size, format='csr')
+                blocks.append(-1j * (kron(Hb, Ib) - kron(Ib, Hb.T)))
+            liouv = liouv + block_diag(blocks, format='csr')
+        return liouv
+
+    def _map(self, task, values, task_args=()):
+        if self.parallel and len(values) > 1:
+            return parallel_map(task, values, task_args=task_args)
+        return serial_map(task, values, task_args=task_args)
+
+    def _to_support(self, rho):
+        """
+        Elements of the density matrix `rho` inside the j-blocks.
+        """
+        if isinstance(rho, Qobj):
+            rho = rho.data
+        rho = csr_matrix(rho)
+        return np.asarray(rho[self.support // self.nds,
+                              self.support % self.nds]).ravel()
+
+    def _to_operator(self, x):
+        """
+        Density matrix in the Dicke basis from its elements in the j-blocks.
+        """
+        nds = self.nds
+        data = csr_matrix((x, (self.support // nds, self.support % nds)),
+                          shape=(nds, nds))
+        return Qobj(data, dims=[[nds], [nds]])
+
+    def evolve(self, rho0, tlist, e_ops=None, options=None):
+        """Evolve an initial density matrix given in the Dicke basis.
+
+        Only the sectors with a nonzero initial component are evolved, each
+        with sparse exponential integration.
+
+        Parameters
+        ----------
+        rho0: :class: qutip.Qobj
+            The initial density matrix in the Dicke basis.
+
+        tlist: ndarray
+            A 1D numpy array of list of timesteps to integrate.
+
+        e_ops: list of :class: qutip.Qobj
+            Operators in the Dicke basis for which to calculate expectation
+            values.
+
+        options: :class: qutip.solver.Options
+            The options for the solver. If `e_ops` are given, the states are
+            only stored if `options.store_states` is True.
+
+        Returns
+        -------
+        result: :class: qutip.solver.Result
+            The states and/or expectation values at the times in `tlist`.
+        """
+        if options is None:
+            options = Options()
+        if e_ops is None:
+            e_ops = []
+        x0 = self._to_support(rho0)
+        active = [k for k, sec in enumerate(self.sectors)
+                  if np.any(x0[sec] != 0)]
+        results = self._map(_sector_evolve,
+                            [(self._sector_L[k], x0[self.sectors[k]])
+                             for k in active], task_args=(tlist,))
+        x_t = np.zeros((len(tlist), len(self.support)), dtype=complex)
+        for k, res in zip(active, results):
+            x_t[:, self.sectors[k]] = res
+
+        output = Result()
+        output.solver = "piqs_blocks"
+        output.times = tlist
+        # Tr(E rho) = sum_ik E_ki rho_ik
+        for e in e_ops:
+            e_vec = self._to_support(e.data.T)
+            values = x_t.dot(e_vec)
+            output.expect.append(np.real(values) if e.isherm else values)
+        output.num_expect = len(e_ops)
+        if not e_ops or options.store_states:
+            output.states = [self._to_operator(x) for x in x_t]
+        return output
+
+    def steadystate(self):
+        """Calculate the steady state from the sectors carrying trace.
+
+        Returns
+        -------
+        rho_ss: :class: qutip.Qobj
+            The steady state density matrix in the Dicke basis.
+        """
+        nds = self.nds
+        trace_sectors = []
+        for k, sec in enumerate(self.sectors):
+            elements = self.support[sec]
+            diag = np.flatnonzero(elements // nds == elements % nds)
+            if len(diag):
+                trace_sectors.append((k, diag))
+        if len(trace_sectors) > 1:
+            warnings.warn("The Liouvillian has %d sectors carrying trace, "
+                          "the steady state is not unique. Returning the "
+                          "equal mixture of the sector steady states." %
+                          len(trace_sectors))
+        results = self._map(block_steadystate,
+                            [(self._sector_L[k], diag)
+                             for k, diag in trace_sectors])
+        x = np.zeros(len(self.support), dtype=complex)
+        for (k, _), xk in zip(trace_sectors, results):
+            x[self.sectors[k]] = xk / len(trace_sectors)
+        rho = self._to_operator(x)
+        rho = 0.5 * (rho + rho.dag())
+        return rho / rho.tr()
+
+    def eigenstates(self):
+        """Diagonalize the Liouvillian sector by sector.
+
+        Unlike the eigenstates of the full Liouvillian, see
+        :meth:`Dicke.prune_eigenstates`, no spurious eigenstates with
+        elements outside of the j-blocks appear.
+
+        Returns
+        -------
+        eigenvalues: ndarray
+            The eigenvalues, in ascending order of their real part.
+
+        eigenstates: ndarray of :class: qutip.Qobj
+            The corresponding eigenvectors as operators in the Dicke basis.
+        """
+        results = self._map(_sector_eig, self._sector_L)
+        n = len(self.support)
+        vals = np.concatenate([res[0] for res in results])
+        vecs = []
+        for sec, (_, V) in zip(self.sectors, results):
+            for col in range(V.shape[1]):
+                x = np.zeros(n, dtype=complex)
+                x[sec] = V[:, col]
+                vecs.append(x)
+        order = np.argsort(np.real(vals), kind='mergesort')
+        states = np.empty(len(order), dtype=object)
+        states[:] = [self._to_operator(vecs[k]) for k in order]
+        return vals[order], states
+
+
 # Utility functions for properties of the Dicke space
 def energy_degeneracy(N, m):
     """Calculate the number of Dicke states with same energy.
@@ -857,7 +1146,7 @@ def dicke_basis(N, jmm1=None):
     :math:`|j, m\\rangle \\langle j, m^{\\prime}|`. We create coefficients for each
     (j, m, m1) value in the dictionary jmm1. The mapping for the (i, k)
     index of the density matrix to the |j, m> values is given by the
-    cythonized function `jmm1_dictionary`. A density matrix is created from
+    cythonized function `jmm1_indices`. A density matrix is created from
     the given dictionary of coefficients for each (j, m, m1).
 
     Parameters
@@ -881,11 +1170,9 @@ def dicke_basis(N, jmm1=None):
         raise AttributeError(msg)
 
     nds = _num_dicke_states(N)
-    rho = np.zeros((nds, nds))
-    jmm1_dict = jmm1_dictionary(N)[1]
-    for key in jmm1:
-        i, k = jmm1_dict[key]
-        rho[i, k] = jmm1[key]
+    j, m, m1 = np.array(list(jmm1.keys()), dtype=float).T
+    i, k = jmm1_indices(N, j, m, m1)
+    rho = csr_matrix((list(jmm1.values()), (i, k)), shape=(nds, nds))
     return Qobj(rho)
 
 def dicke(N, j, m):
@@ -915,12 +1202,8 @@ def dicke(N, j, m):
         The density matrix.
     """
     nds = num_dicke_states(N)
-    rho = np.zeros((nds, nds))
-
-    jmm1_dict = jmm1_dictionary(N)[1]
-
-    i, k = jmm1_dict[(j, m, m)]
-    rho[i, k] = 1.
+    i, k = jmm1_indices(N, j, m, m)
+    rho = csr_matrix(([1.], ([i], [k])), shape=(nds, nds))
     return Qobj(rho)
 
 # Uncoupled states in the full Hilbert space. These are returned with the
@@ -1173,8 +1456,6 @@ def css(N, x=1/np.sqrt(2), y=1/np.sqrt(2),
     rho = dok_matrix((nds, nds))
 
     # loop in the allowed matrix elements
-    jmm1_dict = jmm1_dictionary(N)[1]
-
     j = 0.5*N
     mmax = int(2*j + 1)
     for i in range(0, mmax):
@@ -1183,7 +1464,7 @@ def css(N, x=1/np.sqrt(2), y=1/np.sqrt(2),
             a**(N*0.5 + m) * b**(N*0.5 - m)
         for i1 in range(0, mmax):
             m1 = j - i1
-            row_column = jmm1_dict[(j, m, m1)]
+            row_column = jmm1_indices(N, j, m, m1)
             psi_m1 = np.sqrt(float(energy_degeneracy(N, m1))) * \
                 np.conj(a)**(N*0.5 + m1) * np.conj(b)**(N*0.5 - m1)
             rho[row_column] = psi_m*psi_m1
@@ -1533,45 +1814,53 @@ class Pim(object):
         If the initial density matrix and the Hamiltonian is diagonal, the
         evolution of the system is given by the simple ODE: dp/dt = Mp.
         """
-        N = self.N
-        nds = num_dicke_states(N)
-        rows = self.N + 1
-        cols = 0
-
-        sparse_M = lil_matrix((nds, nds), dtype=float)
-        if (self.N % 2) == 0:
-            cols = int(self.N/2 + 1)
-        else:
-            cols = int(self.N/2 + 1/2)
-        for (dicke_row, dicke_col) in np.ndindex(rows, cols):
-            if self.isdicke(dicke_row, dicke_col):
-                k = int(self.calculate_k(dicke_row, dicke_col))
-                row = {}
-                taus = self.tau_valid(dicke_row, dicke_col)
-                for tau in taus:
-                    j, m = self.calculate_j_m(dicke_row, dicke_col)
-                    current_col = tau_column(tau, k, j)
-                    sparse_M[k, int(current_col)] = taus[tau]
-        return sparse_M.tocsr()
+        nds = num_dicke_states(self.N)
+        rows, cols, data = _pim_coefficient_coo(
+            int(self.N), float(self.emission), float(self.dephasing),
+            float(self.pumping), float(self.collective_emission),
+            float(self.collective_pumping))
+        return csr_matrix((data, (rows, cols)), shape=(nds, nds))
 
     def solve(self, rho0, tlist, options=None):
         """
         Solve the ODE for the evolution of diagonal states and Hamiltonians.
+
+        The rate equation dp/dt = Mp is real, so it is integrated with sparse
+        exponential stepping on the real matrix M. The populations are
+        returned as one array, the states as sparse diagonal matrices.
+
+        Parameters
+        ----------
+        rho0: :class: qutip.Qobj
+            A diagonal initial density matrix in the Dicke basis.
+
+        tlist: ndarray
+            A 1D numpy array of list of timesteps to integrate.
+
+        options: :class: qutip.solver.Options
+            The options for the solver.
+
+        Returns
+        -------
+        result: :class: qutip.solver.Result
+            The `populations` attribute holds the diagonal of the density
+            matrix as an array of shape (len(tlist), nds). The `states`
+            attribute is the list of the corresponding density matrices.
         """
         if options is None:
             options = Options()
         output = Result()
         output.solver = "pisolve"
         output.times = tlist
-        output.states = []
-        output.states.append(Qobj(rho0))
-        rhs_generate = lambda y, tt, M: M.dot(y)
-        rho0_flat = np.diag(np.real(rho0.full()))
-        L = self.coefficient_matrix()
-        rho_t = odeint(rhs_generate, rho0_flat, tlist, args=(L,))
-        for r in rho_t[1:]:
-            diag = np.diag(r)
-            output.states.append(Qobj(diag))
+        p0 = np.real(rho0.diag()) if isinstance(rho0, Qobj) else \
+            np.real(np.diag(rho0))
+        M = self.coefficient_matrix()
+        output.populations = _sector_evolve((M, p0), tlist)
+        dims = rho0.dims if isinstance(rho0, Qobj) else None
+        output.states = [Qobj(diags(p, 0, format='csr'), dims=dims)
+                         for p in output.populations]
+        if options.store_final_state:
+            output.final_state = output.states[-1]
         return output
 
     def tau1(self, j, m):
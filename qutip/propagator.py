@@ -42,7 +42,7 @@ from qutip.qobj import Qobj
 from qutip.tensor import tensor
 from qutip.operators import qeye
 from qutip.rhs_generate import (rhs_generate, rhs_clear, _td_format_check)
-from qutip.superoperator import (vec2mat, mat2vec,
+from qutip.superoperator import (vec2mat, mat2vec, liouvillian,
                                  vector_to_operator, operator_to_vector)
 from qutip.sparse import sp_reshape
 from qutip.cy.sparse_utils import unit_row_norm
@@ -51,13 +51,14 @@ from qutip.sesolve import sesolve
 from qutip.states import basis
 from qutip.solver import Options, _solver_safety_check, config
 from qutip.parallel import parallel_map, _default_kwargs
+from qutip.blockdiag import BlockDecomposition
 from qutip.ui.progressbar import BaseProgressBar, TextProgressBar
 
 
 def propagator(H, t, c_op_list=[], args={}, options=None,
                unitary_mode='batch', parallel=False, 
-               progress_bar=None, _safe_mode=True, 
-               **kwargs):
+               progress_bar=None, _safe_mode=True, use_blocks=False,
+               conserved=None, **kwargs):
     """
     Calculate the propagator U(t) for the density matrix or wave function such
     that :math:`\psi(t) = U(t)\psi(0)` or
@@ -98,6 +99,17 @@ def propagator(H, t, c_op_list=[], args={}, options=None,
         showing the progress of the simulation. By default no progress bar
         is used, and if set to True a TextProgressBar will be used.
 
+    use_blocks : bool {False, True}
+        Constant `H` only. Split the Hamiltonian or Liouvillian into its
+        invariant subspaces, given by `conserved` or by the connectivity of
+        the generator, and exponentiate each block, see
+        :class:`qutip.BlockDecomposition`. With `parallel` the blocks are
+        exponentiated in parallel.
+
+    conserved : qobj
+        BLOCKS ONLY. Operator conserved by the dynamics, diagonal in the
+        basis of the Hamiltonian.
+
     Returns
     -------
      a : qobj
@@ -127,6 +139,19 @@ def propagator(H, t, c_op_list=[], args={}, options=None,
 
     if _safe_mode:
         _solver_safety_check(H, None, c_ops=c_op_list, e_ops=[], args=args)
+
+    if use_blocks:
+        if not isinstance(H, Qobj) or not all(
+                [isinstance(c, Qobj) for c in c_op_list]):
+            raise TypeError('use_blocks requires a constant Hamiltonian '
+                            'or Liouvillian.')
+        A = liouvillian(H, c_op_list) if len(c_op_list) > 0 else H
+        # propagate from tlist[0], as the ODE solvers do
+        U = BlockDecomposition(A, conserved, parallel=parallel).propagator(
+            np.asarray(tlist) - tlist[0])
+        if len(tlist) == 2:
+            return U[-1]
+        return np.array(U, dtype=object)
     
     td_type = _td_format_check(H, c_op_list, solver='me')
         
@@ -206,12 +231,12 @@ def propagator(H, t, c_op_list=[], args={}, options=None,
         u = np.zeros([N, N, len(tlist)], dtype=complex)
 
         if parallel:
-            output = parallel_map(_parallel_mesolve,range(N * N),
+            output = parallel_map(_parallel_mesolve, range(N),
                                   task_args=(
                                       sqrt_N, H, tlist, c_op_list, args,
                                       options),
                                   progress_bar=progress_bar, num_cpus=num_cpus)
-            for n in range(N * N):
+            for n in range(N):
                 for k, t in enumerate(tlist):
                     u[:, n, k] = mat2vec(output[n].states[k].full()).T
         else:
@@ -58,7 +58,7 @@ import scipy.linalg as la
 import qutip.settings as settings
 from qutip import __version__
 from qutip.fastsparse import fast_csr_matrix, fast_identity
-from qutip.cy.ptrace import _ptrace
+from qutip.cy.ptrace import _ptrace, _ptrace_dense
 from qutip.permute import _permute
 from qutip.sparse import (sp_eigs, sp_expm, sp_fro_norm, sp_max_norm,
                           sp_one_norm, sp_L2_norm)
@@ -1261,13 +1261,21 @@ class Qobj(object):
         else:
             raise Exception('inplace kwarg must be bool.')
 
-    def ptrace(self, sel):
+    def ptrace(self, sel, sparse=None):
         """Partial trace of the quantum object.
 
         Parameters
         ----------
         sel : int/list
             An ``int`` or ``list`` of components to keep after partial trace.
+            The kept components are returned in ascending order, whatever
+            the order of ``sel``.
+
+        sparse : bool {None, True, False}
+            Use the sparse permutation-matrix algorithm (True) or the dense
+            tensor-reshape algorithm (False).  The default (None) uses the
+            dense algorithm for kets, which never forms the full density
+            matrix, and for operators with a fill fraction of at least 0.1.
 
         Returns
         -------
@@ -1281,8 +1289,19 @@ class Qobj(object):
         that has been deprecated.
 
         """
+        if sparse is None:
+            if self.isket:
+                sparse = False
+            elif self.isoper:
+                sparse = (self.data.nnz /
+                          (self.shape[0] * self.shape[1])) < 0.1
+            else:
+                sparse = True
         q = Qobj()
-        q.data, q.dims, _ = _ptrace(self, sel)
+        if sparse:
+            q.data, q.dims, _ = _ptrace(self, sel)
+        else:
+            q.data, q.dims, _ = _ptrace_dense(self, sel)
         return q.tidyup() if settings.auto_tidyup else q
 
     def permute(self, order):
@@ -1565,7 +1584,8 @@ class Qobj(object):
 
 
     def eigenstates(self, sparse=False, sort='low',
-                    eigvals=0, tol=0, maxiter=100000):
+                    eigvals=0, tol=0, maxiter=100000, use_blocks=False,
+                    conserved=None):
         """Eigenstates and eigenenergies.
 
         Eigenstates and eigenenergies are defined for operators and
@@ -1589,6 +1609,17 @@ class Qobj(object):
         maxiter : int
             Maximum number of iterations performed by sparse solver (if used).
 
+        use_blocks : bool
+            Hermitian operators only. Split the operator into its invariant
+            subspaces, given by `conserved` or by the connectivity of the
+            operator, and diagonalize each block separately, see
+            :class:`qutip.BlockDecomposition`. `sparse`, `tol` and `maxiter`
+            are not used.
+
+        conserved : qobj
+            BLOCKS ONLY. Operator conserved by this operator, diagonal in
+            the same basis.
+
         Returns
         -------
         eigvals : array
@@ -1604,6 +1635,14 @@ class Qobj(object):
         Use sparse only if memory requirements demand it.
 
         """
+        if use_blocks:
+            from qutip.blockdiag import BlockDecomposition
+            evals, ekets = BlockDecomposition(self, conserved).eigenstates()
+            if sort == 'high':
+                evals, ekets = evals[::-1], ekets[::-1]
+            if eigvals > 0:
+                evals, ekets = evals[:eigvals], ekets[:eigvals]
+            return evals, ekets
         evals, evecs = sp_eigs(self.data, self.isherm, sparse=sparse,
                                sort=sort, eigvals=eigvals, tol=tol,
                                maxiter=maxiter)
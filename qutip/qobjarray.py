@@ -0,0 +1,390 @@
+# This file is part of QuTiP: Quantum Toolbox in Python.
+#
+#    Copyright (c) 2011 and later, Paul D. Nation and Robert J. Johansson.
+#    All rights reserved.
+#
+#    Redistribution and use in source and binary forms, with or without
+#    modification, are permitted provided that the following conditions are
+#    met:
+#
+#    1. Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#
+#    2. Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#
+#    3. Neither the name of the QuTiP: Quantum Toolbox in Python nor the names
+#       of its contributors may be used to endorse or promote products derived
+#       from this software without specific prior written permission.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+#    "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+#    LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+#    PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+#    HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+#    SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+#    LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+#    DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+#    THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+#    (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+#    OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+###############################################################################
+"""
+Container class for batches of quantum objects that share the same dims,
+such as the states returned by the evolution solvers.
+"""
+
+__all__ = ['QobjArray']
+
+import numpy as np
+import scipy.sparse as sp
+
+from qutip.qobj import Qobj
+from qutip.dimensions import type_from_dims
+import qutip.settings as settings
+
+
+def _stack_states(states):
+    """
+    Private function gathering the CSR data of a list of Qobj with equal
+    shape into a dense (n_states, rows, cols) array without converting
+    every object to a dense matrix separately.
+    """
+    nrows, ncols = states[0].shape
+    mats = [x.data for x in states]
+    counts = np.diff(np.array([m.indptr for m in mats]), axis=1).ravel()
+    out = np.zeros((len(mats) * nrows, ncols), dtype=complex)
+    rows = np.repeat(np.arange(len(mats) * nrows), counts)
+    out[rows, np.concatenate([m.indices for m in mats])] = \
+        np.concatenate([m.data for m in mats])
+    return out.reshape(len(mats), nrows, ncols)
+
+
+# Below this fill fraction a list of Qobj is stored as stacked CSR.
+_SPARSE_FILL = 0.1
+
+
+class QobjArray(object):
+    """A batch of quantum objects with identical dims.
+
+    The objects are stored together instead of as a list of individual
+    Qobj, each with its own sparse matrix and dims.  Dense batches are kept
+    in one contiguous complex array of shape ``(n, rows, cols)``, sparse
+    batches in one CSR matrix of shape ``(n * rows, cols)`` with the objects
+    stacked on top of each other.  A list of Qobj whose fill fraction is
+    below 0.1 is stored as stacked CSR unless `sparse` says otherwise, so
+    that large sparse operators are never converted to dense arrays.
+
+    Indexing with an integer returns the corresponding Qobj, indexing with a
+    slice or an index array returns a new QobjArray.  The methods
+    :meth:`expect`, :meth:`dag`, :meth:`tr` and :meth:`ptrace` act on the
+    whole batch at once.
+
+    Parameters
+    ----------
+    inpt : list / array / QobjArray
+        A list of Qobj with identical dims, or a complex array of shape
+        ``(n, rows, cols)``.
+    dims : list
+        Dimensions of the objects.  Required for composite systems when
+        `inpt` is an array.
+    sparse : bool
+        Store the batch as stacked CSR (True) or as a dense array (False).
+        By default a list of Qobj is stored sparse if its fill fraction is
+        below 0.1, an array dense, and a QobjArray keeps its storage.
+
+    Attributes
+    ----------
+    data : array / csr_matrix
+        Complex array of shape ``(n, rows, cols)``, or CSR matrix of shape
+        ``(n * rows, cols)`` if `issparse`.
+    issparse : bool
+        Whether the batch is stored as stacked CSR.
+    dims : list
+        Dimensions shared by all objects in the batch.
+    shape : tuple
+        Shape ``(rows, cols)`` of each object.
+    type : str
+        Type shared by all objects in the batch.
+
+    Examples
+    --------
+    >>> states = QobjArray([basis(3, k) for k in range(3)])
+    >>> states.expect(num(3))
+    array([0., 1., 2.])
+
+    """
+    __array_priority__ = 100
+
+    def __init__(self, inpt, dims=None, sparse=None):
+        if isinstance(inpt, QobjArray):
+            self.dims = inpt.dims if dims is None else dims
+            if sparse is None or bool(sparse) == inpt.issparse:
+                self._set(inpt.data.copy(), len(inpt), self.dims)
+            elif sparse:
+                self._set(sp.csr_matrix(inpt.data.reshape(
+                    len(inpt) * inpt.shape[0], inpt.shape[1])),
+                    len(inpt), self.dims)
+            else:
+                self._set(inpt.full(), len(inpt), self.dims)
+
+        elif (isinstance(inpt, np.ndarray) and inpt.dtype != object):
+            if inpt.ndim != 3:
+                raise ValueError("Array input must have shape " +
+                                 "(n, rows, cols).")
+            if dims is None:
+                dims = [[inpt.shape[1]], [inpt.shape[2]]]
+            n, rows, cols = inpt.shape
+            if sparse:
+                self._set(sp.csr_matrix(inpt.reshape(n * rows, cols),
+                                        dtype=complex), n, dims)
+            else:
+                self._set(np.ascontiguousarray(inpt, dtype=complex), n, dims)
+
+        else:
+            inpt = list(inpt)
+            if len(inpt) == 0:
+                raise ValueError("QobjArray requires at least one Qobj.")
+            if not all([isinstance(q, Qobj) for q in inpt]):
+                raise TypeError("All elements must be quantum objects.")
+            if any([q.dims != inpt[0].dims for q in inpt]):
+                raise TypeError("All quantum objects must have equal dims.")
+            if sparse is None:
+                rows, cols = inpt[0].shape
+                nnz = sum([q.data.nnz for q in inpt])
+                sparse = nnz < _SPARSE_FILL * len(inpt) * rows * cols
+            if sparse:
+                data = sp.vstack([q.data for q in inpt], format='csr')
+            else:
+                data = _stack_states(inpt)
+            self._set(data, len(inpt),
+                      inpt[0].dims if dims is None else dims)
+
+    def _set(self, data, n, dims):
+        self.data = data
+        self.issparse = sp.issparse(data)
+        self.dims = dims
+        self._n = n
+        self.shape = (int(np.prod(dims[0])), int(np.prod(dims[1])))
+        if self.issparse:
+            shape = (n * self.shape[0], self.shape[1])
+        else:
+            shape = (n,) + self.shape
+        if data.shape != shape:
+            raise ValueError("dims do not match the shape of the data.")
+        self.type = type_from_dims(self.dims)
+
+    @classmethod
+    def _from_stacked(cls, data, n, dims):
+        out = cls.__new__(cls)
+        out._set(data.tocsr(), n, dims)
+        return out
+
+    def _stacked_coo(self):
+        """Block index, row, column and value of every stored element."""
+        coo = self.data.tocoo()
+        rows = self.shape[0]
+        return coo.row // rows, coo.row % rows, coo.col, coo.data
+
+    def __len__(self):
+        return self._n
+
+    def __iter__(self):
+        for k in range(len(self)):
+            yield self[k]
+
+    def __getitem__(self, ind):
+        if isinstance(ind, (int, np.integer)):
+            if not self.issparse:
+                return Qobj(self.data[ind], dims=self.dims)
+            k = range(len(self))[ind]
+            rows = self.shape[0]
+            return Qobj(self.data[k * rows:(k + 1) * rows], dims=self.dims)
+        if not self.issparse:
+            return QobjArray(self.data[ind], dims=self.dims)
+        blocks = np.arange(len(self))[ind]
+        rows = self.shape[0]
+        sel = (blocks[:, None] * rows + np.arange(rows)).ravel()
+        return QobjArray._from_stacked(self.data[sel], len(blocks),
+                                       self.dims)
+
+    def __str__(self):
+        return ("QobjArray: n = " + str(len(self)) +
+                ", dims = " + str(self.dims) +
+                ", shape = " + str(self.shape) +
+                ", type = " + self.type)
+
+    def __repr__(self):
+        return self.__str__()
+
+    @property
+    def isket(self):
+        return self.type == 'ket'
+
+    @property
+    def isbra(self):
+        return self.type == 'bra'
+
+    @property
+    def isoper(self):
+        return self.type == 'oper'
+
+    @property
+    def isherm(self):
+        """True if every object in the batch is Hermitian."""
+        if self.shape[0] != self.shape[1]:
+            return False
+        if self.issparse:
+            diff = abs(self.data - self.dag().data)
+            return diff.nnz == 0 or diff.max() <= settings.atol
+        return bool(np.all(np.abs(self.data -
+                                  self.data.conj().transpose(0, 2, 1))
+                           <= settings.atol))
+
+    def full(self):
+        """Dense array of shape ``(n, rows, cols)`` holding the batch."""
+        if self.issparse:
+            return self.data.toarray().reshape((len(self),) + self.shape)
+        return self.data
+
+    def to_list(self):
+        """List of the individual quantum objects."""
+        return [self[k] for k in range(len(self))]
+
+    def dag(self):
+        """Adjoint of every object in the batch.
+
+        Returns
+        -------
+        arr : QobjArray
+            Batch of adjoint quantum objects.
+
+        """
+        if self.issparse:
+            k, i, j, vals = self._stacked_coo()
+            cols = self.shape[1]
+            data = sp.coo_matrix((vals.conj(), (k * cols + j, i)),
+                                 shape=(len(self) * cols, self.shape[0]))
+            return QobjArray._from_stacked(data, len(self),
+                                           [self.dims[1], self.dims[0]])
+        return QobjArray(self.data.conj().transpose(0, 2, 1),
+                         dims=[self.dims[1], self.dims[0]])
+
+    def tr(self):
+        """Trace of every object in the batch.
+
+        Returns
+        -------
+        trace : array
+            ``real`` if all objects are Hermitian, ``complex`` otherwise.
+
+        """
+        if self.issparse:
+            k, i, j, vals = self._stacked_coo()
+            diag = (i == j)
+            out = (np.bincount(k[diag], vals[diag].real, len(self)) +
+                   1j * np.bincount(k[diag], vals[diag].imag, len(self)))
+        else:
+            out = np.trace(self.data, axis1=1, axis2=2)
+        return out.real if self.isherm else out
+
+    def expect(self, oper):
+        """Expectation values of an operator for every state in the batch.
+
+        Parameters
+        ----------
+        oper : qobj
+            Operator for the expectation value.
+
+        Returns
+        -------
+        expt : array
+            ``real`` if `oper` and the states are Hermitian, ``complex``
+            otherwise.
+
+        """
+        if not isinstance(oper, Qobj) or not oper.isoper:
+            raise TypeError('Invalid operand types')
+        if oper.dims[1] != self.dims[0]:
+            raise Exception('Operator and state do not have same tensor ' +
+                            'structure: %s and %s' %
+                            (oper.dims[1], self.dims[0]))
+        N = self.shape[0]
+        A = sp.csr_matrix(oper.data)
+        if self.isket and self.issparse:
+            k, i, j, vals = self._stacked_coo()
+            psi = sp.csr_matrix((vals, (i, k)), shape=(N, len(self)))
+            out = np.asarray(psi.conj().multiply(A.dot(psi))
+                             .sum(axis=0)).ravel()
+            real_state = True
+        elif self.isket:
+            psi = self.data[:, :, 0].T
+            out = np.sum(psi.conj() * A.dot(psi), axis=0)
+            real_state = True
+        elif self.isoper:
+            # Tr(A rho) = sum_ij A_ij rho_ji
+            coo = A.tocoo()
+            Avec = sp.csr_matrix((coo.data,
+                                  (np.zeros(coo.nnz, dtype=int),
+                                   coo.col.astype(np.int64) * N + coo.row)),
+                                 shape=(1, N * N))
+            if self.issparse:
+                k, i, j, vals = self._stacked_coo()
+                rho = sp.csr_matrix((vals, (k, i.astype(np.int64) * N + j)),
+                                    shape=(len(self), N * N))
+                out = rho.dot(Avec.T).toarray().ravel()
+            else:
+                out = Avec.dot(self.data.reshape(len(self), N * N).T)[0]
+            real_state = self.isherm
+        else:
+            raise TypeError('Invalid operand types')
+        return out.real if (oper.isherm and real_state) else out
+
+    def ptrace(self, sel):
+        """Partial trace of every object in the batch.
+
+        Parameters
+        ----------
+        sel : int/list
+            An ``int`` or ``list`` of components to keep after partial trace.
+
+        Returns
+        -------
+        arr : QobjArray
+            Batch of reduced density matrices.  Kets are traced without
+            forming their density matrices.
+
+        """
+        if not (self.isket or self.isoper):
+            raise TypeError("ptrace requires kets or operators.")
+        if isinstance(sel, (int, np.integer)):
+            sel = [sel]
+        sel = sorted(sel)
+        ndims = self.dims[0]
+        nd = len(ndims)
+        if any([k < 0 or k >= nd for k in sel]) or len(set(sel)) != len(sel):
+            raise TypeError("Invalid selection index in ptrace.")
+        if self.issparse:
+            return QobjArray([self[k].ptrace(sel) for k in range(len(self))])
+        rest = [k for k in range(nd) if k not in sel]
+        dims_kept = [ndims[k] for k in sel]
+        M = int(np.prod(dims_kept))
+        R = int(np.prod([ndims[k] for k in rest]))
+        n = len(self)
+
+        if self.isket:
+            vmat = (self.data.reshape([n] + ndims)
+                    .transpose([0] + [k + 1 for k in sel] +
+                               [k + 1 for k in rest])
+                    .reshape(n, M, R))
+            out = np.matmul(vmat, vmat.conj().transpose(0, 2, 1))
+        else:
+            out = np.einsum('nijik->njk',
+                            self.data.reshape([n] + ndims + ndims)
+                            .transpose([0] + [k + 1 for k in rest] +
+                                       [k + 1 for k in sel] +
+                                       [k + nd + 1 for k in rest] +
+                                       [k + nd + 1 for k in sel])
+                            .reshape(n, R, M, R, M))
+        return QobjArray(out, dims=[dims_kept, dims_kept])
@@ -42,11 +42,9 @@ __all__ = ['rcsolve']
 
 import warnings
 import numpy as np
-import scipy.sparse as sp
-from numpy import matrix
-from numpy import linalg
-from qutip import spre, spost, sprepost, thermal_dm, mesolve, Options
-from qutip import tensor, identity, destroy, sigmax, sigmaz, basis, qeye, dims
+import scipy.linalg as la
+from qutip import Qobj, spre, spost, sprepost, liouvillian, thermal_dm
+from qutip import mesolve, Options, tensor, destroy, qeye, dims
 
 
 def rcsolve(Hsys, psi0, tlist, e_ops, Q, wc, alpha, N, w_th, sparse=False,
@@ -88,8 +86,10 @@ def rcsolve(Hsys, psi0, tlist, e_ops, Q, wc, alpha, N, w_th, sparse=False,
     """
     if options is None:
         options = Options()
+    if isinstance(e_ops, Qobj):
+        e_ops = [e_ops]
 
-    dot_energy, dot_state = Hsys.eigenstates(sparse=sparse)
+    dot_energy = Hsys.eigenenergies(sparse=sparse)
     deltaE = dot_energy[1] - dot_energy[0]
     if (w_th < deltaE/2):
         warnings.warn("Given w_th might not provide accurate results")
@@ -98,60 +98,65 @@ def rcsolve(Hsys, psi0, tlist, e_ops, Q, wc, alpha, N, w_th, sparse=False,
     g = np.sqrt(np.pi * wa * alpha / 2.0)  # reaction coordinate coupling
     nb = (1 / (np.exp(wa/w_th) - 1))
 
-    # Reaction coordinate hamiltonian/operators
+    # Reaction coordinate hamiltonian/operators, built from sparse tensors
 
     dimensions = dims(Q)
     a = tensor(destroy(N), qeye(dimensions[1]))
-    unit = tensor(qeye(N), qeye(dimensions[1]))
-    Nmax = N * dimensions[1][0]
     Q_exp = tensor(qeye(N), Q)
     Hsys_exp = tensor(qeye(N), Hsys)
     e_ops_exp = [tensor(qeye(N), kk) for kk in e_ops]
 
-    na = a.dag() * a
     xa = a.dag() + a
 
     # decoupled Hamiltonian
     H0 = wa * a.dag() * a + Hsys_exp
     # interaction
-    H1 = (g * (a.dag() + a) * Q_exp)
+    H1 = (g * xa * Q_exp)
     H = H0 + H1
-    L = 0
-    PsipreEta = 0
-    PsipreX = 0
-
-    all_energy, all_state = H.eigenstates(sparse=sparse)
-    Apre = spre((a + a.dag()))
-    Apost = spost(a + a.dag())
-    for j in range(Nmax):
-        for k in range(Nmax):
-            A = xa.matrix_element(all_state[j].dag(), all_state[k])
-            delE = (all_energy[j] - all_energy[k])
-            if abs(A) > 0.0:
-                if abs(delE) > 0.0:
-                    X = (0.5 * np.pi * gamma*(all_energy[j] - all_energy[k])
-                         * (np.cosh((all_energy[j] - all_energy[k]) /
-                            (2 * w_th))
-                         / (np.sinh((all_energy[j] - all_energy[k]) /
-                            (2 * w_th)))) * A)
-                    eta = (0.5 * np.pi * gamma *
-                           (all_energy[j] - all_energy[k]) * A)
-                    PsipreX = PsipreX + X * all_state[j] * all_state[k].dag()
-                    PsipreEta = PsipreEta + (eta * all_state[j]
-                                             * all_state[k].dag())
-                else:
-                    X = 0.5 * np.pi * gamma * A * 2 * w_th
-                    PsipreX = PsipreX + X * all_state[j] * all_state[k].dag()
-
-    A = a + a.dag()
-    L = ((-spre(A * PsipreX)) + (sprepost(A, PsipreX))
-         + (sprepost(PsipreX, A)) + (-spost(PsipreX * A))
-         + (spre(A * PsipreEta)) + (sprepost(A, PsipreEta))
-         + (-sprepost(PsipreEta, A)) + (-spost(PsipreEta * A)))
-
-    # Setup the operators and the Hamiltonian and the master equation
+
+    # The thermal rates of the reaction coordinate coupling in the
+    # eigenbasis of H, transformed back in one product each
+    all_energy, all_state = _eigensystem(H, sparse)
+    A_eig = np.dot(all_state.conj().T, xa.data.dot(all_state))
+    delE = all_energy[:, None] - all_energy[None, :]
+    nonzero = delE != 0
+    coth = np.ones_like(delE)
+    coth[nonzero] = 1 / np.tanh(delE[nonzero] / (2 * w_th))
+    X_eig = 0.5 * np.pi * gamma * np.where(nonzero, delE * coth, 2 * w_th)
+    eta_eig = 0.5 * np.pi * gamma * delE
+    PsipreX = _from_eigenbasis(X_eig * A_eig, all_state, H.dims)
+    PsipreEta = _from_eigenbasis(eta_eig * A_eig, all_state, H.dims)
+
+    A = xa
+    L = (spre(A * (PsipreEta - PsipreX)) + sprepost(A, PsipreX + PsipreEta)
+         + sprepost(PsipreX - PsipreEta, A)
+         - spost((PsipreX + PsipreEta) * A))
+
+    # Setup the Liouvillian and the master equation
     # and solve for time steps in tlist
     rho0 = (tensor(thermal_dm(N, nb), psi0))
-    output = mesolve(H, rho0, tlist, [L], e_ops_exp, options=options)
+    output = mesolve(liouvillian(H) + L, rho0, tlist, [], e_ops_exp,
+                     options=options)
 
     return output
+
+
+def _eigensystem(H, sparse=False):
+    """
+    Eigenenergies of the Qobj `H` and its eigenvectors as the columns of
+    an array.
+    """
+    if sparse:
+        energies, states = H.eigenstates(sparse=True)
+        return energies, np.column_stack([psi.full().ravel()
+                                          for psi in states])
+    return la.eigh(H.full())
+
+
+def _from_eigenbasis(M, states, dims):
+    """
+    Sparse Qobj of the operator with matrix `M` in the basis `states`,
+    with the elements below the Qobj tidyup tolerance removed.
+    """
+    op = Qobj(np.dot(states, np.dot(M, states.conj().T)), dims=dims)
+    return op.tidyup()
@@ -43,8 +43,12 @@ Pulses from Quantum Optical Systems (2017, arXiv:1710.02875).
 # Contact: benbartlett@stanford.edu
 
 import numpy as np
-from itertools import product, combinations_with_replacement
-from qutip import propagator, Options, basis, tensor, zero_ket, Qobj
+from itertools import product
+from scipy.linalg import expm
+from scipy.sparse import csr_matrix
+from qutip import propagator, Options, basis, tensor, Qobj
+from qutip.parallel import parallel_map
+import qutip.settings as qset
 
 __all__ = ['temporal_basis_vector',
            'temporal_scattered_state',
@@ -76,6 +80,10 @@ class Evolver:
     propagators : (dict of float: (dict of float: :class: qutip.Qobj))
         Dictionary of dictionaries of propagator objects with keys of
         evaluation times, e.g. propagators[t2][t1] returns U[t2,t1].
+    steps : ndarray
+        Dense stack of the propagators U[t_{k+1}, t_k] between consecutive
+        times, of shape (len(tlist) - 1, N, N). Computed on the first call
+        of :meth:`step_propagators`.
     """
     def __init__(self, H, tlist, options=None):
         self.H = H
@@ -88,6 +96,7 @@ class Evolver:
         self.propagators = dict.fromkeys(tlist)
         for t in tlist:
             self.propagators[t] = dict.fromkeys(tlist)
+        self.steps = None
 
     def prop(self, tf, ti):
         """Compute U[t2,t1] where t2 > t1 or return the cached operator.
@@ -113,6 +122,56 @@ class Evolver:
             # Something is still broken about batch unitary mode (see #807)
         return self.propagators[t2][t1]
 
+    def step_propagators(self, parallel=False):
+        """Compute the dense stack of propagators U[t_{k+1}, t_k] between
+        consecutive times, or return the cached stack.
+
+        A constant Hamiltonian is exponentiated directly, once for every
+        distinct time step. A time-dependent Hamiltonian is integrated over
+        every time step, in parallel if requested.
+
+        Parameters
+        ----------
+        parallel : bool
+            Integrate the time steps of a time-dependent Hamiltonian in
+            parallel.
+
+        Returns
+        -------
+        steps : ndarray
+            Array of shape (len(tlist) - 1, N, N) holding U[t_{k+1}, t_k].
+        """
+        if self.steps is not None:
+            return self.steps
+        dts = np.diff(self.tlist)
+        if isinstance(self.H, Qobj):
+            H = self.H.full()
+            cache = {}
+            for dt in dts:
+                if dt not in cache:
+                    cache[dt] = expm(-1j * dt * H)
+            steps = [cache[dt] for dt in dts]
+        else:
+            if parallel and len(dts) > 1:
+                steps = parallel_map(_step_propagator, range(len(dts)),
+                                     task_args=(self.H, self.tlist,
+                                                self.options))
+            else:
+                steps = [_step_propagator(k, self.H, self.tlist, self.options)
+                         for k in range(len(dts))]
+        H0 = self.H if isinstance(self.H, Qobj) else self.H[0]
+        N = H0.shape[0] if isinstance(H0, Qobj) else H0[0].shape[0]
+        self.steps = np.array(steps, dtype=complex).reshape(len(dts), N, N)
+        return self.steps
+
+
+def _step_propagator(k, H, tlist, options):
+    """
+    Private function computing the dense propagator U[t_{k+1}, t_k].
+    """
+    return propagator(H, [tlist[k], tlist[k + 1]], options=options,
+                      unitary_mode='single').full()
+
 
 def set_partition(collection, num_sets):
     """
@@ -228,7 +287,8 @@ def temporal_basis_vector(waveguide_emission_indices, n_time_bins):
 
 def temporal_scattered_state(H, psi0, n_emissions, c_ops, tlist,
                              system_zero_state=None,
-                             construct_effective_hamiltonian=True):
+                             construct_effective_hamiltonian=True,
+                             parallel=False):
     """
     Compute the scattered n-photon state projected onto the temporal basis.
 
@@ -258,58 +318,42 @@ def temporal_scattered_state(H, psi0, n_emissions, c_ops, tlist,
         Whether an effective Hamiltonian should be constructed from H and c_ops:
         :math:`H_{eff} = H - \\frac{i}{2} \\sum_n \\sigma_n^\\dagger \\sigma_n`
         Default: True.
+    parallel : bool
+        Compute the propagators and the scattering amplitudes in parallel.
+        Default: False.
 
     Returns
     -------
     phi_n : :class: qutip.Qobj
         The scattered bath state projected onto the temporal basis given by
         tlist. If there are W waveguides, T times, and N photon emissions, then
-        the state is a tensor product state with dimensionality T^(W*N).
+        the state is a tensor product state with dimensionality T^(W*N). The
+        state is stored sparsely.
     """
     T = len(tlist)
     W = len(c_ops)
-
-    if n_emissions == 0:
-        phi_n = zero_ket(W * T)
-    else:
-        phi_n = tensor([zero_ket(W * T)] * n_emissions)
-
-    if construct_effective_hamiltonian:
-        # Construct an effective Hamiltonian from system hamiltonian and c_ops
-        if type(H) is Qobj:
-            Heff = H - 1j / 2 * sum([op.dag() * op for op in c_ops])
-        elif type(H) is list:
-            Heff = H + [-1j / 2 * sum([op.dag() * op for op in c_ops])]
-        else:
-            raise TypeError("Hamiltonian must be Qobj or list-callback format")
-    else:
-        Heff = H
-
-    evolver = Evolver(Heff, tlist)
-
-    all_emission_indices = combinations_with_replacement(range(T), n_emissions)
-
-    if system_zero_state is None:
-        system_zero_state = psi0
-
-    # Compute <omega_tau> for all combinations of tau
-    for emission_indices in all_emission_indices:
-        # Consider unique partitionings of emission times into waveguides
-        partition = tuple(set(set_partition(emission_indices, W)))
-        # Consider all possible partitionings of time bins by waveguide
-        for indices in partition:
-            taus = [[tlist[i] for i in wg_indices] for wg_indices in indices]
-            omega = photon_scattering_operator(evolver, c_ops, taus)
-            phi_n_amp = system_zero_state.dag() * omega * psi0
-            # Add scatter amplitude times temporal basis to overall state
-            phi_n += phi_n_amp * temporal_basis_vector(indices, T)
-
-    return phi_n
+    codes, amps = _scattering_amplitudes(H, psi0, n_emissions, c_ops, tlist,
+                                         system_zero_state,
+                                         construct_effective_hamiltonian,
+                                         parallel)
+    # The temporal basis vector of a configuration is the tensor product of
+    # the emissions ordered by waveguide, then by time
+    codes = np.sort(codes, axis=1)
+    place = (W * T) ** np.arange(n_emissions - 1, -1, -1, dtype=np.int64)
+    indices = codes.dot(place) if n_emissions > 0 else \
+        np.zeros(len(amps), dtype=np.int64)
+    n_rows = (W * T) ** max(n_emissions, 1)
+    data = csr_matrix((amps, (indices, np.zeros(len(amps), dtype=int))),
+                      shape=(n_rows, 1), dtype=complex)
+    data.eliminate_zeros()
+    n_dims = max(n_emissions, 1)
+    return Qobj(data, dims=[[W * T] * n_dims, [1] * n_dims])
 
 
 def scattering_probability(H, psi0, n_emissions, c_ops, tlist,
                            system_zero_state=None,
-                           construct_effective_hamiltonian=True):
+                           construct_effective_hamiltonian=True,
+                           parallel=False):
     """
     Compute the integrated probability of scattering n photons in an arbitrary
     system. This function accepts a nonlinearly spaced array of times.
@@ -342,6 +386,9 @@ def scattering_probability(H, psi0, n_emissions, c_ops, tlist,
         Whether an effective Hamiltonian should be constructed from H and c_ops:
         :math:`H_{eff} = H - \\frac{i}{2} \\sum_n \\sigma_n^\\dagger \\sigma_n`
         Default: True.
+    parallel : bool
+        Compute the propagators and the scattering amplitudes in parallel.
+        Default: False.
 
     Returns
     -------
@@ -349,27 +396,147 @@ def scattering_probability(H, psi0, n_emissions, c_ops, tlist,
         The probability of scattering n photons from the system over the time
         range specified.
     """
-    phi_n = temporal_scattered_state(H, psi0, n_emissions, c_ops, tlist,
-                                     system_zero_state,
-                                     construct_effective_hamiltonian)
     T = len(tlist)
-    W = len(c_ops)
+    codes, amps = _scattering_amplitudes(H, psi0, n_emissions, c_ops, tlist,
+                                         system_zero_state,
+                                         construct_effective_hamiltonian,
+                                         parallel)
 
-    # Compute <omega_tau> for all combinations of tau
-    all_emission_indices = combinations_with_replacement(range(T), n_emissions)
+    # Accumulate the probabilities of all waveguide partitionings onto the
+    # sorted emission time indices, without building the scattered state
     probs = np.zeros([T] * n_emissions)
-
-    # Project scattered state onto temporal basis
-    for emit_indices in all_emission_indices:
-        # Consider unique emission time partitionings
-        partition = tuple(set(set_partition(emit_indices, W)))
-        # wg_indices_list = list(set_partition(indices, W))
-        for wg_indices in partition:
-            projector = temporal_basis_vector(wg_indices, T)
-            amplitude = (projector.dag() * phi_n).full().item()
-            probs[emit_indices] += np.real(amplitude.conjugate() * amplitude)
+    times = np.sort(codes % T, axis=1)
+    if n_emissions > 0:
+        np.add.at(probs, tuple(times.T), np.abs(amps) ** 2)
+    else:
+        probs += np.sum(np.abs(amps) ** 2)
 
     # Iteratively integrate to obtain single value
     while probs.shape != ():
         probs = np.trapz(probs, x = tlist)
     return np.abs(probs)
+
+
+def _scattering_amplitudes(H, psi0, n_emissions, c_ops, tlist,
+                           system_zero_state=None,
+                           construct_effective_hamiltonian=True,
+                           parallel=False):
+    """
+    Private function computing the scattering amplitudes
+    :math:`\\langle 0 | U(T, \\tau_n) c_{q_n} \\cdots c_{q_1}
+    U(\\tau_1, 0) | \\psi_0 \\rangle` of all distinct configurations of
+    n emissions into W waveguides at the times in tlist.
+
+    Returns an integer array of shape (P, n) holding the emissions of every
+    configuration as q * T + i for waveguide q and time index i, and the
+    array of the P amplitudes.
+    """
+    T = len(tlist)
+    W = len(c_ops)
+
+    if construct_effective_hamiltonian:
+        # Construct an effective Hamiltonian from system hamiltonian and c_ops
+        if type(H) is Qobj:
+            Heff = H - 1j / 2 * sum([op.dag() * op for op in c_ops])
+        elif type(H) is list:
+            Heff = H + [-1j / 2 * sum([op.dag() * op for op in c_ops])]
+        else:
+            raise TypeError("Hamiltonian must be Qobj or list-callback format")
+    else:
+        Heff = H
+
+    if system_zero_state is None:
+        system_zero_state = psi0
+
+    evolver = Evolver(Heff, tlist)
+    steps = evolver.step_propagators(parallel=parallel)
+
+    # States evolved to every time, and the zero-state bras evolved back
+    # from the final time
+    N = psi0.shape[0]
+    states = np.zeros((T, N), dtype=complex)
+    states[0] = psi0.full().ravel()
+    for k in range(1, T):
+        states[k] = steps[k - 1].dot(states[k - 1])
+    bras = np.zeros((T, N), dtype=complex)
+    bras[-1] = system_zero_state.full().ravel().conj()
+    for k in range(T - 2, -1, -1):
+        bras[k] = bras[k + 1].dot(steps[k])
+
+    if n_emissions == 0:
+        return np.zeros((1, 0), dtype=np.int64), \
+            np.array([bras[0].dot(states[0])])
+
+    ops = np.array([op.full() for op in c_ops])
+    # final[q, i] is the bra <0|U(T, t_i) c_q
+    final = np.einsum('ia,qab->qib', bras, ops)
+
+    # Configurations are independent given their first emission time, which
+    # are dealt to the workers in turn to balance the load
+    if parallel and T > 1:
+        n_chunks = min(T, qset.num_cpus)
+        chunks = [np.arange(c, T, n_chunks) for c in range(n_chunks)]
+        output = parallel_map(_configuration_amplitudes, chunks,
+                              task_args=(steps, ops, final, states,
+                                         n_emissions))
+    else:
+        output = [_configuration_amplitudes(np.arange(T), steps, ops, final,
+                                            states, n_emissions)]
+    codes = np.concatenate([out[0] for out in output])
+    amps = np.concatenate([out[1] for out in output])
+    return codes, amps
+
+
+def _configuration_amplitudes(first, steps, ops, final, states, n_emissions):
+    """
+    Private function computing the amplitudes of all configurations whose
+    first emission time index is in `first`, by dynamic programming over
+    the sorted emissions.
+
+    The configurations with k emissions are kept as a stack of system states
+    sorted by their last emission (i, q). They are extended by evolving the
+    whole stack one time step at a time; at every time index j, the states
+    with earlier last emissions, and those emitted at j into a waveguide not
+    above q, are mapped by c_q in a single product. Every prefix of emissions
+    is therefore shared by all the configurations that extend it.
+    """
+    W, T = final.shape[:2]
+    first = np.sort(first)
+    # configurations with a single emission, sorted by (i, q)
+    last = np.repeat(first, W)
+    last_q = np.tile(np.arange(W), len(first))
+    codes = (last_q * T + last)[:, None]
+    if n_emissions == 1:
+        return codes, np.einsum('ka,ka->k', final[last_q, last],
+                                states[last])
+    stack = np.einsum('qab,ib->iqa', ops, states[first]).reshape(
+        -1, ops.shape[1])
+
+    for k in range(1, n_emissions):
+        last_level = (k == n_emissions - 1)
+        starts = np.searchsorted(last, np.arange(T), side='left')
+        ends = np.searchsorted(last, np.arange(T), side='right')
+        new_stack, new_codes, new_last, new_last_q = [], [], [], []
+        for j in range(T):
+            if j > 0 and starts[j] > 0:
+                stack[:starts[j]] = stack[:starts[j]].dot(steps[j - 1].T)
+            if ends[j] == 0:
+                continue
+            block_q = last_q[starts[j]:ends[j]]
+            for q in range(W):
+                m = starts[j] + np.searchsorted(block_q, q, side='right')
+                if m == 0:
+                    continue
+                if last_level:
+                    new_stack.append(stack[:m].dot(final[q, j]))
+                else:
+                    new_stack.append(stack[:m].dot(ops[q].T))
+                emission = np.full((m, 1), q * T + j, dtype=codes.dtype)
+                new_codes.append(np.hstack([codes[:m], emission]))
+                new_last.append(np.full(m, j))
+                new_last_q.append(np.full(m, q))
+        stack = np.concatenate(new_stack)
+        codes = np.concatenate(new_codes)
+        last = np.concatenate(new_last)
+        last_q = np.concatenate(new_last_q)
+    return codes, stack
@@ -44,13 +44,16 @@ import scipy.integrate
 from scipy.linalg import norm as la_norm
 import qutip.settings as qset
 from qutip.qobj import Qobj
+from qutip.qobjarray import QobjArray
 from qutip.rhs_generate import rhs_generate
-from qutip.solver import Result, Options, config, _solver_safety_check
+from qutip.solver import (Result, Options, config, _solver_safety_check,
+                          _check_precision)
 from qutip.rhs_generate import _td_format_check, _td_wrap_array_str
 from qutip.interpolate import Cubic_Spline
 from qutip.superoperator import vec2mat
 from qutip.settings import debug
 from qutip.cy.spmatfuncs import (cy_expect_psi, cy_ode_rhs,
+                                 cy_ode_rhs_single, cy_expect_psi_csr_single,
                                  cy_ode_psi_func_td,
                                  cy_ode_psi_func_td_with_state,
                                  spmvpy_csr)
@@ -168,6 +171,7 @@ def sesolve(H, psi0, tlist, e_ops=[], args={}, options=None,
 
     if options is None:
         options = Options()
+    _check_precision(options, supported=isinstance(H, Qobj) and psi0.isket)
 
     if (not options.rhs_reuse) or (not config.tdfunc):
         # reset config time-dependence flags to default values
@@ -387,7 +391,11 @@ def _sesolve_const(H, psi0, tlist, e_ops, args, opt, progress_bar):
         r = scipy.integrate.ode(_ode_oper_func)
         r.set_f_params(L.data)
     else:
-        if opt.use_openmp and L.data.nnz >= qset.openmp_thresh:
+        if opt.precision == 'single':
+            r = scipy.integrate.ode(cy_ode_rhs_single)
+            r.set_f_params(L.data.data.astype(np.complex64),
+                           L.data.indices, L.data.indptr)
+        elif opt.use_openmp and L.data.nnz >= qset.openmp_thresh:
             r = scipy.integrate.ode(cy_ode_rhs_openmp)
             r.set_f_params(L.data.data, L.data.indices, L.data.indptr,
                             opt.openmp_threads)
@@ -817,6 +825,14 @@ def _generic_ode_solve(r, psi0, tlist, e_ops, opt, progress_bar, dims=None):
     else:
         raise TypeError("Expectation parameter must be a list or a function")
 
+    store_array = opt.store_states and opt.store_states_array
+    if store_array:
+        states_array = np.zeros((n_tsteps, psi0.shape[0], psi0.shape[1]),
+                                dtype=complex)
+
+    if opt.precision == 'single' and not oper_evo and not expt_callback:
+        e_ops_single = [op.data.data.astype(np.complex64) for op in e_ops]
+
     def get_curr_state_data():
         if oper_evo:
             return vec2mat(r.y)
@@ -850,22 +866,34 @@ def _generic_ode_solve(r, psi0, tlist, e_ops, opt, progress_bar, dims=None):
             else:
                 r.set_initial_value(cdata, r.t)
 
-        if opt.store_states:
+        if store_array:
+            states_array[t_idx] = cdata.reshape(psi0.shape)
+        elif opt.store_states:
             output.states.append(Qobj(cdata, dims=dims))
 
         if expt_callback:
             # use callback method
             e_ops(t, Qobj(cdata, dims=dims))
 
-        for m in range(n_expt_op):
-            output.expect[m][t_idx] = cy_expect_psi(e_ops[m].data,
-                                                    cdata, e_ops[m].isherm)
+        if opt.precision == 'single' and not oper_evo:
+            for m in range(n_expt_op):
+                output.expect[m][t_idx] = cy_expect_psi_csr_single(
+                    e_ops_single[m], e_ops[m].data.indices,
+                    e_ops[m].data.indptr, cdata, e_ops[m].isherm)
+        else:
+            for m in range(n_expt_op):
+                output.expect[m][t_idx] = cy_expect_psi(e_ops[m].data,
+                                                        cdata,
+                                                        e_ops[m].isherm)
 
         if t_idx < n_tsteps - 1:
             r.integrate(r.t + dt[t_idx])
 
     progress_bar.finished()
 
+    if store_array:
+        output.states = QobjArray(states_array, dims=dims)
+
     if not opt.rhs_reuse and config.tdname is not None:
         try:
             os.remove(config.tdname + ".pyx")
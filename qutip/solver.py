@@ -115,9 +115,21 @@ class Options():
         result class, even if expectation values operators are given. If no
         expectation are provided, then states are stored by default and this
         option has no effect.
+    store_states_array : bool {False, True}
+        Store the states of ``sesolve`` and ``mesolve`` as a single
+        :class:`qutip.QobjArray` instead of a list of Qobj.
     use_openmp : bool {True, False}
         Use OPENMP for sparse matrix vector multiplication. Default
         None means auto check.
+    precision : str {'double', 'single'}
+        Precision of the Hamiltonian data in the right-hand side of the
+        constant Hamiltonian ``sesolve`` and ``mcsolve`` solvers.  'single'
+        stores the operator data as complex64.  The state vector stays
+        complex128, as required by the ODE integrator, so this only reduces
+        the memory traffic of the matrix elements, and only speeds up
+        operators too large for the processor cache (by 10-30%).
+        Expectation values are always accumulated in double precision.
+        Other solvers ignore this option with a warning.
 
     """
 
@@ -128,7 +140,8 @@ class Options():
                  rhs_filename=None, ntraj=500, gui=False, rhs_with_state=False,
                  store_final_state=False, store_states=False, seeds=None,
                  steady_state_average=False, normalize_output=True,
-                 use_openmp=None, openmp_threads=None):
+                 use_openmp=None, openmp_threads=None, precision='double',
+                 store_states_array=False):
         # Absolute tolerance (default = 1e-8)
         self.atol = atol
         # Relative tolerance (default = 1e-6)
@@ -183,12 +196,16 @@ class Options():
         self.store_final_state = store_final_state
         # store states even if expectation operators are given?
         self.store_states = store_states
+        # store states as a QobjArray instead of a list of Qobj
+        self.store_states_array = store_states_array
         # average mcsolver density matricies assuming steady state evolution
         self.steady_state_average = steady_state_average
         # Normalize output of solvers (turned off for batch unitary propagator mode)
         self.normalize_output = normalize_output
         # Use OPENMP for sparse matrix vector multiplication
         self.use_openmp = use_openmp
+        # Precision of the sparse matrix vector products ('double', 'single')
+        self.precision = precision
 
     def __str__(self):
         if self.seeds is None:
@@ -219,6 +236,8 @@ class Options():
         s += "ntraj:             " + str(self.ntraj) + "\n"
         s += "store_states:      " + str(self.store_states) + "\n"
         s += "store_final_state: " + str(self.store_final_state) + "\n"
+        s += "store_states_array: " + str(self.store_states_array) + "\n"
+        s += "precision:         " + str(self.precision) + "\n"
 
         return s
 
@@ -237,6 +256,7 @@ class Result():
         Expectation values (if requested) for simulation.
     states : array
         State of the simulation (density matrix or ket) evaluated at ``times``.
+        A :class:`qutip.QobjArray` if ``Options.store_states_array`` is set.
     num_expect : int
         Number of expectation value operators in simulation.
     num_collapse : int
@@ -789,6 +809,19 @@ class _StatsSection(object):
 
 
 
+def _check_precision(options, supported=False):
+    """
+    Check Options.precision, and warn if single precision was requested
+    from a solver that does not use it.
+    """
+    if options.precision not in ['double', 'single']:
+        raise ValueError("Options.precision must be 'double' or 'single'.")
+    if options.precision == 'single' and not supported:
+        warnings.warn("Options.precision='single' is only used by sesolve "
+                      "and mcsolve with a constant Hamiltonian, it is "
+                      "ignored here.")
+
+
 def _solver_safety_check(H, state=None, c_ops=[], e_ops=[], args={}):
     # Input is std Qobj (Hamiltonian or Liouvillian)
     if isinstance(H, Qobj):
@@ -59,6 +59,7 @@ from qutip.sparse import (sp_permute, sp_bandwidth, sp_reshape,
                           sp_profile)
 from qutip.cy.spmath import zcsr_kron
 from qutip.graph import reverse_cuthill_mckee, weighted_bipartite_matching
+from qutip.blockdiag import BlockDecomposition
 from qutip import (mat2vec, tensor, identity, operator_to_vector)
 import qutip.settings as settings
 from qutip.utilities import _version2int
@@ -93,7 +94,8 @@ def _default_steadystate_args():
                 'permc_spec': 'COLAMD', 'ILU_MILU': 'smilu_2',
                 'restart': 20, 'return_info': False,
                 'info': _empty_info_dict(),
-                'verbose': False, 'solver': 'scipy'}
+                'verbose': False, 'solver': 'scipy', 'krylov': 'gmres',
+                'use_blocks': False, 'conserved': None, 'parallel': False}
 
     return def_args
 
@@ -134,7 +136,8 @@ def steadystate(A, c_op_list=[], method='direct', solver=None, **kwargs):
 
     method : str {'direct', 'eigen', 'iterative-gmres',
                   'iterative-lgmres', 'iterative-bicgstab', 'svd', 'power',
-                  'power-gmres', 'power-lgmres', 'power-bicgstab'}
+                  'power-gmres', 'power-lgmres', 'power-bicgstab',
+                  'iterative-matrix-free'}
         Method for solving the underlying linear equation. Direct LU solver
         'direct' (default), sparse eigenvalue problem 'eigen',
         iterative GMRES method 'iterative-gmres', iterative LGMRES method
@@ -142,6 +145,9 @@ def steadystate(A, c_op_list=[], method='direct', solver=None, **kwargs):
         SVD 'svd' (dense), or inverse-power method 'power'. The iterative
         power methods 'power-gmres', 'power-lgmres', 'power-bicgstab' use
         the same solvers as their direct counterparts.
+        'iterative-matrix-free' never builds the Liouvillian: the Lindblad
+        equation is applied to the density matrix as operator products
+        inside the Krylov solver selected by `krylov`.
 
     return_info : bool, optional, default = False
         Return a dictionary of solver-specific infomation about the
@@ -231,6 +237,25 @@ def steadystate(A, c_op_list=[], method='direct', solver=None, **kwargs):
         algoithm used in creating the preconditoner. Should only be used by
         advanced users.
 
+    krylov : str {'gmres', 'lgmres', 'bicgstab'}, optional, default = 'gmres'
+        'iterative-matrix-free' ONLY. Krylov solver to use.  With
+        ``use_precond = True`` the preconditioner is the exact inverse of the
+        no-jump part :math:`-i(H_{\\rm eff}\\rho - \\rho H_{\\rm eff}^\\dagger)`,
+        obtained from a dense diagonalization of :math:`H_{\\rm eff}`.
+
+    use_blocks : bool, optional, default = False
+        Split the Liouvillian into its invariant subspaces, given by
+        `conserved` or by the connectivity of the Liouvillian, and solve
+        each block carrying trace with a sparse direct solver, see
+        :class:`qutip.BlockDecomposition`.
+
+    conserved : qobj, optional
+        BLOCKS ONLY. Operator conserved by the dynamics, diagonal in the
+        basis of the Hamiltonian.
+
+    parallel : bool, optional, default = False
+        BLOCKS ONLY. Solve the blocks in parallel.
+
     Returns
     -------
     dm : qobj
@@ -276,9 +301,21 @@ def steadystate(A, c_op_list=[], method='direct', solver=None, **kwargs):
     if ss_args['use_rcm'] and ('permc_spec' not in kwargs.keys()):
         ss_args['permc_spec'] = 'NATURAL'
 
+    if ss_args['method'] == 'iterative-matrix-free':
+        return _steadystate_iterative_matrix_free(A, c_op_list, ss_args)
+
     # Create & check Liouvillian
     A = _steadystate_setup(A, c_op_list)
 
+    if ss_args['use_blocks']:
+        _block_start = time.time()
+        rhoss = BlockDecomposition(A, conserved=ss_args['conserved'],
+                                   parallel=ss_args['parallel']).steadystate()
+        ss_args['info']['solution_time'] = time.time() - _block_start
+        if ss_args['return_info']:
+            return rhoss, ss_args['info']
+        return rhoss
+
     # Set weight parameter to avg abs val in L if not set explicitly
     if 'weight' not in kwargs.keys():
         ss_args['weight'] = np.mean(np.abs(A.data.data.max()))
@@ -720,6 +757,144 @@ def _steadystate_iterative(L, ss_args):
         return Qobj(data, dims=dims, isherm=True)
 
 
+def _steadystate_iterative_matrix_free(H, c_op_list, ss_args):
+    """
+    Iterative steady state solver that applies the Lindblad equation to the
+    density matrix as operator products, without assembling the Liouvillian.
+    The trace condition is added to the (0, 0) element as in
+    `_steadystate_LU_liouvillian`.
+    """
+    ss_iters = {'iter': 0}
+
+    def _iter_count(r):
+        ss_iters['iter'] += 1
+        return
+
+    if settings.debug:
+        logger.debug('Starting matrix-free %s solver.' % ss_args['krylov'])
+
+    if issuper(H):
+        # nothing to gain, but allow a Liouvillian for convenience
+        L = H.data
+        dims = H.dims[0]
+        n = int(np.sqrt(L.shape[0]))
+        Heff = None
+        _L_matvec = L.dot
+    elif isoper(H):
+        if len(c_op_list) == 0:
+            raise TypeError('Cannot calculate the steady state for a ' +
+                            'non-dissipative system ' +
+                            '(no collapse operators given)')
+        dims = H.dims
+        n = H.shape[0]
+        # H_eff = H - i/2 sum c^dag c
+        Heff = H.data.tocsr()
+        for c in c_op_list:
+            Heff = Heff - 0.5j * (c.data.H * c.data)
+        Heff = Heff.tocsr()
+        Heff_conj = Heff.conj().tocsr()
+        cops = [c.data.tocsr() for c in c_op_list]
+
+        def _L_matvec(x):
+            rho = x.reshape((n, n), order='F')
+            out = -1j * Heff.dot(rho)
+            # rho H_eff^dag = (conj(H_eff) rho^T)^T
+            out += 1j * Heff_conj.dot(rho.T).T
+            for c in cops:
+                # c rho c^dag = c (c rho^dag)^dag
+                out += c.dot(c.dot(rho.conj().T).conj().T)
+            return out.ravel('F')
+    else:
+        raise TypeError('Solving for steady states requires ' +
+                        'Liouvillian (super) operators')
+
+    if ss_args['weight'] is None:
+        data = L.data if Heff is None else Heff.data
+        ss_args['weight'] = np.mean(np.abs(data)) if len(data) else 1.0
+    ss_args['info']['weight'] = ss_args['weight']
+    weight = ss_args['weight']
+    diag = np.arange(n) * (n + 1)
+
+    def _A_matvec(x):
+        out = _L_matvec(x)
+        out[0] += weight * np.sum(x[diag])
+        return out
+
+    A = LinearOperator((n ** 2, n ** 2), matvec=_A_matvec, dtype=complex)
+    b = np.zeros(n ** 2, dtype=complex)
+    b[0] = weight
+
+    M = ss_args['M']
+    if M is None and ss_args['use_precond']:
+        if Heff is None:
+            raise TypeError('The matrix-free preconditioner requires a ' +
+                            'Hamiltonian and collapse operators.')
+        _precond_start = time.time()
+        # exact inverse of the no-jump part, rho -> -i(H_eff rho - rho H_eff^+)
+        # in the eigenbasis of H_eff
+        evals, V = la.eig(Heff.toarray())
+        Vinv = la.inv(V)
+        Vdag = V.conj().T
+        Vinv_dag = Vinv.conj().T
+        denom = -1j * (evals[:, np.newaxis] - evals.conj()[np.newaxis, :])
+        small = np.abs(denom) < 1e-12 * max(1, np.abs(evals).max())
+        denom[small] = weight
+
+        def _precond(x):
+            y = Vinv.dot(x.reshape((n, n), order='F')).dot(Vinv_dag)
+            return V.dot(y / denom).dot(Vdag).ravel('F')
+
+        M = LinearOperator((n ** 2, n ** 2), matvec=_precond, dtype=complex)
+        ss_args['info']['precond_time'] = time.time() - _precond_start
+
+    _iter_start = time.time()
+    solvers = {'gmres': gmres, 'lgmres': lgmres, 'bicgstab': bicgstab}
+    if ss_args['krylov'] not in solvers:
+        raise ValueError("Invalid krylov solver '%s' for steadystate." %
+                         ss_args['krylov'])
+    solver_kwargs = dict(tol=ss_args['tol'], M=M, x0=ss_args['x0'],
+                         maxiter=ss_args['maxiter'], callback=_iter_count)
+    if ss_args['krylov'] == 'gmres':
+        solver_kwargs['restart'] = ss_args['restart']
+    try:
+        v, check = solvers[ss_args['krylov']](A, b, atol=ss_args['matol'],
+                                              **solver_kwargs)
+    except TypeError as e:
+        if "unexpected keyword argument 'atol'" in str(e):
+            v, check = solvers[ss_args['krylov']](A, b, **solver_kwargs)
+        else:
+            raise
+    _iter_end = time.time()
+
+    ss_args['info']['iter_time'] = _iter_end - _iter_start
+    ss_args['info']['solution_time'] = (ss_args['info']['iter_time'] +
+                                        ss_args['info'].get('precond_time',
+                                                            0))
+    ss_args['info']['iterations'] = ss_iters['iter']
+    ss_args['info']['residual_norm'] = la.norm(b - A.matvec(v), np.inf)
+
+    if settings.debug:
+        logger.debug('Number of Iterations: %i' % ss_iters['iter'])
+        logger.debug('Iteration. time: %f' % (_iter_end - _iter_start))
+
+    if check > 0:
+        raise Exception("Steadystate error: Did not reach tolerance after " +
+                        str(ss_args['maxiter']) + " steps." +
+                        "\nResidual norm: " +
+                        str(ss_args['info']['residual_norm']))
+
+    elif check < 0:
+        raise Exception(
+            "Steadystate error: Failed with fatal error: " + str(check) + ".")
+
+    data = vec2mat(v)
+    data = 0.5 * (data + data.conj().T)
+    if ss_args['return_info']:
+        return Qobj(data, dims=dims, isherm=True), ss_args['info']
+    else:
+        return Qobj(data, dims=dims, isherm=True)
+
+
 def _steadystate_svd_dense(L, ss_args):
     """
     Find the steady state(s) of an open quantum system by solving for the
@@ -1132,7 +1307,7 @@ def _pseudo_inverse_dense(L, rhoss, w=None, **pseudo_args):
 
     else:
         raise ValueError("Unsupported method '%s'. Use 'direct' or 'numpy'" %
-                         method)
+                         pseudo_args['method'])
 
 
 def _pseudo_inverse_sparse(L, rhoss, w=None, **pseudo_args):
@@ -1165,7 +1340,7 @@ def _pseudo_inverse_sparse(L, rhoss, w=None, **pseudo_args):
         A = sp_permute(L.data, perm, perm)
         Q = sp_permute(Q, perm, perm)
     else:
-        if ss_args['solver'] == 'scipy':
+        if pseudo_args['solver'] == 'scipy':
             A = L.data.tocsc()
             A.sort_indices()
 
@@ -1177,10 +1352,10 @@ def _pseudo_inverse_sparse(L, rhoss, w=None, **pseudo_args):
         else:
             pspec = pseudo_args['permc_spec']
             diag_p_thresh = pseudo_args['diag_pivot_thresh']
-            pseudo_args = pseudo_args['ILU_MILU']
+            ilu_milu = pseudo_args['ILU_MILU']
             lu = sp.linalg.splu(A, permc_spec=pspec,
                                 diag_pivot_thresh=diag_p_thresh,
-                                options=dict(ILU_MILU=pseudo_args))
+                                options=dict(ILU_MILU=ilu_milu))
             LIQ = lu.solve(Q.toarray())
 
     elif pseudo_args['method'] == 'spilu':
@@ -1190,7 +1365,7 @@ def _pseudo_inverse_sparse(L, rhoss, w=None, **pseudo_args):
         LIQ = lu.solve(Q.toarray())
 
     else:
-        raise ValueError("unsupported method '%s'" % method)
+        raise ValueError("unsupported method '%s'" % pseudo_args['method'])
 
     R = sp.csr_matrix(Q * LIQ)
 
@@ -1255,14 +1430,13 @@ def pseudo_inverse(L, rhoss=None, w=None, sparse=True,  **kwargs):
 
     """
     pseudo_args = _default_steadystate_args()
+    pseudo_args['method'] = 'splu'
     for key in kwargs.keys():
         if key in pseudo_args.keys():
             pseudo_args[key] = kwargs[key]
         else:
             raise Exception(
                 "Invalid keyword argument '"+key+"' passed to pseudo_inverse.")
-    if 'method' not in kwargs.keys():
-        pseudo_args['method'] = 'splu'
 
     # Set column perm to NATURAL if using RCM and not specified by user
     if pseudo_args['use_rcm'] and ('permc_spec' not in kwargs.keys()):
@@ -1279,3 +1453,129 @@ def pseudo_inverse(L, rhoss=None, w=None, sparse=True,  **kwargs):
         else:
             pseudo_args['method'] = 'direct'
         return _pseudo_inverse_dense(L, rhoss, w=w, **pseudo_args)
+
+
+def _pseudo_inverse_sweep_chunk(wlist, A, perm, Qright, Qleft, rhoss_vec):
+    """
+    Internal function evaluating Qleft (A + 1j*w)^{-1} Qright for a chunk of
+    frequencies with sparse LU factorizations.  The fill reducing column
+    ordering `perm` is computed once by the caller and shared by all
+    frequencies, so each factorization only does the numerical work.
+    """
+    n = A.shape[0]
+    I = sp.identity(n, dtype=complex, format='csc')
+    Ap = A[:, perm]
+    Ip = I[:, perm]
+    # At w = 0 the Liouvillian is singular. Adding rhoss e_k^T, with
+    # e_k . rhoss != 0, makes it regular without changing the result on the
+    # subspace selected by Q.
+    k = np.argmax(np.abs(rhoss_vec))
+    R0 = sp.csc_matrix((rhoss_vec, (np.arange(n), np.full(n, k))),
+                       shape=(n, n))[:, perm]
+    out = np.zeros((len(wlist), Qleft.shape[0], Qright.shape[1]),
+                   dtype=complex)
+    for idx, w in enumerate(wlist):
+        if w == 0:
+            lu = splu(Ap + R0, permc_spec='NATURAL')
+        else:
+            lu = splu(Ap + 1j * w * Ip, permc_spec='NATURAL')
+        x = np.empty_like(Qright)
+        x[perm] = lu.solve(Qright)
+        out[idx] = Qleft.dot(x)
+    return out
+
+
+def _pseudo_inverse_sweep(L, rhoss, wlist, right, left, method='auto',
+                          map_func=None, map_kwargs=None):
+    """
+    Internal function evaluating left Q (L + 1j*w)^{-1} Q right, i.e. the
+    action of ``pseudo_inverse(L, rhoss, w)`` between the given vectors, for
+    all frequencies in `wlist` without forming the pseudo-inverse.
+
+    Parameters
+    ----------
+    L : Qobj
+        Liouvillian superoperator.
+    rhoss : Qobj
+        Steady state of `L`.
+    wlist : array_like
+        Frequencies.
+    right : array
+        Vectorized operators as columns, shape (N**2, k).
+    left : array
+        Vectorized operators as rows, shape (m, N**2).
+    method : str {'auto', 'eig', 'splu'}
+        'eig' uses one eigendecomposition of L, after which every frequency
+        costs O(N**2).  'splu' uses sparse LU factorizations sharing one
+        column ordering.  'auto' selects 'eig' for Liouvillians of dimension
+        up to 1024 with well conditioned eigenvectors, and 'splu' otherwise.
+    map_func : function
+        Map function used to distribute frequency chunks for 'splu',
+        e.g. :func:`qutip.parallel.parallel_map`.  Default is serial.
+    map_kwargs : dict
+        Keyword arguments for `map_func`.
+
+    Returns
+    -------
+    out : array
+        Array of shape (len(wlist), m, k).
+    """
+    wlist = np.asarray(wlist, dtype=float)
+    n = L.shape[0]
+    tr_vec = operator_to_vector(
+        tensor([identity(d) for d in L.dims[0][0]])).full().ravel()
+    rhoss_vec = operator_to_vector(rhoss).full().ravel()
+
+    right = np.asarray(right, dtype=complex).reshape(n, -1)
+    left = np.asarray(left, dtype=complex).reshape(-1, n)
+    # Q = 1 - |rhoss><tr|
+    Qright = right - np.outer(rhoss_vec, tr_vec.dot(right))
+    Qleft = left - np.outer(left.dot(rhoss_vec), tr_vec)
+
+    if method == 'auto':
+        method = 'eig' if n <= 1024 else 'splu'
+        if method == 'eig':
+            evals, V = la.eig(L.full())
+            if np.linalg.cond(V) > 1e10:
+                method = 'splu'
+
+    elif method == 'eig':
+        evals, V = la.eig(L.full())
+
+    if method == 'eig':
+        lv = Qleft.dot(V)
+        rv = la.solve(V, Qright)
+        # the steady-state mode is projected out by Q
+        evals = evals.copy()
+        zero = np.argmin(np.abs(evals))
+        lv[:, zero] = 0
+        rv[zero, :] = 0
+        evals[zero] = 1
+        return np.einsum('mi,wi,ik->wmk', lv,
+                         1 / (evals[np.newaxis, :] +
+                              1j * wlist[:, np.newaxis]),
+                         rv)
+
+    elif method == 'splu':
+        A = L.data.tocsc()
+        w0 = wlist[np.argmax(np.abs(wlist))] if len(wlist) else 1.0
+        lu = splu(A + 1j * (w0 if w0 != 0 else 1.0) *
+                  sp.identity(n, dtype=complex, format='csc'),
+                  permc_spec='COLAMD')
+        perm = np.argsort(lu.perm_c)
+        del lu
+
+        if map_func is None:
+            return _pseudo_inverse_sweep_chunk(wlist, A, perm, Qright,
+                                               Qleft, rhoss_vec)
+        if map_kwargs is None:
+            map_kwargs = {}
+        nchunks = max(1, min(len(wlist), settings.num_cpus))
+        chunks = np.array_split(wlist, nchunks)
+        results = map_func(_pseudo_inverse_sweep_chunk, chunks,
+                           task_args=(A, perm, Qright, Qleft, rhoss_vec),
+                           **map_kwargs)
+        return np.concatenate(results, axis=0)
+
+    else:
+        raise ValueError("Unsupported method '%s'" % method)
@@ -64,7 +64,7 @@ from qutip.cy.stochastic import (cy_d1_rho_photocurrent,
                                  cy_d2_rho_photocurrent)
 from qutip.parallel import serial_map
 from qutip.ui.progressbar import TextProgressBar
-from qutip.solver import Options, _solver_safety_check
+from qutip.solver import Options, _solver_safety_check, _check_precision
 from qutip.settings import debug
 
 
@@ -221,6 +221,7 @@ class StochasticSolverOptions:
 
         if options is None:
             options = Options()
+        _check_precision(options)
 
         if progress_bar is None:
             progress_bar = TextProgressBar()
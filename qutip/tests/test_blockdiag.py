@@ -0,0 +1,113 @@
+# This file is part of QuTiP: Quantum Toolbox in Python.
+#
+#    Copyright (c) 2011 and later, Paul D. Nation and Robert J. Johansson.
+#    All rights reserved.
+#
+#    Redistribution and use in source and binary forms, with or without
+#    modification, are permitted provided that the following conditions are
+#    met:
+#
+#    1. Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#
+#    2. Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#
+#    3. Neither the name of the QuTiP: Quantum Toolbox in Python nor the names
+#       of its contributors may be used to endorse or promote products derived
+#       from this software without specific prior written permission.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+#    "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+#    LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+#    PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+#    HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+#    SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+#    LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+#    DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+#    THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+#    (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+#    OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+###############################################################################
+
+import numpy as np
+from numpy.testing import assert_, assert_equal, run_module_suite
+from qutip import (destroy, qeye, tensor, liouvillian, steadystate,
+                   propagator, invariant_subspaces, BlockDecomposition)
+
+
+def _jc_model(N=6):
+    a = tensor(destroy(N), qeye(2))
+    sm = tensor(qeye(N), destroy(2))
+    H = a.dag() * a + 0.9 * sm.dag() * sm + 0.3 * (a.dag() * sm +
+                                                   a * sm.dag())
+    c_ops = [np.sqrt(0.3) * a, np.sqrt(0.1) * sm, 0.2 * a.dag()]
+    return H, c_ops, a.dag() * a + sm.dag() * sm
+
+
+def test_invariant_subspaces():
+    "Block decomposition: invariant subspaces"
+    H, c_ops, num = _jc_model()
+    blocks = invariant_subspaces(H, num)
+    assert_equal(len(blocks), 7)
+    assert_equal(sorted(np.concatenate(blocks)), np.arange(H.shape[0]))
+    blocks_graph = invariant_subspaces(H)
+    assert_equal(len(blocks_graph), len(blocks))
+    for b1, b2 in zip(blocks, blocks_graph):
+        assert_equal(b1, b2)
+
+
+def test_block_eigenstates():
+    "Block decomposition: eigenstates"
+    H, c_ops, num = _jc_model()
+    evals, ekets = BlockDecomposition(H, num).eigenstates()
+    evals0 = H.eigenenergies()
+    assert_(np.max(np.abs(evals - evals0)) < 1e-12)
+    for e, k in zip(evals, ekets):
+        assert_((H * k - e * k).norm() < 1e-12)
+
+    evals1, ekets1 = H.eigenstates(use_blocks=True, conserved=num)
+    assert_(np.max(np.abs(evals1 - evals0)) < 1e-12)
+    assert_equal(len(ekets1), len(evals0))
+    evals2, ekets2 = H.eigenstates(use_blocks=True, sort='high', eigvals=3)
+    assert_(np.max(np.abs(evals2 - evals0[::-1][:3])) < 1e-12)
+    assert_((H * ekets2[0] - evals2[0] * ekets2[0]).norm() < 1e-12)
+
+
+def test_block_propagator():
+    "Block decomposition: propagator"
+    H, c_ops, num = _jc_model()
+    U = BlockDecomposition(H).propagator(0.7)
+    assert_(np.max(np.abs(U.full() - (-0.7j * H).expm().full())) < 1e-12)
+    L = liouvillian(H, c_ops)
+    U_list = BlockDecomposition(L, num).propagator([0.5, 1.0])
+    assert_(np.max(np.abs(U_list[1].full() - L.expm().full())) < 1e-10)
+
+    U = propagator(H, 0.7, use_blocks=True, conserved=num)
+    assert_(np.max(np.abs(U.full() - (-0.7j * H).expm().full())) < 1e-12)
+    U_list = propagator(H, [0, 0.5, 1.0], c_ops, use_blocks=True)
+    U_ode = propagator(H, [0, 0.5, 1.0], c_ops)
+    assert_equal(U_list.shape, U_ode.shape)
+    assert_equal(U_list[2].dims, U_ode[2].dims)
+    assert_(np.max(np.abs(U_list[2].full() - L.expm().full())) < 1e-10)
+    # the propagators are relative to the first time
+    U_list = propagator(H, [1.0, 1.5, 2.0], c_ops, use_blocks=True)
+    assert_(np.max(np.abs(U_list[0].full() - np.eye(L.shape[0]))) < 1e-12)
+    assert_(np.max(np.abs(U_list[2].full() - L.expm().full())) < 1e-10)
+    U_ode = propagator(H, [1.0, 1.5, 2.0], c_ops)
+    assert_(np.max(np.abs(U_list[1].full() - U_ode[1].full())) < 1e-4)
+
+
+def test_block_steadystate():
+    "Block decomposition: steady state"
+    H, c_ops, num = _jc_model()
+    rho0 = steadystate(H, c_ops)
+    rho1 = steadystate(H, c_ops, use_blocks=True, conserved=num)
+    rho2 = steadystate(H, c_ops, use_blocks=True)
+    assert_(np.max(np.abs(rho1.full() - rho0.full())) < 1e-12)
+    assert_(np.max(np.abs(rho2.full() - rho0.full())) < 1e-12)
+
+
+if __name__ == "__main__":
+    run_module_suite()
@@ -294,5 +294,40 @@ def testQobjList():
         assert_(diff < 1e-2)
 
 
+def testBlochRedfieldBuilder():
+    "brmesolve: BlochRedfieldBuilder matches bloch_redfield_tensor"
+    N = 5
+    a = tensor(destroy(N), qeye(2))
+    sz = tensor(qeye(N), sigmaz())
+    sm = tensor(qeye(N), destroy(2))
+    H = a.dag() * a + 0.8 * sz / 2 + 0.05 * (a.dag() * sm + a * sm.dag())
+    psi0 = tensor(basis(N, 1), basis(2, 0))
+    tlist = np.linspace(0, 10, 11)
+
+    def ohmic(w):
+        return 0.05 * w if w > 0 else 0.0
+
+    def flat(w):
+        return 0.02 * (w > 0)
+
+    for use_secular in [True, False]:
+        a_ops = [[a + a.dag(), ohmic], [sz, flat]]
+        R1, ekets1 = bloch_redfield_tensor(H, a_ops, c_ops=[0.1 * a],
+                                           use_secular=use_secular)
+        builder = BlochRedfieldBuilder(H, a_ops, c_ops=[0.1 * a],
+                                       use_secular=use_secular)
+        R2, ekets2 = builder.tensor()
+        assert_allclose(abs(R1.full()), abs(R2.full()), atol=1e-12)
+
+        e1 = bloch_redfield_solve(R1, ekets1, psi0, tlist, [a.dag() * a])
+        e2 = bloch_redfield_solve(R2, ekets2, psi0, tlist, [a.dag() * a])
+        assert_allclose(e1[0], e2[0], atol=1e-8)
+
+    R_list = builder.tensors([[ohmic, flat], [flat, ohmic]])
+    R3, _ = builder.tensor([flat, ohmic])
+    assert_(len(R_list) == 2)
+    assert_allclose(R_list[1].full(), R3.full())
+
+
 if __name__ == "__main__":
     run_module_suite()
@@ -447,5 +447,34 @@ def test_td_brmesolve_args():
     assert_allclose(brme2.expect[0], brme1.expect[0])
     assert_allclose(brme2.expect[1], brme1.expect[1])
 
+def test_td_brmesolve_spline_rhs():
+    """
+    td_brmesolve: precompiled Cubic_Spline RHS vs. string-based RHS
+    """
+    N = 4
+    a = destroy(N)
+    H0 = a.dag() * a
+    H1 = a + a.dag()
+    psi0 = basis(N, 1)
+    times = np.linspace(0, 10, 101)
+    ts = np.linspace(0, 10.5, 5000)
+    ws = np.linspace(-5, 5, 10001)
+    e_ops = [a.dag() * a]
+
+    H_spl = [H0, [H1, Cubic_Spline(ts[0], ts[-1], 0.2 * np.sin(ts))]]
+    S_spl = Cubic_Spline(ws[0], ws[-1], 0.1 * np.exp(-(ws - 1)**2))
+    g_spl = Cubic_Spline(ts[0], ts[-1], np.exp(-0.1 * ts))
+    c_spl = Cubic_Spline(ts[0], ts[-1], 0.1 + 0 * ts)
+    res_spl = brmesolve(H_spl, psi0, times, [[H1, (S_spl, g_spl)]], e_ops,
+                        c_ops=[[a, c_spl]])
+
+    H_str = [H0, [H1, '0.2*sin(t)']]
+    a_str = [[H1, '0.1*exp(-(w-1)**2)*exp(-0.1*t)']]
+    res_str = brmesolve(H_str, psi0, times, a_str, e_ops,
+                        c_ops=[[a, '0.1']])
+
+    assert_allclose(res_spl.expect[0], res_str.expect[0], atol=1e-5)
+
+
 if __name__ == "__main__":
     run_module_suite()
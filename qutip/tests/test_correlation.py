@@ -101,6 +101,30 @@ def test_compare_solvers_coherent_state_mees():
     assert_(max(abs(corr1 - corr2)) < 1e-4)
 
 
+def test_compare_solvers_3op_2t_grid():
+    """
+    correlation: comparing me and es for three-operator two-time grids
+    """
+
+    N = 10
+    a = tensor(destroy(N), qeye(2))
+    sm = tensor(qeye(N), destroy(2))
+    H = (a.dag() * a + sm.dag() * sm + 0.4 * (a.dag() * sm + a * sm.dag()) +
+         0.3 * (a + a.dag()))
+    c_ops = [np.sqrt(0.2) * a, np.sqrt(0.1) * sm]
+    rho0 = tensor(fock(N, 0), fock(2, 1))
+
+    tlist = np.linspace(0, 5.0, 20)
+    taulist = np.linspace(0, 5.0, 30)
+    corr1 = correlation_3op_2t(H, rho0, tlist, taulist, c_ops, a.dag(),
+                               a.dag() * a, a, solver="me")
+    corr2 = correlation_3op_2t(H, rho0, tlist, taulist, c_ops, a.dag(),
+                               a.dag() * a, a, solver="es")
+
+    assert_(corr1.shape == (20, 30))
+    assert_(np.max(abs(corr1 - corr2)) < 1e-4)
+
+
 def test_compare_solvers_coherent_state_memc():
     """
     correlation: comparing me and mc for driven oscillator in fock state
@@ -260,6 +284,43 @@ def test_spectrum_espi():
     assert_(max(abs(spec1 - spec2)) < 1e-3)
 
 
+def test_spectrum_pi_sweep_methods():
+    """
+    correlation: pseudo-inverse frequency sweep, eig and splu methods
+    """
+    from qutip import liouvillian, steadystate, spre, operator_to_vector
+    from qutip.steadystate import _pseudo_inverse_sweep, pseudo_inverse
+
+    N = 4
+    a = tensor(destroy(N), qeye(2))
+    sm = tensor(qeye(N), destroy(2))
+    H = 2 * np.pi * (a.dag() * a + sm.dag() * sm) + \
+        0.2 * np.pi * (a.dag() * sm + a * sm.dag())
+    c_ops = [np.sqrt(0.75) * a, np.sqrt(0.25) * sm, 0.1 * a.dag()]
+    L = liouvillian(H, c_ops)
+    rhoss = steadystate(L)
+
+    tr_vec = operator_to_vector(tensor(qeye(N), qeye(2))).full()
+    right = spre(a).data.dot(operator_to_vector(rhoss).full())
+    left = spre(a.dag()).data.T.dot(tr_vec).T
+
+    wlist = np.array([0.0, 1.5, 2 * np.pi])
+    s_eig = _pseudo_inverse_sweep(L, rhoss, wlist, right, left, method='eig')
+    s_lu = _pseudo_inverse_sweep(L, rhoss, wlist, right, left,
+                                 method='splu')
+    for idx, w in enumerate(wlist):
+        R = pseudo_inverse(L, rhoss, w=w, sparse=False).full()
+        s_ref = left.dot(R.dot(right))
+        assert_(abs(s_eig[idx, 0, 0] - s_ref[0, 0]) < 1e-8)
+        assert_(abs(s_lu[idx, 0, 0] - s_ref[0, 0]) < 1e-8)
+
+    wlist = 2 * pi * np.linspace(0.5, 1.5, 50)
+    spec1 = spectrum(H, wlist, c_ops, a.dag(), a, solver='pi')
+    spec2 = spectrum(H, wlist, c_ops, a.dag(), a, solver='pi',
+                     use_pinv=True)
+    assert_(max(abs(spec1 - spec2)) < 1e-8)
+
+
 @unittest.skipIf(not Cython_OK, 'Cython not found or version too low.')
 def test_H_str_list_td_corr():
     """
@@ -34,7 +34,8 @@ import numpy as np
 from numpy.testing import assert_, assert_allclose, run_module_suite
 
 from qutip import (projection, sprepost, liouvillian, countstat_current,
-                   countstat_current_noise, steadystate)
+                   countstat_current_noise, steadystate, destroy, qeye,
+                   tensor)
 
 
 def test_dqd_current():
@@ -92,5 +93,31 @@ def test_dqd_current():
     assert_allclose(I, Iref, 1e-4)
     assert_allclose(S, Sref, 1e-4)
 
+def test_current_noise_spectrum():
+    "Counting statistics: current noise spectrum methods"
+    N = 6
+    a = tensor(destroy(N), qeye(2))
+    sm = tensor(qeye(N), destroy(2))
+    H = (a.dag() * a + sm.dag() * sm + 0.4 * (a.dag() * sm + a * sm.dag()) +
+         0.3 * (a + a.dag()))
+    c_ops = [np.sqrt(0.2) * a, np.sqrt(0.1) * sm, np.sqrt(0.05) * a.dag()]
+    L = liouvillian(H, c_ops)
+    rhoss = steadystate(L)
+    wlist = np.linspace(-2, 2, 9)
+
+    I, S = countstat_current_noise(L, c_ops, wlist=wlist, rhoss=rhoss)
+    assert_(S.shape == (3, 3, len(wlist)))
+    assert_allclose(I, countstat_current(L, c_ops, rhoss=rhoss), atol=1e-12)
+    assert_allclose(S, np.transpose(S, (1, 0, 2)), atol=1e-12)
+
+    I2, S2 = countstat_current_noise(L, c_ops, wlist=wlist, rhoss=rhoss,
+                                     sparse=False)
+    assert_allclose(S, S2, atol=1e-10)
+
+    I3, S3 = countstat_current_noise(L, c_ops, wlist=wlist, rhoss=rhoss,
+                                     method='splu')
+    assert_allclose(S, S3, atol=1e-10)
+
+
 if __name__ == "__main__":
     run_module_suite()
@@ -34,12 +34,14 @@
 from __future__ import division
 
 import numpy as np
-from numpy.testing import assert_, assert_equal, run_module_suite
+from numpy.testing import (assert_, assert_equal, assert_raises,
+                           run_module_suite)
 
 from qutip import (basis, ket2dm, cnot, entropy_vn, entropy_linear, rand_ket,
                    rand_dm, tensor, concurrence, entropy_mutual, ptrace,
                    entropy_conditional, entangling_power, iswap, swap,
-                   berkeley, sqrtswap, swapalpha)
+                   berkeley, sqrtswap, swapalpha, negativity,
+                   schmidt_spectrum, entropy_entanglement)
 
 
 def test_EntropyVN():
@@ -131,6 +133,44 @@ def test_EntropyConditional():
             ABC, [1, 2]) <= entropy_conditional(AB, 1), True)
 
 
+def test_EntropyEntanglement():
+    "Entropy: Entanglement entropy of pure states"
+    kets = [rand_ket(30, dims=[[2, 5, 3], [1, 1, 1]]) for k in range(10)]
+
+    for sel in [[0], [1], [0, 2], [2, 1]]:
+        batch = entropy_entanglement(kets, sel, 2)
+        for k, psi in enumerate(kets):
+            rhoA = ptrace(ket2dm(psi), sel)
+            S = entropy_vn(rhoA, 2)
+            assert_(abs(entropy_entanglement(psi, sel, 2) - S) < 1e-10)
+            assert_(abs(batch[k] - S) < 1e-10)
+            # Renyi entropy of order 2
+            S2 = -np.log((rhoA * rhoA).tr().real)
+            assert_(abs(entropy_entanglement(psi, sel, alpha=2) - S2) < 1e-10)
+            # Schmidt spectrum matches the reduced density matrix
+            spec = schmidt_spectrum(psi, sel, tol=1e-14)
+            evals = np.sort(rhoA.eigenenergies())[::-1]
+            assert_(np.allclose(spec, evals[:len(spec)]))
+
+    # Bell state has one ebit of entanglement
+    bell = (tensor(basis(2, 0), basis(2, 0)) +
+            tensor(basis(2, 1), basis(2, 1))).unit()
+    assert_(abs(entropy_entanglement(bell, 0, 2) - 1) < 1e-12)
+    assert_(abs(entropy_mutual(bell, 0, 1, 2) - 2) < 1e-12)
+
+
+def test_NegativityPure():
+    "Entropy: Negativity of pure states"
+    for k in range(10):
+        psi = rand_ket(15, dims=[[3, 5], [1, 1]])
+        rho = ket2dm(psi)
+        for subsys in [0, 1]:
+            assert_(abs(negativity(psi, subsys) -
+                        negativity(rho, subsys, method='eigenvalues')) < 1e-8)
+    assert_raises(ValueError, negativity, psi, 0, method='bogus')
+    assert_raises(ValueError, negativity, rho, 0, method='bogus')
+
+
 def test_EntanglingPower():
     "Entropy: Entangling power"
     assert_(abs(entangling_power(cnot()) - 2/9) < 1e-12)
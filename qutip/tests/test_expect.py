@@ -37,9 +37,9 @@ from numpy.testing import assert_, run_module_suite
 from qutip.operators import (num, destroy,
                              sigmax, sigmay, sigmaz, sigmam, sigmap)
 from qutip.states import fock, fock_dm
-from qutip.expect import expect
+from qutip.expect import expect, variance
 from qutip.mesolve import mesolve
-from qutip.random_objects import rand_herm, rand_ket
+from qutip.random_objects import rand_herm, rand_ket, rand_dm
 
 
 class TestExpect:
@@ -153,6 +153,24 @@ class TestExpect:
             for s_idx, s in enumerate(states):
                 assert_(r[s_idx] == expect(operators[r_idx], states[s_idx]))
 
+    def testBatchedRandStateList(self):
+        """
+        expect: batched evaluation over random state lists
+        """
+        N = 15
+        ops = [rand_herm(N, 0.3), rand_herm(N, 0.2) + 1j * rand_herm(N, 0.2)]
+        for states in [[rand_ket(N, 0.5) for k in range(30)],
+                       [rand_dm(N, 0.5) for k in range(30)]]:
+            res = expect(ops, states)
+            for r_idx, op in enumerate(ops):
+                for s_idx, st in enumerate(states):
+                    assert_(abs(res[r_idx][s_idx] - expect(op, st)) < 1e-12)
+
+            var = variance(ops[0], states)
+            assert_(var.dtype == np.float64)
+            for s_idx, st in enumerate(states):
+                assert_(abs(var[s_idx] - variance(ops[0], st)) < 1e-12)
+
     def testExpectSolverCompatibility(self):
         """
         expect: operator list and state list
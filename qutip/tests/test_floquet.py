@@ -34,6 +34,9 @@
 import numpy as np
 from numpy.testing import assert_, run_module_suite
 from qutip import fsesolve, sigmax, sigmaz, rand_ket, num, mesolve
+from qutip import (floquet_modes, floquet_modes_table, floquet_modes_t,
+                   floquet_modes_t_lookup, floquet_master_equation_rates)
+from qutip.utilities import n_thermal
 
 
 class TestFloquet:
@@ -67,6 +70,93 @@ class TestFloquet:
 
         assert_(max(abs(sol.expect[0] - sol_ref.expect[0])) < 1e-4)
 
+    def testFloquetRates(self):
+        """
+        Floquet: test master equation rates against element-wise sums
+        """
+        delta = 0.2 * 2 * np.pi
+        eps0 = 1.0 * 2 * np.pi
+        A = 0.5 * 2 * np.pi
+        omega = 1.0 * 2 * np.pi
+        T = (2 * np.pi) / omega
+        H0 = - delta / 2.0 * sigmax() - eps0 / 2.0 * sigmaz()
+        H1 = A / 2.0 * sigmaz()
+        args = {'w': omega}
+        H = [H0, [H1, lambda t, args: np.sin(args['w'] * t)]]
+        kmax = 3
+        w_th = 0.5
+
+        # callback that only accepts scalars
+        def J_cb(w):
+            return 0.1 * w / (2 * np.pi) if w > 0 else 0.0
+
+        f_modes_0, f_energies = floquet_modes(H, T, args)
+        f_modes_table = floquet_modes_table(f_modes_0, f_energies,
+                                            np.linspace(0, T, 101), H, T,
+                                            args)
+        Delta, X, Gamma, Amat = floquet_master_equation_rates(
+            f_modes_0, f_energies, sigmax(), H, T, args, J_cb, w_th,
+            kmax, f_modes_table)
+
+        tlist = np.arange(T / 100, T + T / 200, T / 100)
+        for a in range(2):
+            for b in range(2):
+                for k_idx, k in enumerate(range(-kmax, kmax + 1)):
+                    x = 0
+                    for t in tlist:
+                        f_modes_t = floquet_modes_t_lookup(f_modes_table,
+                                                           t, T)
+                        x += 0.01 * np.exp(-1j * k * omega * t) * \
+                            (f_modes_t[a].dag() * sigmax() *
+                             f_modes_t[b])[0, 0]
+                    d = f_energies[a] - f_energies[b] + k * omega
+                    assert_(abs(X[a, b, k_idx] - x) < 1e-12)
+                    assert_(abs(Delta[a, b, k_idx] - d) < 1e-12)
+                    assert_(abs(Gamma[a, b, k_idx] -
+                                2 * np.pi * J_cb(d) * abs(x) ** 2) < 1e-12)
+
+        for a in range(2):
+            for b in range(2):
+                ab = 0
+                for k in range(-kmax, kmax + 1):
+                    ab += Gamma[a, b, k + kmax] + \
+                        n_thermal(abs(Delta[a, b, k + kmax]), w_th) * \
+                        (Gamma[a, b, k + kmax] + Gamma[b, a, -k + kmax])
+                assert_(abs(Amat[a, b] - ab) < 1e-12)
+
+    def testFloquetModesTable(self):
+        """
+        Floquet: test table of modes from one propagator evolution
+        """
+        delta = 0.2 * 2 * np.pi
+        eps0 = 1.0 * 2 * np.pi
+        A = 0.5 * 2 * np.pi
+        omega = 1.0 * 2 * np.pi
+        T = (2 * np.pi) / omega
+        H0 = - delta / 2.0 * sigmax() - eps0 / 2.0 * sigmaz()
+        H1 = A / 2.0 * sigmaz()
+        args = {'w': omega}
+        H = [H0, [H1, lambda t, args: np.sin(args['w'] * t)]]
+
+        f_modes_0, f_energies = floquet_modes(H, T, args)
+        tlist = np.linspace(0, T, 101)
+        f_modes_table = floquet_modes_table(f_modes_0, f_energies, tlist,
+                                            H, T, args)
+        assert_(len(f_modes_table) == len(tlist))
+
+        for t_idx in [0, 37, 100]:
+            f_modes_t = floquet_modes_t(f_modes_0, f_energies, tlist[t_idx],
+                                        H, T, args)
+            for f_a, f_b in zip(f_modes_table[t_idx], f_modes_t):
+                assert_((f_a - f_b).norm() < 1e-4)
+
+        t = 0.3333 * T
+        f_modes_t = floquet_modes_t(f_modes_0, f_energies, t, H, T, args)
+        f_modes_i = floquet_modes_t_lookup(f_modes_table, t + 2 * T, T,
+                                           interpolate=True)
+        for f_a, f_b in zip(f_modes_i, f_modes_t):
+            assert_(abs(abs((f_a.dag() * f_b)[0, 0]) - 1) < 1e-6)
+
 
 if __name__ == "__main__":
     run_module_suite()
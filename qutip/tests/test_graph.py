@@ -42,7 +42,8 @@ pwd = os.path.dirname(__file__)
 from qutip import (rand_dm, graph_degree, breadth_first_search,
                    reverse_cuthill_mckee, tensor, destroy, qeye, sigmam,
                    liouvillian, maximum_bipartite_matching,
-                   weighted_bipartite_matching, column_permutation)
+                   weighted_bipartite_matching, column_permutation,
+                   connected_components)
 from qutip.sparse import sp_permute, sp_bandwidth
 
 def test_graph_degree():
@@ -163,5 +164,18 @@ def test_column_permutation():
     counts = np.diff(B.indptr)
     assert_equal(np.all(np.argsort(counts) == np.arange(5)), True)
 
+def test_connected_components():
+    "Graph: Connected components"
+    A = sp.block_diag([rand_dm(5, 0.5).data, rand_dm(3, 0.5).data,
+                       rand_dm(4, 0.5).data]).tocsr()
+    perm = np.random.permutation(12)
+    labels, num_comp = connected_components(A[perm][:, perm].tocsr())
+    from scipy.sparse.csgraph import connected_components as sp_cc
+    num_sp, labels_sp = sp_cc(A[perm][:, perm], directed=False)
+    assert_equal(num_comp, num_sp)
+    for k in range(num_comp):
+        assert_equal(len(np.unique(labels_sp[labels == k])), 1)
+
+
 if __name__ == "__main__":
     run_module_suite()
@@ -44,7 +44,7 @@ from numpy import pi, real, cos, tanh
 from numpy.testing import (
     assert_, assert_almost_equal, run_module_suite, assert_equal)
 from scipy.integrate import quad, IntegrationWarning
-from qutip import Qobj, sigmaz, basis, expect
+from qutip import Qobj, sigmax, sigmaz, basis, expect
 from qutip.nonmarkov.heom import HSolverDL
 from qutip.solver import Options
 import warnings
@@ -132,4 +132,90 @@ class TestHSolver:
         assert_(max_resid < resid_tol, "Max residual {} outside tolerence {}, "
                 "for hsolve with {}".format(max_resid, resid_tol, test_desc))
         
-        
\ No newline at end of file
+    def test_dense_engine(self):
+        """
+        HSolverDL: Compare the dense hierarchy engine with the sparse one
+        """
+        H_sys = 0.5*sigmaz() + 0.3*sigmax()
+        Q = sigmaz()
+        initial_state = (basis(2, 0) + 1j*basis(2, 1)).unit()
+        initial_state = initial_state*initial_state.dag()
+        tlist = np.linspace(0, 10, 21)
+        integ_options = Options(nsteps=15000, atol=1e-10, rtol=1e-8)
+
+        for renorm, bnd_cut_approx in [(True, True), (False, False)]:
+            hsolver = HSolverDL(H_sys, Q, 0.1, 1.0, 6, 2, 0.2,
+                                renorm=renorm, bnd_cut_approx=bnd_cut_approx,
+                                options=integ_options)
+            result = hsolver.run(initial_state, tlist)
+            result_dense = hsolver.run(initial_state, tlist, method='dense')
+            for rho, rho_dense in zip(result.states, result_dense.states):
+                assert_(np.max(abs(rho.full() - rho_dense.full())) < 1e-6)
+                assert_(np.max(abs(rho.full() - rho.dag().full())) < 1e-8)
+
+            result_filt = hsolver.run(initial_state, tlist, method='dense',
+                                      ado_tol=1e-7)
+            for rho, rho_filt in zip(result.states, result_filt.states):
+                assert_(np.max(abs(rho.full() - rho_filt.full())) < 1e-5)
+
+    def test_steady_state(self):
+        """
+        HSolverDL: Compare the steady state with long time evolution
+        """
+        H_sys = 0.5*sigmaz() + 0.3*sigmax()
+        Q = sigmaz()
+        initial_state = basis(2, 0)*basis(2, 0).dag()
+        integ_options = Options(nsteps=150000, atol=1e-10, rtol=1e-8)
+        hsolver = HSolverDL(H_sys, Q, 0.1, 1.0, 6, 2, 0.2,
+                            options=integ_options)
+        result = hsolver.run(initial_state, np.linspace(0, 400, 3))
+
+        rho_ss = hsolver.steady_state()
+        assert_(np.max(abs(rho_ss.full() - result.states[-1].full())) < 1e-7)
+        assert_almost_equal(rho_ss.tr(), 1)
+
+        rho_it, ados = hsolver.steady_state(method='iterative',
+                                            return_ados=True)
+        assert_(np.max(abs(rho_it.full() - rho_ss.full())) < 1e-7)
+        assert_equal(ados.shape, (hsolver._N_he, 2, 2))
+        assert_(np.max(abs(ados[0] - rho_ss.full())) < 1e-7)
+
+    def test_sweep(self):
+        """
+        HSolverDL: Compare a parameter sweep with separate solvers
+        """
+        H_sys = 0.5*sigmaz() + 0.3*sigmax()
+        Q = sigmaz()
+        initial_state = basis(2, 0)*basis(2, 0).dag()
+        tlist = np.linspace(0, 5, 11)
+        integ_options = Options(nsteps=15000)
+        hsolver = HSolverDL(H_sys, Q, 0.1, 1.0, 6, 2, 0.2,
+                            options=integ_options)
+        pattern = hsolver._pattern
+        params = [{'temperature': 0.5}, {'temperature': 2.0},
+                  {'coup_strength': 0.05, 'N_cut': 4}]
+        e_ops = [sigmaz(), sigmax()]
+
+        for parallel in [False, True]:
+            result = hsolver.sweep(initial_state, tlist, e_ops, params,
+                                   parallel=parallel)
+            assert_equal(result.shape, (3, 2, len(tlist)))
+            for point, expect_sweep in zip(params, result):
+                args = dict(coup_strength=0.1, temperature=1.0, N_cut=6)
+                args.update(point)
+                hsolver_point = HSolverDL(H_sys, Q, args['coup_strength'],
+                                          args['temperature'], args['N_cut'],
+                                          2, 0.2, options=integ_options)
+                states = hsolver_point.run(initial_state, tlist).states
+                for op, expect_op in zip(e_ops, expect_sweep):
+                    assert_(np.max(abs(expect(op, states) - expect_op))
+                            < 1e-10)
+
+        # the solver itself is unchanged and keeps its hierarchy structure
+        assert_equal(hsolver.temperature, 1.0)
+        hsolver.configure(H_sys, Q, 0.1, 2.0, 6, 2, 0.2)
+        assert_(hsolver._pattern is pattern)
+
+
+if __name__ == "__main__":
+    run_module_suite()
@@ -217,6 +217,23 @@ def test_MCSimpleConst():
     assert_equal(avg_diff < mc_error, True)
 
 
+def test_MCSimpleConstSingle():
+    "Monte-carlo: Constant H with constant collapse, single precision"
+    N = 10  # number of basis states to consider
+    a = destroy(N)
+    H = a.dag() * a
+    psi0 = basis(N, 9)  # initial state
+    kappa = 0.2  # coupling to oscillator
+    c_op_list = [np.sqrt(kappa) * a]
+    tlist = np.linspace(0, 10, 100)
+    mcdata = mcsolve(H, psi0, tlist, c_op_list, [a.dag() * a], ntraj=ntraj,
+                     options=Options(precision='single'))
+    expt = mcdata.expect[0]
+    actual_answer = 9.0 * np.exp(-kappa * tlist)
+    avg_diff = np.mean(abs(actual_answer - expt) / actual_answer)
+    assert_equal(avg_diff < mc_error, True)
+
+
 def test_MCSimpleConstStates():
     "Monte-carlo: Constant H with constant collapse (states)"
     N = 10  # number of basis states to consider
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+# This file is part of QuTiP: Quantum Toolbox in Python.
+#
+#    Copyright (c) 2011 and later, Paul D. Nation and Robert J. Johansson.
+#    All rights reserved.
+#
+#    Redistribution and use in source and binary forms, with or without
+#    modification, are permitted provided that the following conditions are
+#    met:
+#
+#    1. Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#
+#    2. Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#
+#    3. Neither the name of the QuTiP: Quantum Toolbox in Python nor the names
+#       of its contributors may be used to endorse or promote products derived
+#       from this software without specific prior written permission.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+#    "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+#    LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+#    PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+#    HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+#    SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+#    LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+#    DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+#    THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+#    (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+#    OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+###############################################################################
+"""
+Tests for the memory cascade solver for time-delayed coherent feedback.
+"""
+
+import numpy as np
+from numpy.testing import (assert_, assert_array_almost_equal,
+                           run_module_suite)
+import qutip as qt
+from qutip.nonmarkov import memorycascade
+from qutip.nonmarkov.memorycascade import MemoryCascade, _power
+
+
+def _system(**kwargs):
+    H_S = 0.2 * qt.sigmax()
+    L1 = qt.sigmam()
+    L2 = np.exp(0.3j * np.pi) * L1
+    return MemoryCascade(H_S, L1, L2, **kwargs)
+
+
+def test_memorycascade_before_delay():
+    """
+    MemoryCascade: no feedback before the first round trip
+    """
+    sim = _system()
+    rho0 = qt.ket2dm(qt.basis(2, 0))
+    tau = 1.
+    opts = qt.Options(atol=1e-10, rtol=1e-10)
+    ref = qt.mesolve(sim.H_S, rho0, [0., 0.4, 0.8], sim.L1 + sim.L2, [],
+                     options=opts)
+    for t, rho_ref in zip([0.4, 0.8], ref.states[1:]):
+        assert_array_almost_equal(sim.rhot(rho0, t, tau).full(),
+                                  rho_ref.full(), decimal=5)
+
+
+def test_memorycascade_memoisation():
+    """
+    MemoryCascade: memoised and composed propagators agree
+    """
+    tau = 0.6
+    rho0 = qt.ket2dm(qt.basis(2, 0))
+    tlist = [0.15, 0.3, 0.45, 0.75, 1.2, 1.35]
+    # fresh simulations do not reuse any propagator
+    ref = [_system().rhot(rho0, t, tau) for t in tlist]
+    sim = _system()
+    rhos = [sim.rhot(rho0, t, tau) for t in tlist]
+    for rho, rho_ref in zip(rhos, ref):
+        assert_array_almost_equal(rho.full(), rho_ref.full(), decimal=5)
+        assert_array_almost_equal(rho.tr(), 1.)
+    # repeated calls return the memoised propagator
+    assert_(sim.propagator(0.75, tau) is sim.propagator(0.75, tau))
+
+    sim_par = _system(parallel=True)
+    c = sim.outfieldcorr(rho0, [2, 1], [0.3, 1.5], tau)
+    c_par = sim_par.outfieldcorr(rho0, [2, 1], [0.3, 1.5], tau)
+    assert_array_almost_equal(c_par, c, decimal=5)
+
+
+def test_memorycascade_mutation():
+    """
+    MemoryCascade: memoised propagators follow changes of the system
+    """
+    tau = 0.5
+    rho0 = qt.ket2dm(qt.basis(2, 0))
+    sm = qt.sigmam()
+    sim = MemoryCascade(0.5 * qt.sigmax(), qt.sigmam(), sm,
+                        integrator='propagator')
+    sim.rhot(rho0, 1.0, tau)
+    sim.H_S = 2 * qt.sigmax()
+    ref = MemoryCascade(2 * qt.sigmax(), sm, sm, integrator='propagator')
+    assert_array_almost_equal(sim.rhot(rho0, 1.0, tau).full(),
+                              ref.rhot(rho0, 1.0, tau).full())
+    # in place changes of the operators are detected as well
+    sim.L1[0].data = 0.5 * sm.data
+    ref = MemoryCascade(2 * qt.sigmax(), 0.5 * sm, sm,
+                        integrator='propagator')
+    assert_array_almost_equal(sim.rhot(rho0, 1.0, tau).full(),
+                              ref.rhot(rho0, 1.0, tau).full())
+
+
+def test_memorycascade_cache_size():
+    """
+    MemoryCascade: the memoisation caches are bounded
+    """
+    sim = _system()
+    rho0 = qt.ket2dm(qt.basis(2, 0))
+    size = memorycascade._CACHE_SIZE
+    memorycascade._CACHE_SIZE = 4
+    try:
+        for t in np.linspace(0.05, 0.5, 10):
+            sim.rhot(rho0, t, 1.)
+        assert_(len(sim._reduced) == 4)
+        assert_(len(sim._segments) <= 4)
+    finally:
+        memorycascade._CACHE_SIZE = size
+
+
+def test_power():
+    """
+    MemoryCascade: exponentiation by squaring
+    """
+    E = qt.to_super(qt.rand_unitary(3))
+    for n in [1, 2, 5, 8, 13]:
+        ref = E
+        for _ in range(n - 1):
+            ref = ref * E
+        assert_array_almost_equal(_power(E, n).full(), ref.full())
+
+
+if __name__ == "__main__":
+    run_module_suite()
@@ -34,14 +34,15 @@
 Tests for Permutational Invariant Quantum solver (PIQS).
 """
 import numpy as np
+from scipy.linalg import expm
 from numpy.testing import (assert_, run_module_suite, assert_raises,
                            assert_array_equal, assert_array_almost_equal,
                            assert_almost_equal, assert_equal)
 
-from qutip import Qobj
+from qutip import Qobj, mesolve, expect, operator_to_vector, Options
 from qutip.cy.piqs import (get_blocks, j_min, j_vals, m_vals,
                            _num_dicke_states, _num_dicke_ladders,
-                           get_index, jmm1_dictionary)
+                           get_index, jmm1_dictionary, jmm1_indices)
 from qutip.cy.piqs import Dicke as _Dicke
 from qutip.piqs import *
 
@@ -230,6 +231,21 @@ class TestDicke:
         assert_equal(d3, d3_correct)
         assert_equal(d4, d4_correct)
 
+    def test_jmm1_indices(self):
+        """
+        PIQS: Test the closed-form (j, m, m1) to (i, k) index map.
+        """
+        for N in [1, 4, 7]:
+            jmm1_inv = jmm1_dictionary(N)[1]
+            keys = list(jmm1_inv.keys())
+            j, m, m1 = np.array(keys).T
+            i, k = jmm1_indices(N, j, m, m1)
+            assert_array_equal(np.array([i, k]).T,
+                               np.array([jmm1_inv[key] for key in keys]))
+        assert_equal(jmm1_indices(4, 1, 0, -1),
+                     jmm1_dictionary(4)[1][(1, 0, -1)])
+        assert_raises(ValueError, jmm1_indices, 4, 3, 0, 0)
+
     def test_lindbladian(self):
         """
         PIQS: Test the generation of the Lindbladian matrix.
@@ -255,7 +271,9 @@ class TestDicke:
 
         lindbladian_correct = Qobj(Ldata, dims=[[[2], [2]], [[2], [2]]],
                                    shape=(4, 4))
-        assert_array_almost_equal(lindbladian.data.toarray(), Ldata)
+        # the rates are kept in double precision
+        assert_array_almost_equal(lindbladian.data.toarray(), Ldata,
+                                  decimal=14)
         N = 2
         gCE = 0.5
         gCD = 0.5
@@ -1128,6 +1146,43 @@ class TestDicke:
         assert_array_almost_equal(pruned_eig_states[-1].full(), estate_last)
 
 
+    def test_dicke_blocks(self):
+        """
+        PIQS: Test the block solver against the full Liouvillian
+        """
+        N = 4
+        [jx, jy, jz] = jspin(N)
+        tlist = np.linspace(0, 1, 6)
+        for H in [jz, 0.5 * jz + 0.7 * jx]:
+            system = Dicke(N=N, hamiltonian=H, emission=1., dephasing=0.4,
+                           pumping=0.2, collective_emission=0.3)
+            liouv = system.liouvillian()
+            blocks = DickeBlocks(system)
+            assert_equal(len(blocks.support), 35)
+            assert_equal(sum(len(sec) for sec in blocks.sectors), 35)
+
+            rho0 = css(N)
+            result = mesolve(liouv, rho0, tlist, [], [],
+                             options=Options(atol=1e-12, rtol=1e-10))
+            block_result = blocks.evolve(rho0, tlist, [jz],
+                                         Options(store_states=True))
+            assert_array_almost_equal(block_result.states[-1].full(),
+                                      result.states[-1].full())
+            assert_array_almost_equal(block_result.expect[0],
+                                      expect(jz, result.states))
+
+            rho_ss = blocks.steadystate()
+            assert_almost_equal(rho_ss.tr(), 1)
+            rho_vec = operator_to_vector(rho_ss).full()
+            assert_array_almost_equal(liouv.full().dot(rho_vec), 0 * rho_vec)
+
+            eigvals, eigstates = blocks.eigenstates()
+            assert_equal(len(eigvals), 35)
+            for val, state in zip(eigvals[::5], eigstates[::5]):
+                vec = operator_to_vector(state).full()
+                assert_array_almost_equal(liouv.full().dot(vec), val * vec)
+
+
 class TestPim:
     """
     Tests for the `qutip.piqs.Pim` class.
@@ -1228,6 +1283,23 @@ class TestPim:
         assert_array_almost_equal(test_matrix, true_matrix)
         assert_array_almost_equal(test_matrix2, true_matrix)
 
+    def test_coefficient_matrix_lindbladian(self):
+        """
+        PIQS: Test the coefficient matrix against the diagonal of the Lindbladian.
+        """
+        for N in [5, 6]:
+            ensemble = Pim(N, emission=1.3, dephasing=0.7, pumping=0.4,
+                           collective_emission=0.9, collective_pumping=0.2)
+            M = ensemble.coefficient_matrix().toarray()
+            system = Dicke(N, emission=1.3, dephasing=0.7, pumping=0.4,
+                           collective_emission=0.9, collective_pumping=0.2)
+            L = system.lindbladian().full()
+            nds = num_dicke_states(N)
+            diag = np.arange(nds) * (nds + 1)
+            assert_array_almost_equal(L[np.ix_(diag, diag)], M)
+            # the rate equation preserves the trace
+            assert_array_almost_equal(M.sum(axis=0), np.zeros(nds))
+
     def test_pisolve(self):
         """
         PIQS: Test the warning for diagonal Hamiltonians to use internal solver.
@@ -1259,6 +1331,34 @@ class TestPim:
         no_hamiltonian_system = Dicke(4, emission=0.1)
         result = no_hamiltonian_system.pisolve(diag_initial_state, tlist)
         assert_equal(True, len(result.states)>0)
+        assert_equal(True, isinstance(result.states, list))
+        jz_t = expect(jz, result.states)
+        assert_array_almost_equal(jz_t,
+                                  result.populations.dot(np.real(jz.diag())))
+        assert_array_almost_equal(jz_t[0], expect(jz, diag_initial_state))
+
+    def test_pim_solve(self):
+        """
+        PIQS: Test the populations from 'Pim.solve' against the propagator.
+        """
+        N = 6
+        ensemble = Pim(N, emission=0.7, dephasing=0.3, pumping=0.2,
+                       collective_emission=1.1, collective_pumping=0.1)
+        M = ensemble.coefficient_matrix().toarray()
+        rho0 = dicke(N, 3, 1)
+        p0 = np.real(rho0.diag())
+        for tlist in [np.linspace(0, 2, 11), np.array([0., 0.1, 0.5, 1.7])]:
+            result = ensemble.solve(rho0, tlist)
+            pops = result.populations
+            assert_equal(pops.shape, (len(tlist), num_dicke_states(N)))
+            for k, t in enumerate(tlist):
+                assert_array_almost_equal(pops[k], expm(M * t).dot(p0))
+            assert_equal(len(result.states), len(tlist))
+            assert_array_almost_equal(result.states[-1].full(),
+                                      np.diag(pops[-1]))
+            assert_equal(result.states[-1].dims, rho0.dims)
+            assert_array_almost_equal(result.states[1:][0].diag(), pops[1])
+            assert_array_almost_equal(pops.sum(axis=1), np.ones(len(tlist)))
 
 
 if __name__ == "__main__":
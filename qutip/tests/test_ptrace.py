@@ -30,6 +30,7 @@
 #    (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 #    OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 ###############################################################################
+import numpy as np
 from numpy.testing import assert_
 from qutip import *
 from qutip.legacy.ptrace import _ptrace as _pt
@@ -107,4 +108,45 @@ def test_ptrace_rand():
         B = A.ptrace([0,2])
         bdat,bd,bs = _pt(A, [0,2])
         C = Qobj(bdat,dims=bd)
-        assert_(B==C)
\ No newline at end of file
+        assert_(B==C)
+
+def test_ptrace_dense_sparse():
+    'ptrace : dense and sparse algorithms agree'
+    for k in range(10):
+        A = tensor(rand_ket(5), rand_ket(2), rand_ket(3))
+        for sel in [[0], [1], [2], [0, 2], [1, 2], [0, 1, 2]]:
+            B = A.ptrace(sel, sparse=True)
+            C = A.ptrace(sel, sparse=False)
+            assert_(B == C)
+
+    for k in range(10):
+        A = rand_dm(30, 0.5, dims=[[5, 2, 3], [5, 2, 3]])
+        for sel in [[0], [1], [2], [0, 2], [1, 2], [0, 1, 2]]:
+            B = A.ptrace(sel, sparse=True)
+            C = A.ptrace(sel, sparse=False)
+            assert_(B == C)
+
+
+def test_ptrace_unsorted_sel():
+    'ptrace : unsorted selection gives the subsystems in ascending order'
+    rho1, rho2, rho3 = rand_dm(2), rand_dm(3), rand_dm(4)
+    A = tensor(rho1, rho2, rho3)
+    for sparse in [True, False]:
+        B = A.ptrace([1, 0], sparse=sparse)
+        assert_(B.dims == [[2, 3], [2, 3]])
+        assert_(np.allclose(B.full(), tensor(rho1, rho2).full()))
+        B = A.ptrace([2, 0, 1], sparse=sparse)
+        assert_(B.dims == [[2, 3, 4], [2, 3, 4]])
+        assert_(np.allclose(B.full(), A.full()))
+    psi = tensor(rand_ket(2), rand_ket(3), rand_ket(4))
+    for sel in [[1, 0], [2, 0], [2, 1, 0]]:
+        assert_(psi.ptrace(sel, sparse=True) == psi.ptrace(sel, sparse=False))
+
+
+def test_ptrace_dense_ket_large():
+    'ptrace : ket ptrace without forming the density matrix'
+    N = 14
+    psi = tensor([rand_ket(2) for k in range(N)])
+    rho = psi.ptrace([0, N-1])
+    assert_(rho.dims == [[2, 2], [2, 2]])
+    assert_(abs(rho.tr() - 1) < 1e-12)
@@ -0,0 +1,135 @@
+# This file is part of QuTiP: Quantum Toolbox in Python.
+#
+#    Copyright (c) 2011 and later, Paul D. Nation and Robert J. Johansson.
+#    All rights reserved.
+#
+#    Redistribution and use in source and binary forms, with or without
+#    modification, are permitted provided that the following conditions are
+#    met:
+#
+#    1. Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#
+#    2. Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#
+#    3. Neither the name of the QuTiP: Quantum Toolbox in Python nor the names
+#       of its contributors may be used to endorse or promote products derived
+#       from this software without specific prior written permission.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+#    "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+#    LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+#    PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+#    HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+#    SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+#    LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+#    DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+#    THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+#    (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+#    OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+###############################################################################
+
+import numpy as np
+from numpy.testing import assert_, assert_equal, run_module_suite
+
+from qutip import (QobjArray, Qobj, Options, basis, destroy, rand_ket,
+                   rand_dm, rand_herm, sigmax, sigmaz, expect, variance,
+                   mesolve, sesolve)
+
+
+def test_QobjArrayIndexing():
+    "QobjArray: construction and indexing"
+    kets = [rand_ket(6, dims=[[2, 3], [1, 1]]) for k in range(5)]
+    arr = QobjArray(kets)
+    assert_equal(len(arr), 5)
+    assert_equal(arr.dims, [[2, 3], [1, 1]])
+    assert_(arr.isket)
+    for k in range(5):
+        assert_(isinstance(arr[k], Qobj))
+        assert_(arr[k] == kets[k])
+    sub = arr[1:3]
+    assert_(isinstance(sub, QobjArray))
+    assert_equal(len(sub), 2)
+    assert_(sub[0] == kets[1])
+    assert_equal(len(arr.to_list()), 5)
+
+
+def test_QobjArrayOps():
+    "QobjArray: batched expect, dag, tr and ptrace"
+    kets = [rand_ket(6, dims=[[2, 3], [1, 1]]) for k in range(5)]
+    dms = [rand_dm(6, dims=[[2, 3], [2, 3]]) for k in range(5)]
+    H = rand_herm(6, dims=[[2, 3], [2, 3]])
+    for states in [kets, dms]:
+        arr = QobjArray(states)
+        out = arr.expect(H)
+        assert_(out.dtype == np.float64)
+        assert_(np.allclose(out, expect(H, states)))
+        assert_(np.allclose(expect(H, arr), expect(H, states)))
+        assert_(np.allclose(variance(H, arr), variance(H, states)))
+        for sel in [0, 1, [0, 1]]:
+            red = arr.ptrace(sel)
+            for k in range(5):
+                assert_(red[k] == states[k].ptrace(sel))
+
+    arr = QobjArray(dms)
+    assert_(np.allclose(arr.tr(), 1))
+    adj = arr.dag()
+    for k in range(5):
+        assert_(adj[k] == dms[k].dag())
+
+
+def test_QobjArraySparse():
+    "QobjArray: stacked CSR storage of sparse batches"
+    kets = [basis(40, k) for k in range(5)]
+    for q in kets:
+        q.dims = [[5, 8], [1, 1]]
+    dms = [rand_dm(40, density=0.02, dims=[[5, 8], [5, 8]])
+           for k in range(5)]
+    ops = [1j * rand_herm(40, density=0.02) for k in range(5)]
+    H = rand_herm(40, density=0.1, dims=[[5, 8], [5, 8]])
+    assert_(QobjArray(kets).issparse)
+    assert_(QobjArray(dms).issparse)
+    assert_(not QobjArray(dms, sparse=False).issparse)
+    assert_(QobjArray(np.ones((2, 3, 3)), sparse=True).issparse)
+    for states in [kets, ops, dms]:
+        if states is not kets:
+            for q in states:
+                q.dims = [[5, 8], [5, 8]]
+        arr = QobjArray(states)
+        dense = QobjArray(states, sparse=False)
+        assert_(np.allclose(arr.full(), dense.full()))
+        assert_(np.allclose(arr.expect(H), dense.expect(H)))
+        assert_(np.allclose(arr.tr(), dense.tr()))
+        assert_equal(arr.isherm, dense.isherm)
+        assert_(np.allclose(arr.dag().full(), dense.dag().full()))
+        assert_(arr[-1] == states[-1])
+        sub = arr[[3, 1]]
+        assert_(sub.issparse)
+        assert_(sub[0] == states[3] and sub[1] == states[1])
+        assert_(np.allclose(arr.ptrace(1).full(), dense.ptrace(1).full()))
+        assert_(not QobjArray(arr, sparse=False).issparse)
+
+
+def test_QobjArraySolverOutput():
+    "QobjArray: states returned by sesolve and mesolve"
+    tlist = np.linspace(0, 5, 20)
+    H = sigmax()
+    opts = Options(store_states_array=True)
+    res = sesolve(H, basis(2, 0), tlist, [], options=opts)
+    ref = sesolve(H, basis(2, 0), tlist, [])
+    assert_(isinstance(res.states, QobjArray))
+    assert_(np.allclose(expect(sigmaz(), res.states),
+                        expect(sigmaz(), ref.states)))
+
+    c_ops = [0.1 * destroy(2)]
+    res = mesolve(H, basis(2, 0), tlist, c_ops, [], options=opts)
+    ref = mesolve(H, basis(2, 0), tlist, c_ops, [])
+    assert_(isinstance(res.states, QobjArray))
+    assert_(np.allclose(expect(sigmaz(), res.states),
+                        expect(sigmaz(), ref.states)))
+
+
+if __name__ == "__main__":
+    run_module_suite()
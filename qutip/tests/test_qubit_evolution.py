@@ -34,7 +34,7 @@
 import numpy as np
 from numpy.testing import run_module_suite, assert_equal
 from qutip import (sigmax, sigmay, sigmaz, sigmam, mesolve, mcsolve, essolve,
-                   basis)
+                   basis, ode2es, esval, expect, liouvillian, Options)
 
 
 def _qubit_integrate(tlist, psi0, epsilon, delta, g1, g2, solver):
@@ -133,6 +133,64 @@ def test_ESSolverCase1():
     assert_equal(max(abs(sz - sz_analytic)) < 0.05, True)
 
 
+def test_ESSolverCase2():
+    """
+    Test essolve qubit, no dissipation
+    """
+    epsilon = 0.0 * 2 * np.pi      # cavity frequency
+    delta = 1.0 * 2 * np.pi        # atom frequency
+    g2 = 0.0
+    g1 = 0.0
+    psi0 = basis(2, 0)          # initial state
+    tlist = np.linspace(0, 5, 200)
+
+    sx, sy, sz = _qubit_integrate(tlist, psi0, epsilon, delta, g1, g2, "es")
+
+    sx_analytic = np.zeros(np.shape(tlist))
+    sy_analytic = -np.sin(2 * np.pi * tlist)
+    sz_analytic = np.cos(2 * np.pi * tlist)
+
+    assert_equal(max(abs(sx - sx_analytic)) < 1e-10, True)
+    assert_equal(max(abs(sy - sy_analytic)) < 1e-10, True)
+    assert_equal(max(abs(sz - sz_analytic)) < 1e-10, True)
+
+
+def test_ESSeriesEvaluation():
+    """
+    Test eseries values and expectation values against essolve
+    """
+    H = 0.3 * sigmaz() + 0.5 * sigmax()
+    L = liouvillian(H, [np.sqrt(0.2) * sigmam()])
+    psi0 = basis(2, 0)
+    tlist = np.linspace(0, 5, 50)
+
+    es = ode2es(L, psi0)
+    states = esval(es, tlist)
+    sz = essolve(H, psi0, tlist, [np.sqrt(0.2) * sigmam()],
+                 [sigmaz()]).expect[0]
+    sz_es = esval(expect(sigmaz(), es), tlist)
+
+    assert_equal(len(states), len(tlist))
+    assert_equal(max(abs(expect(sigmaz(), list(states)) - sz)) < 1e-10,
+                 True)
+    assert_equal(max(abs(sz_es - sz)) < 1e-10, True)
+    assert_equal(abs(esval(es, 0.0).tr() - 1) < 1e-10, True)
+
+    # expectation values do not build the Qobj amplitudes
+    for es_lazy in [ode2es(L, psi0), ode2es(H, psi0)]:
+        expect(sigmaz(), es_lazy)
+        assert_equal(es_lazy._ampl is None, True)
+
+    # changing the Liouvillian in place gives the new dynamics
+    L2 = liouvillian(2 * H, [np.sqrt(0.2) * sigmam()])
+    ode2es(L, psi0)
+    L.data = L2.data
+    rho_t = esval(ode2es(L, psi0), 1.0)
+    rho_ref = mesolve(L2, psi0, [0, 1.0], [], [],
+                      options=Options(atol=1e-12, rtol=1e-10)).states[-1]
+    assert_equal(np.max(abs(rho_t.full() - rho_ref.full())) < 1e-8, True)
+
+
 def test_MCSolverCase1():
     """
     Test mcsolve qubit, with dissipation
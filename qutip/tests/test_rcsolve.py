@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+# This file is part of QuTiP: Quantum Toolbox in Python.
+#
+#    Copyright (c) 2011 and later, Paul D. Nation and Robert J. Johansson.
+#    All rights reserved.
+#
+#    Redistribution and use in source and binary forms, with or without
+#    modification, are permitted provided that the following conditions are
+#    met:
+#
+#    1. Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#
+#    2. Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#
+#    3. Neither the name of the QuTiP: Quantum Toolbox in Python nor the names
+#       of its contributors may be used to endorse or promote products derived
+#       from this software without specific prior written permission.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+#    "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+#    LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+#    PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+#    HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+#    SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+#    LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+#    DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+#    THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+#    (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+#    OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+###############################################################################
+"""
+Tests for the reaction coordinate solver
+"""
+
+import numpy as np
+from numpy.testing import assert_, run_module_suite
+from qutip import (sigmax, sigmaz, basis, qeye, destroy, tensor, thermal_dm,
+                   spre, spost, sprepost, mesolve, Options)
+from qutip.rcsolve import rcsolve
+
+
+def _rc_reference(Hsys, rho0, tlist, e_ops, Q, wc, alpha, N, w_th, options):
+    """
+    Reaction coordinate master equation with the dissipator summed over
+    pairs of eigenstates.
+    """
+    deltaE = np.diff(Hsys.eigenenergies()[:2])[0]
+    gamma = deltaE / (2 * np.pi * wc)
+    wa = 2 * np.pi * gamma * wc
+    g = np.sqrt(np.pi * wa * alpha / 2.0)
+    nb = 1 / (np.exp(wa / w_th) - 1)
+    a = tensor(destroy(N), qeye(2))
+    A = a + a.dag()
+    H = wa * a.dag() * a + tensor(qeye(N), Hsys) + g * A * tensor(qeye(N), Q)
+    energies, states = H.eigenstates()
+    X = 0
+    eta = 0
+    for j in range(len(energies)):
+        for k in range(len(energies)):
+            A_jk = A.matrix_element(states[j].dag(), states[k])
+            delE = energies[j] - energies[k]
+            proj = states[j] * states[k].dag()
+            if delE != 0:
+                X += (0.5 * np.pi * gamma * delE * A_jk
+                      / np.tanh(delE / (2 * w_th))) * proj
+                eta += 0.5 * np.pi * gamma * delE * A_jk * proj
+            else:
+                X += np.pi * gamma * w_th * A_jk * proj
+    L = (-spre(A * X) + sprepost(A, X) + sprepost(X, A) - spost(X * A)
+         + spre(A * eta) + sprepost(A, eta) - sprepost(eta, A)
+         - spost(eta * A))
+    rho0_exp = tensor(thermal_dm(N, nb), rho0)
+    e_ops_exp = [tensor(qeye(N), op) for op in e_ops]
+    return mesolve(H, rho0_exp, tlist, [L], e_ops_exp, options=options)
+
+
+def test_rcsolve():
+    """
+    rcsolve: Compare with the dissipator built from eigenstate pairs
+    """
+    Hsys = 0.5 * sigmaz() + 0.2 * sigmax()
+    Q = sigmaz()
+    rho0 = basis(2, 0) * basis(2, 0).dag()
+    tlist = np.linspace(0, 10, 21)
+    e_ops = [sigmaz(), sigmax()]
+    options = Options(atol=1e-10, rtol=1e-8)
+
+    output = rcsolve(Hsys, rho0, tlist, e_ops, Q, 0.05, 0.1, 5, 1.0,
+                     options=options)
+    ref = _rc_reference(Hsys, rho0, tlist, e_ops, Q, 0.05, 0.1, 5, 1.0,
+                        options)
+    for expect, expect_ref in zip(output.expect, ref.expect):
+        assert_(np.max(abs(expect - expect_ref)) < 1e-6)
+
+
+if __name__ == "__main__":
+    run_module_suite()
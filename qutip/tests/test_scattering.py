@@ -44,6 +44,11 @@ from numpy.testing import assert_, run_module_suite
 from qutip.operators import create, destroy
 from qutip.states import basis
 from qutip.scattering import *
+from qutip.scattering import Evolver, photon_scattering_operator
+
+
+def _pulse(t, args):
+    return 3.0 * np.exp(-(t - 0.3) ** 2 / 0.02)
 
 
 class TestScattering:
@@ -127,6 +132,36 @@ class TestScattering:
         tolerance = 1e-7
         assert_(1 - tolerance < P1 / P1_split < 1 + tolerance)
 
+    def testScatteredStateAmplitudes(self):
+        """
+        Compares the scattered state against the scattering operator for
+        emissions into two waveguides, including simultaneous emissions
+        """
+        sm = destroy(3)
+        psi0 = basis(3, 0)
+        c_ops = [0.8 * sm, 0.6 * sm]
+        T = 6
+        tlist = np.linspace(0, 1.5, T)
+        Heff = 0.5 * sm.dag() * sm + 0.4 * (sm + sm.dag()) - \
+            0.5j * sum([op.dag() * op for op in c_ops])
+        evolver = Evolver(Heff, tlist)
+        for H in [[Heff, [sm + sm.dag(), _pulse]], Heff]:
+            state = temporal_scattered_state(
+                H, psi0, 2, c_ops, tlist,
+                construct_effective_hamiltonian=False)
+            assert_(state.data.nnz <= (2 * T) ** 2)
+            state_par = temporal_scattered_state(
+                H, psi0, 2, c_ops, tlist,
+                construct_effective_hamiltonian=False, parallel=True)
+            assert_(np.allclose(state.full(), state_par.full()))
+        for indices in [[[1, 4], []], [[2], [2]], [[3], [0]], [[], [5, 5]]]:
+            taus = [[tlist[i] for i in wg] for wg in indices]
+            omega = photon_scattering_operator(evolver, c_ops, taus)
+            amplitude = (psi0.dag() * omega * psi0).full().item()
+            projector = temporal_basis_vector(indices, T)
+            assert_(np.abs((projector.dag() * state).full().item() -
+                           amplitude) < 1e-6)
+
 
 if __name__ == "__main__":
     run_module_suite()
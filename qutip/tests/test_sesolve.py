@@ -32,10 +32,11 @@
 ###############################################################################
 
 import numpy as np
-from numpy.testing import assert_, run_module_suite
+from numpy.testing import assert_, assert_raises, run_module_suite
 
 # disable the progress bar
 import os
+import warnings
 
 from qutip import sigmax, sigmay, sigmaz, qeye
 from qutip import basis, expect
@@ -105,6 +106,33 @@ class TestSESolve:
 
         self.check_evolution(H1, delta, psi0, tlist, analytic_func, U0)
 
+    def test_01_2_state_with_const_H_single(self):
+        "sesolve: state with const H, single precision"
+        delta = 1.0 * 2*np.pi   # atom frequency
+        psi0 = basis(2, 0)        # initial state
+        H1 = 0.5*delta*sigmax()      # Hamiltonian operator
+        tlist = np.linspace(0, 20, 200)
+        opts = Options(precision='single')
+
+        output = sesolve(H1, psi0, tlist, [sigmaz()], options=opts)
+        assert_(max(abs(output.expect[0] - np.cos(delta*tlist))) < 5e-3,
+                msg="expect Z not matching analytic")
+        assert_(output.expect[0].dtype == np.float64)
+
+    def test_01_3_single_precision_ignored(self):
+        "sesolve: single precision warns where it is not used"
+        psi0 = basis(2, 0)
+        H = [sigmaz(), [sigmax(), 'cos(t)']]
+        tlist = np.linspace(0, 1, 5)
+        opts = Options(precision='single')
+
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            sesolve(H, psi0, tlist, [sigmaz()], options=opts)
+        assert_(any("precision" in str(x.message) for x in w))
+        assert_raises(ValueError, sesolve, sigmaz(), psi0, tlist,
+                      [sigmaz()], options=Options(precision='half'))
+
     def test_02_1_state_with_func_H(self):
         "sesolve: state with td func H"
         delta = 1.0 * 2*np.pi   # atom frequency
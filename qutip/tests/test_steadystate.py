@@ -543,6 +543,28 @@ def test_driven_cavity_bicgstab():
     assert_((rho_ss - rho_ss_analytic).norm() < 1e-4)
 
 
+def test_driven_cavity_matrix_free():
+    "Steady state: Driven cavity - iterative-matrix-free solver"
+
+    N = 30
+    Omega = 0.01 * 2 * np.pi
+    Gamma = 0.05
+
+    a = destroy(N)
+    H = Omega * (a.dag() + a)
+    c_ops = [np.sqrt(Gamma) * a]
+    rho_ss_analytic = coherent_dm(N, -1.0j * (Omega)/(Gamma/2))
+
+    for krylov in ['gmres', 'lgmres', 'bicgstab']:
+        rho_ss = steadystate(H, c_ops, method='iterative-matrix-free',
+                             krylov=krylov, use_precond=True)
+        assert_((rho_ss - rho_ss_analytic).norm() < 1e-4)
+
+    rho_ss = steadystate(H, c_ops, method='iterative-matrix-free',
+                         krylov='bicgstab', maxiter=5000)
+    assert_((rho_ss - rho_ss_analytic).norm() < 1e-4)
+
+
 
 if __name__ == "__main__":
     run_module_suite()
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# This file is part of QuTiP: Quantum Toolbox in Python.
+#
+#    Copyright (c) 2011 and later, Paul D. Nation and Robert J. Johansson.
+#    All rights reserved.
+#
+#    Redistribution and use in source and binary forms, with or without
+#    modification, are permitted provided that the following conditions are
+#    met:
+#
+#    1. Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#
+#    2. Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#
+#    3. Neither the name of the QuTiP: Quantum Toolbox in Python nor the names
+#       of its contributors may be used to endorse or promote products derived
+#       from this software without specific prior written permission.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+#    "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+#    LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+#    PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+#    HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+#    SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+#    LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+#    DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+#    THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+#    (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+#    OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+###############################################################################
+"""
+Tests for the transfer tensor method solver.
+"""
+
+import numpy as np
+from numpy.testing import (assert_, assert_equal, assert_array_almost_equal,
+                           run_module_suite)
+from qutip import (sigmax, sigmaz, sigmam, sigmap, basis, ket2dm, mesolve,
+                   liouvillian, to_super, qeye, Options)
+from qutip.nonmarkov.transfertensor import ttmsolve, _generatetensors
+
+
+def _qubit_system():
+    H = 0.5 * sigmaz() + 0.3 * sigmax()
+    c_ops = [np.sqrt(0.2) * sigmam()]
+    return H, c_ops
+
+
+def test_ttmsolve_markovian():
+    """
+    ttmsolve: Markovian dynamics are reproduced from the exact maps
+    """
+    H, c_ops = _qubit_system()
+    L = liouvillian(H, c_ops)
+    dt = 0.1
+    learningtimes = np.arange(5) * dt
+    dynmaps = [(L * t).expm() for t in learningtimes]
+    times = np.arange(60) * dt
+    rho0 = ket2dm((basis(2, 0) + 1j * basis(2, 1)).unit())
+    e_ops = [sigmaz(), sigmap()]
+    opts = Options(atol=1e-10, rtol=1e-10)
+
+    ref_expect = mesolve(H, rho0, times, c_ops, e_ops, options=opts).expect
+    out = ttmsolve(dynmaps, rho0, times, e_ops)
+    assert_array_almost_equal(out.expect[0], ref_expect[0])
+    assert_array_almost_equal(out.expect[1], ref_expect[1])
+    assert_(not np.iscomplexobj(out.expect[0]))
+
+    ref = mesolve(H, rho0, times, c_ops, [], options=opts)
+    out = ttmsolve(dynmaps, rho0, times)
+    assert_equal(len(out.states), len(times))
+    for rho, rho_ref in zip(out.states, ref.states):
+        assert_equal(rho.dims, rho_ref.dims)
+        assert_array_almost_equal(rho.full(), rho_ref.full())
+
+    # the initial state can also be a superoperator
+    out = ttmsolve(dynmaps, to_super(qeye(2)), times[:10])
+    assert_array_almost_equal(out.states[-1].full(),
+                              (L * times[9]).expm().full())
+
+    # callable dynamical maps and a precomputed list of tensors
+    tensors, diff = _generatetensors(lambda t: (L * t).expm(), learningtimes)
+    out = ttmsolve(None, rho0, times, e_ops, tensors=tensors)
+    assert_array_almost_equal(out.expect[0], ref_expect[0])
+
+
+def test_generatetensors():
+    """
+    ttmsolve: transfer tensors reconstruct the dynamical maps
+    """
+    H, c_ops = _qubit_system()
+    L = liouvillian(H, c_ops)
+    # a map sequence with memory: the tensors are not just E_1 and zeros
+    dynmaps = [(L * (0.1 * n + 0.02 * n ** 2)).expm() for n in range(8)]
+    tensors, diff = _generatetensors(dynmaps)
+    assert_equal(len(tensors), len(dynmaps))
+    assert_equal(len(diff), len(dynmaps) - 1)
+    for n in range(1, len(dynmaps)):
+        E = sum([tensors[n - m] * dynmaps[m] for m in range(1, n)],
+                tensors[n])
+        assert_array_almost_equal(E.full(), dynmaps[n].full())
+        if n > 1:
+            assert_array_almost_equal(diff[n - 1],
+                                      (tensors[n] - tensors[n - 1]).norm())
+
+    # the Markovian tensors vanish beyond T_1, which triggers truncation
+    dynmaps = [(L * (0.1 * n)).expm() for n in range(8)]
+    tensors, diff = _generatetensors(dynmaps, thres=1e-6)
+    assert_equal(len(tensors), 4)
+
+
+if __name__ == "__main__":
+    run_module_suite()
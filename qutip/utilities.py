@@ -78,6 +78,24 @@ def n_thermal(w, w_th):
             return 0.0
 
 
+def _spectrum_on_array(J_cb, w):
+    """
+    Evaluate the noise power spectrum `J_cb` on the array of frequencies `w`,
+    in one call when the callback supports arrays and element by element
+    otherwise.
+    """
+    try:
+        J = np.asarray(J_cb(w), dtype=float)
+    except Exception:
+        J = None
+
+    if J is None or J.shape not in [(), w.shape]:
+        J = np.array([J_cb(x) for x in w.ravel()],
+                     dtype=float).reshape(w.shape)
+
+    return J * np.ones(w.shape)
+
+
 def linspace_with(start, stop, num=50, elems=[]):
     """
     Return an array of numbers sampled over specified interval